@@ -1,3 +1,4 @@
+import asyncio
 from typing import List, Dict, Any
 from langchain_openai import ChatOpenAI
 import requests
@@ -10,6 +11,15 @@ from langchain_core.messages import HumanMessage
 from recursive_ai.core.protocol import Message, Task, Observation, AgentStatus
 from recursive_ai.memory.long_term import CognitiveMemory
 
+SYNTHESIS_PROMPT = ChatPromptTemplate.from_template(
+    """You are an elite research analyst. Synthesize the following search results into a detailed report on '{query}'.
+    Focus on technical details, architectural patterns, and actionable code snippets.
+
+    Results: {results}
+
+    Report:"""
+)
+
 class ResearchAgent:
     """Agent specialized in finding and synthesizing information."""
     def __init__(self, memory: CognitiveMemory, model_name: str = "gpt-4o"):
@@ -55,6 +65,17 @@ class ResearchAgent:
         except Exception as e:
             return f"Vision Analysis Failed: {e}"
 
+    @staticmethod
+    def _first_url(results) -> str:
+        """Basic heuristic to find a url in the result dicts."""
+        return next((res.get('url') or res.get('link') for res in results if res.get('url') or res.get('link')), None)
+
+    def _store_report(self, query: str, report: str):
+        self.memory.add_memory(
+            text=report,
+            metadata={"source": "research_agent", "query": query, "type": "report"}
+        )
+
     def perform_research(self, query: str, depth: str = "brief") -> str:
         """Conducts research on a topic."""
         self.status = AgentStatus.WORKING
@@ -71,8 +92,7 @@ class ResearchAgent:
         if depth == "deep" and isinstance(results, list):
             # Try to visit the first valid link
             try:
-                # Basic heuristic to find a url in the result dict
-                url = next((res.get('url') or res.get('link') for res in results if res.get('url') or res.get('link')), None)
+                url = self._first_url(results)
                 if url:
                     page_content = self.visit_page(url)
                     context_content += f"\n\n--- Deep Dive into {url} ---\n{page_content}"
@@ -80,26 +100,38 @@ class ResearchAgent:
                 pass
 
         # 3. Synthesize
-        synthesis_prompt = ChatPromptTemplate.from_template(
-            """You are an elite research analyst. Synthesize the following search results into a detailed report on '{query}'.
-            Focus on technical details, architectural patterns, and actionable code snippets.
-
-            Results: {results}
-
-            Report:"""
-        )
-        chain = synthesis_prompt | self.llm | StrOutputParser()
+        chain = SYNTHESIS_PROMPT | self.llm | StrOutputParser()
         report = chain.invoke({"query": query, "results": context_content})
 
         # 4. Store in Memory
-        self.memory.add_memory(
-            text=report,
-            metadata={"source": "research_agent", "query": query, "type": "report"}
-        )
+        self._store_report(query, report)
 
         self.status = AgentStatus.IDLE
         return report
 
+    async def aperform_research(self, query: str, depth: str = "brief") -> str:
+        """Async version of perform_research, for concurrent use."""
+        try:
+            results = await self.tavily.ainvoke({"query": query})
+        except Exception:
+            results = await self.ddg.ainvoke(query)
+
+        context_content = str(results)
+        if depth == "deep" and isinstance(results, list):
+            try:
+                url = self._first_url(results)
+                if url:
+                    page_content = await asyncio.to_thread(self.visit_page, url)
+                    context_content += f"\n\n--- Deep Dive into {url} ---\n{page_content}"
+            except Exception:
+                pass
+
+        chain = SYNTHESIS_PROMPT | self.llm | StrOutputParser()
+        report = await chain.ainvoke({"query": query, "results": context_content})
+        # Memory writes are queued, they do not block
+        self._store_report(query, report)
+        return report
+
     def find_latest_papers(self, topic: str) -> List[Dict]:
         """Specific search for Arxiv papers (simulated via search engine)."""
         query = f"site:arxiv.org {topic} latest papers 2024 2025"
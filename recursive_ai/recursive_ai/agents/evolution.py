@@ -1,4 +1,5 @@
 import os
+import asyncio
 import subprocess
 from typing import List, Optional
 from langchain_openai import ChatOpenAI
@@ -6,7 +7,7 @@ from langchain_core.tools import tool
 from langchain_core.prompts import ChatPromptTemplate
 from recursive_ai.core.protocol import AgentStatus, Task
 from recursive_ai.memory.long_term import CognitiveMemory
-from recursive_ai.memory.skills import SkillLibrary
+from recursive_ai.memory.skills import get_skill_library
 from recursive_ai.core.simulation import create_simulator
 
 # Define tools
@@ -47,11 +48,22 @@ def run_command(command: str) -> str:
     except Exception as e:
         return f"Error: {e}"
 
+PLANNING_PROMPT = ChatPromptTemplate.from_template(
+    """You are a senior software architect. Create a plan to implement: {task}.
+    Available tools: read_file, write_file, run_command.
+
+    RELEVANT CODE PATTERNS (Use these if applicable):
+    {skills}
+
+    Current Directory: {cwd}
+    """
+)
+
 class SoftwareEngineer:
     """Agent capable of modifying the codebase."""
     def __init__(self, memory: CognitiveMemory, model_name: str = "gpt-4o"):
         self.memory = memory
-        self.skills = SkillLibrary()
+        self.skills = get_skill_library()
         self.llm = ChatOpenAI(model=model_name, temperature=0)
         self.tools = [list_files, read_file, write_file, run_command]
         self.llm_with_tools = self.llm.bind_tools(self.tools)
@@ -69,18 +81,8 @@ class SoftwareEngineer:
             skills_context = "No relevant skills found."
 
         # 1. Plan
-        planning_prompt = ChatPromptTemplate.from_template(
-            """You are a senior software architect. Create a plan to implement: {task}.
-            Available tools: read_file, write_file, run_command.
-
-            RELEVANT CODE PATTERNS (Use these if applicable):
-            {skills}
-
-            Current Directory: {cwd}
-            """
-        )
         cwd = os.getcwd()
-        plan_chain = planning_prompt | self.llm
+        plan_chain = PLANNING_PROMPT | self.llm
         # Invoke with context
         plan = plan_chain.invoke({
             "task": task_description,
@@ -94,6 +96,22 @@ class SoftwareEngineer:
         # Here we just return the plan for the Graph to execute.
         return plan.content
 
+    async def aimplement_feature(self, task_description: str) -> str:
+        """Async version of implement_feature, for concurrent use."""
+        try:
+            # Chroma queries are blocking
+            relevant_skills = await asyncio.to_thread(self.skills.retrieve_skill, task_description)
+            skills_context = "\n".join([doc.page_content for doc in relevant_skills])
+        except Exception:
+            skills_context = "No relevant skills found."
+
+        plan = await (PLANNING_PROMPT | self.llm).ainvoke({
+            "task": task_description,
+            "cwd": os.getcwd(),
+            "skills": skills_context
+        })
+        return plan.content
+
     def simulate_and_apply(self, code_block: str, test_cmd: str, target_file: str) -> str:
         """Advanced execution: Simulate first, then apply."""
         simulator = create_simulator()
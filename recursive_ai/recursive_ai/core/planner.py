@@ -1,37 +1,87 @@
+import re
+from functools import lru_cache
 from typing import List, Dict, TypedDict
 from langchain_openai import ChatOpenAI
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.output_parsers import StrOutputParser
 from langchain_core.messages import BaseMessage
 
+
 class Thought(TypedDict):
     step: str
     reasoning: str
-    score: float # 0.0 to 1.0
+    score: float  # 0.0 to 1.0
+
+
+# Prompts are built once, not on every call
+GENERATE_PROMPT = ChatPromptTemplate.from_template(
+    """You are an elite AI planner. Task: {task}
+    History: {history}
+    {plan}
+    Generate {k} distinct, creative next steps to advance the task.
+    For each step, explain briefly why it is good.
+    Format:
+    1. Step: [Action] | Reasoning: [Why]
+    2. Step: [Action] | Reasoning: [Why]
+    ...
+    """
+)
+
+EVALUATE_PROMPT = ChatPromptTemplate.from_template("""Task: {task}
+    Proposed Step: {step}
+    Reasoning: {reasoning}
+
+    Rate this step from 0.0 to 1.0 based on feasibility and alignment with the goal.
+    Return ONLY the number.
+    """)
+
+BATCH_EVALUATE_PROMPT = ChatPromptTemplate.from_template("""Task: {task}
+    {plan}
+    Proposed Steps:
+    {steps}
+
+    Rate each step from 0.0 to 1.0 based on feasibility and alignment with the goal.
+    Return ONLY one line per step, in the format "<step number>: <score>".
+    """)
+
+SCORE_LINE = re.compile(r"^\W*(\d+)\s*[:.)\-]\s*([01](?:\.\d+)?)\b")
+DEFAULT_SCORE = 0.5
+
 
 class ToTPlanner:
-    """Implements Tree of Thoughts planning."""
-    def __init__(self, model_name: str = "gpt-4o"):
+    """
+    Implements Tree of Thoughts planning.
+
+    With depth > 1, a beam search keeps the `beam_width` best plans at each
+    level, until the depth or the budget of generated thoughts is reached.
+    All the thoughts of a level are scored concurrently, a plan's thoughts
+    in one evaluator call.
+    """
+
+    def __init__(
+        self,
+        model_name: str = "gpt-4o",
+        depth: int = 1,
+        beam_width: int = 2,
+        node_budget: int = 12,
+    ):
         self.llm = ChatOpenAI(model=model_name, temperature=0.7)
         self.evaluator = ChatOpenAI(model=model_name, temperature=0.1)
+        self.depth = depth
+        self.beam_width = beam_width
+        self.node_budget = node_budget
 
-    def generate_thoughts(self, task: str, history: List[BaseMessage], k: int = 3) -> List[Thought]:
-        """Generates k potential next steps."""
-        prompt = ChatPromptTemplate.from_template(
-            """You are an elite AI planner. Task: {task}
-            History: {history}
-
-            Generate {k} distinct, creative next steps to advance the task.
-            For each step, explain briefly why it is good.
-            Format:
-            1. Step: [Action] | Reasoning: [Why]
-            2. Step: [Action] | Reasoning: [Why]
-            ...
-            """
+    @staticmethod
+    def _format_plan(plan: List[Thought]) -> str:
+        if not plan:
+            return ""
+        steps = "\n".join(
+            f"{i + 1}. {thought['step']}" for i, thought in enumerate(plan)
         )
-        response = prompt | self.llm
-        output = response.invoke({"task": task, "history": str(history[-2:]), "k": k}).content
+        return f"Planned steps so far:\n{steps}\n"
 
+    @staticmethod
+    def _parse_thoughts(output: str) -> List[Thought]:
         thoughts = []
         for line in output.split("\n"):
             if "Step:" in line and "|" in line:
@@ -39,53 +89,163 @@ class ToTPlanner:
                     parts = line.split("|")
                     step_part = parts[0].split("Step:")[1].strip()
                     reasoning_part = parts[1].split("Reasoning:")[1].strip()
-                    thoughts.append({"step": step_part, "reasoning": reasoning_part, "score": 0.0})
+                    thoughts.append(
+                        {"step": step_part, "reasoning": reasoning_part, "score": 0.0}
+                    )
                 except:
                     continue
         return thoughts
 
+    def _generate_inputs(
+        self, task: str, history: List[BaseMessage], plan: List[Thought], k: int
+    ) -> Dict:
+        return {
+            "task": task,
+            "history": str(history[-2:]),
+            "plan": self._format_plan(plan),
+            "k": k,
+        }
+
+    def generate_thoughts(
+        self, task: str, history: List[BaseMessage], k: int = 3
+    ) -> List[Thought]:
+        """Generates k potential next steps."""
+        chain = GENERATE_PROMPT | self.llm | StrOutputParser()
+        return self._parse_thoughts(
+            chain.invoke(self._generate_inputs(task, history, [], k))
+        )
+
+    def _parse_scores(self, output: str, count: int) -> Dict[int, float]:
+        scores = {}
+        for line in output.split("\n"):
+            match = SCORE_LINE.match(line)
+            if match and 1 <= int(match.group(1)) <= count:
+                scores[int(match.group(1)) - 1] = min(
+                    1.0, max(0.0, float(match.group(2)))
+                )
+        return scores
+
+    def _score_individually(self, task: str, thoughts: List[Thought]) -> List[float]:
+        """Fallback: one evaluator call per thought, run concurrently."""
+        chain = EVALUATE_PROMPT | self.evaluator | StrOutputParser()
+        results = chain.batch(
+            [
+                {"task": task, "step": t["step"], "reasoning": t["reasoning"]}
+                for t in thoughts
+            ],
+            return_exceptions=True,
+        )
+        scores = []
+        for result in results:
+            try:
+                scores.append(float(result.strip()))
+            except Exception:
+                scores.append(DEFAULT_SCORE)  # Default fallback
+        return scores
+
+    def evaluate_plans(
+        self, task: str, plans: List[List[Thought]], candidates: List[List[Thought]]
+    ) -> List[List[Thought]]:
+        """
+        Scores the candidate next thoughts of each plan.
+
+        The thoughts of a plan are rated in one evaluator call, the calls of
+        the different plans run concurrently. Thoughts missing from a batched
+        answer are rated one by one.
+        """
+        evaluations = [
+            (plan, thoughts) for plan, thoughts in zip(plans, candidates) if thoughts
+        ]
+        chain = BATCH_EVALUATE_PROMPT | self.evaluator | StrOutputParser()
+        outputs = chain.batch(
+            [
+                {
+                    "task": task,
+                    "plan": self._format_plan(plan),
+                    "steps": "\n".join(
+                        f"{i + 1}. Step: {t['step']} | Reasoning: {t['reasoning']}"
+                        for i, t in enumerate(thoughts)
+                    ),
+                }
+                for plan, thoughts in evaluations
+            ],
+            return_exceptions=True,
+        )
+
+        for (plan, thoughts), output in zip(evaluations, outputs):
+            scores = (
+                {}
+                if isinstance(output, Exception)
+                else self._parse_scores(output, len(thoughts))
+            )
+            missing = [i for i in range(len(thoughts)) if i not in scores]
+            if missing:
+                fallback = self._score_individually(
+                    task, [thoughts[i] for i in missing]
+                )
+                scores.update(zip(missing, fallback))
+            for i, thought in enumerate(thoughts):
+                thought["score"] = scores[i]
+        return candidates
+
     def evaluate_thoughts(self, task: str, thoughts: List[Thought]) -> List[Thought]:
         """Scores each thought based on likelihood of success."""
-        # This implementation iterates through the list, invoking the LLM for each thought.
-        # This could be slow for many thoughts, but is acceptable for k=3.
-        updated_thoughts = []
-        for thought in thoughts:
-            prompt = ChatPromptTemplate.from_template(
-                """Task: {task}
-                Proposed Step: {step}
-                Reasoning: {reasoning}
-
-                Rate this step from 0.0 to 1.0 based on feasibility and alignment with the goal.
-                Return ONLY the number.
-                """
+        return self.evaluate_plans(task, [[]], [thoughts])[0]
+
+    def search(
+        self, task: str, history: List[BaseMessage], k: int = 3
+    ) -> List[Thought]:
+        """Beam search over plans, returns the best plan found."""
+        beam: List[List[Thought]] = [[]]
+        best: List[Thought] = []
+        budget = self.node_budget
+        for _ in range(max(1, self.depth)):
+            # Expand only as many plans as the budget allows
+            beam = beam[: max(1, budget // k)]
+            chain = GENERATE_PROMPT | self.llm | StrOutputParser()
+            outputs = chain.batch(
+                [self._generate_inputs(task, history, plan, k) for plan in beam],
+                return_exceptions=True,
             )
-            chain = prompt | self.evaluator
-            try:
-                result = chain.invoke({
-                    "task": task,
-                    "step": thought['step'],
-                    "reasoning": thought['reasoning']
-                })
-                score = float(result.content.strip())
-                thought['score'] = score
-            except Exception:
-                thought['score'] = 0.5 # Default fallback
-            updated_thoughts.append(thought)
+            candidates = [
+                (
+                    []
+                    if isinstance(output, Exception)
+                    else self._parse_thoughts(output)[:k]
+                )
+                for output in outputs
+            ]
+            budget -= sum(len(thoughts) for thoughts in candidates)
+            self.evaluate_plans(task, beam, candidates)
 
-        return updated_thoughts
+            plans = [
+                plan + [thought]
+                for plan, thoughts in zip(beam, candidates)
+                for thought in thoughts
+            ]
+            if not plans:
+                break
+            # Plans are ranked by the mean score of their steps
+            plans.sort(
+                key=lambda plan: sum(t["score"] for t in plan) / len(plan), reverse=True
+            )
+            beam = plans[: self.beam_width]
+            best = beam[0]
+            if budget < k:
+                break
+        return best
 
     def select_best_step(self, task: str, history: List[BaseMessage]) -> str:
         """Main entry point: Generate -> Evaluate -> Select."""
-        thoughts = self.generate_thoughts(task, history)
-        thoughts = self.evaluate_thoughts(task, thoughts)
+        plan = self.search(task, history)
 
-        if not thoughts:
-            return "research" # Safe fallback
+        if not plan:
+            return "research"  # Safe fallback
 
-        best_thought = max(thoughts, key=lambda x: x['score'])
+        best_thought = plan[0]
 
         # Mapping back to graph nodes (simplified)
-        action = best_thought['step'].lower()
+        action = best_thought["step"].lower()
         if "research" in action or "search" in action or "find" in action:
             return "research"
         elif "code" in action or "implement" in action or "write" in action:
@@ -97,7 +257,14 @@ class ToTPlanner:
         elif "finish" in action or "complete" in action:
             return "finish"
         else:
-            return "research" # Default to gathering more info
+            return "research"  # Default to gathering more info
+
 
 def create_tot_planner() -> ToTPlanner:
     return ToTPlanner()
+
+
+@lru_cache(maxsize=None)
+def get_tot_planner() -> ToTPlanner:
+    """Shared planner, so its LLM clients are reused across iterations."""
+    return create_tot_planner()
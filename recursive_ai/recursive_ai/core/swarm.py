@@ -1,63 +1,187 @@
 import asyncio
-from typing import List, Dict
+import json
+from functools import lru_cache
+from typing import AsyncIterator, Callable, List, Literal, Optional
+from pydantic import BaseModel, ValidationError
 from langchain_openai import ChatOpenAI
 from langchain_core.prompts import ChatPromptTemplate
-from langchain_core.messages import SystemMessage
+from langchain_core.output_parsers import StrOutputParser
 from recursive_ai.agents.acquisition import ResearchAgent
 from recursive_ai.agents.evolution import SoftwareEngineer
-from recursive_ai.memory.long_term import CognitiveMemory
+from recursive_ai.memory.long_term import CognitiveMemory, get_cognitive_memory
+
+DECOMPOSE_PROMPT = ChatPromptTemplate.from_template(
+    """You are a Swarm Commander. Split this complex task into 3-5 independent subtasks.
+    Task: {task}
+
+    Assign each subtask to an agent: "research" to find information, "engineer" to write code.
+    Return ONLY a JSON list of objects.
+    Example: [{{"description": "Research X", "agent": "research"}}, {{"description": "Write module Y", "agent": "engineer"}}]
+    """
+)
+
+
+class Subtask(BaseModel):
+    """A unit of work of the swarm."""
+
+    description: str
+    agent: Literal["research", "engineer"] = "research"
+
+
+class SubtaskResult(BaseModel):
+    """The outcome of a subtask, streamed as soon as it is known."""
+
+    index: int
+    subtask: Subtask
+    status: Literal["done", "failed", "timeout"]
+    output: str
+
+
+def _route(description: str) -> str:
+    """Simple routing heuristic for subtasks without an agent."""
+    lowered = description.lower()
+    return "research" if "research" in lowered or "find" in lowered else "engineer"
+
+
+def parse_subtasks(text: str, task: str, max_subtasks: int = 8) -> List[Subtask]:
+    """Parses the JSON decomposition, falls back to the whole task as one subtask."""
+    text = text.strip()
+    if "```" in text:
+        text = text.split("```")[1].removeprefix("json")
+    try:
+        items = json.loads(text)
+        if not isinstance(items, list):
+            raise ValueError("Decomposition is not a list")
+        subtasks = [
+            (
+                Subtask(description=item, agent=_route(item))
+                if isinstance(item, str)
+                else Subtask.model_validate(item)
+            )
+            for item in items
+        ]
+    except (ValueError, ValidationError):
+        subtasks = []
+    return subtasks[:max_subtasks] or [Subtask(description=task, agent=_route(task))]
+
 
 class SwarmManager:
-    """Manages parallel execution of multiple agents."""
-    def __init__(self, memory: CognitiveMemory, model_name: str = "gpt-4o"):
+    """
+    Manages parallel execution of multiple agents.
+
+    At most `max_concurrency` subtasks run at the same time, each within
+    `subtask_timeout` seconds. One agent of each kind serves every subtask.
+    """
+
+    def __init__(
+        self,
+        memory: CognitiveMemory,
+        model_name: str = "gpt-4o",
+        max_concurrency: int = 4,
+        subtask_timeout: float = 300.0,
+    ):
         self.memory = memory
+        self.model_name = model_name
         self.llm = ChatOpenAI(model=model_name, temperature=0)
+        self.max_concurrency = max(1, max_concurrency)
+        self.subtask_timeout = subtask_timeout
+        self._researcher: Optional[ResearchAgent] = None
+        self._engineer: Optional[SoftwareEngineer] = None
 
-    async def decompose_and_execute(self, task: str) -> str:
-        """Splits task into subtasks and runs them in parallel."""
+    @property
+    def researcher(self) -> ResearchAgent:
+        if self._researcher is None:
+            self._researcher = ResearchAgent(self.memory, self.model_name)
+        return self._researcher
+
+    @property
+    def engineer(self) -> SoftwareEngineer:
+        if self._engineer is None:
+            self._engineer = SoftwareEngineer(self.memory, self.model_name)
+        return self._engineer
+
+    async def decompose(self, task: str) -> List[Subtask]:
+        chain = DECOMPOSE_PROMPT | self.llm | StrOutputParser()
+        try:
+            text = await chain.ainvoke({"task": task})
+        except Exception:
+            text = ""
+        return parse_subtasks(text, task)
 
-        # 1. Decompose
-        prompt = ChatPromptTemplate.from_template(
-            """You are a Swarm Commander. Split this complex task into 3-5 independent subtasks.
-            Task: {task}
+    async def _execute_subtask(self, subtask: Subtask) -> str:
+        """Routes a subtask to the appropriate agent."""
+        if subtask.agent == "research":
+            return await self.researcher.aperform_research(subtask.description)
+        return await self.engineer.aimplement_feature(subtask.description)
 
-            Return ONLY a python list of strings.
-            Example: ["Research X", "Write module Y", "Test Z"]
-            """
+    async def _run_one(
+        self, index: int, subtask: Subtask, semaphore: asyncio.Semaphore
+    ) -> SubtaskResult:
+        async with semaphore:
+            try:
+                output = await asyncio.wait_for(
+                    self._execute_subtask(subtask), self.subtask_timeout
+                )
+                status = "done"
+            except asyncio.TimeoutError:
+                output, status = (
+                    f"Timed out after {self.subtask_timeout:.0f}s",
+                    "timeout",
+                )
+            except Exception as e:
+                output, status = f"Error: {e}", "failed"
+        return SubtaskResult(
+            index=index, subtask=subtask, status=status, output=str(output)
         )
-        response = self.llm.invoke({"task": task})
+
+    async def run_subtasks(
+        self, subtasks: List[Subtask]
+    ) -> AsyncIterator[SubtaskResult]:
+        """
+        Yields the results in the order the subtasks complete.
+
+        The subtasks still running are cancelled if the iteration stops early
+        or is cancelled.
+        """
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        tasks = [
+            asyncio.create_task(self._run_one(i, st, semaphore))
+            for i, st in enumerate(subtasks)
+        ]
         try:
-            subtasks = eval(response.content)
-            if not isinstance(subtasks, list):
-                subtasks = [task]
-        except:
-            subtasks = [task]
-
-        print(f"🐝 Swarm activated. Subtasks: {subtasks}")
-
-        # 2. Assign & Execute (Simulated Async)
-        # In a real environment, we'd use true asyncio.gather with async agent methods.
-        # Since our agents currently use sync calls, we wrap them in threads or just loop for this POC.
-        # To be "Advanced", let's use asyncio.to_thread
-        tasks = []
-        for st in subtasks:
-             tasks.append(self._execute_subtask(st))
-
-        results = await asyncio.gather(*tasks)
-
-        # 3. Aggregation
-        summary = "\n".join([f"Subtask {i+1}: {res}" for i, res in enumerate(results)])
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            for t in tasks:
+                t.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def decompose_and_execute(
+        self, task: str, on_result: Callable[[SubtaskResult], None] = None
+    ) -> str:
+        """Splits task into subtasks and runs them in parallel."""
+        subtasks = await self.decompose(task)
+        print(f"🐝 Swarm activated. Subtasks: {[st.description for st in subtasks]}")
+
+        results = []
+        async for result in self.run_subtasks(subtasks):
+            if on_result:
+                on_result(result)
+            results.append(result)
+
+        # Aggregation, in the order of the decomposition
+        results.sort(key=lambda r: r.index)
+        summary = "\n".join(
+            [f"Subtask {r.index + 1} ({r.status}): {r.output}" for r in results]
+        )
         return f"Swarm Execution Complete.\n{summary}"
 
-    async def _execute_subtask(self, subtask: str) -> str:
-        """Routes a subtask to the appropriate agent."""
-        # Simple routing heuristic
-        if "research" in subtask.lower() or "find" in subtask.lower():
-            agent = ResearchAgent(self.memory)
-            return await asyncio.to_thread(agent.perform_research, subtask)
-        else:
-            agent = SoftwareEngineer(self.memory)
-            return await asyncio.to_thread(agent.implement_feature, subtask)
 
 def create_swarm_manager(memory: CognitiveMemory) -> SwarmManager:
     return SwarmManager(memory)
+
+
+@lru_cache(maxsize=None)
+def get_swarm_manager() -> SwarmManager:
+    """Shared swarm manager, so its agents are reused across graph steps."""
+    return create_swarm_manager(get_cognitive_memory())
@@ -2,16 +2,16 @@ from typing import TypedDict, Annotated, List, Union
 from langgraph.graph import StateGraph, END
 from langchain_core.messages import BaseMessage, HumanMessage, SystemMessage
 from langchain_openai import ChatOpenAI
-from recursive_ai.memory.long_term import CognitiveMemory
+from recursive_ai.memory.long_term import get_cognitive_memory
 from recursive_ai.agents.acquisition import create_research_agent
 from recursive_ai.agents.evolution import create_software_engineer
 from recursive_ai.agents.scientist import create_scientist
 from recursive_ai.agents.reflector import create_reflector
 from recursive_ai.learning.dataset import create_collector
-from recursive_ai.core.planner import create_tot_planner
-from recursive_ai.core.swarm import create_swarm_manager
+from recursive_ai.core.planner import get_tot_planner
+from recursive_ai.core.swarm import get_swarm_manager
+from langgraph.config import get_stream_writer
 import operator
-import asyncio
 
 # Define State
 class AgentState(TypedDict):
@@ -30,7 +30,7 @@ def planner_node(state: AgentState):
     if iterations > 15: # Increased limit for deeper work
         return {"next_step": "end"}
 
-    planner = create_tot_planner()
+    planner = get_tot_planner()
     # ToT logic returns 'research', 'code', 'experiment', 'swarm', or 'finish'
     next_step = planner.select_best_step(task, messages)
 
@@ -40,22 +40,23 @@ def experiment_node(state: AgentState):
     """Executes abstract experiments."""
     task = state['task']
     try:
-        memory = CognitiveMemory()
+        memory = get_cognitive_memory()
         scientist = create_scientist(memory)
         report = scientist.conduct_experiment(task)
         return {"messages": [SystemMessage(content=f"Experiment Report: {report}")]}
     except Exception as e:
         return {"messages": [SystemMessage(content=f"Experiment Failed: {e}")]}
 
-def swarm_node(state: AgentState):
+async def swarm_node(state: AgentState):
     """Executes subtasks in parallel."""
     task = state['task']
     try:
-        memory = CognitiveMemory()
-        manager = create_swarm_manager(memory)
-        # LangGraph nodes are sync by default unless async is configured.
-        # We run the async method in a loop.
-        report = asyncio.run(manager.decompose_and_execute(task))
+        manager = get_swarm_manager()
+        # Partial results reach the "custom" stream mode as subtasks complete
+        writer = get_stream_writer()
+        report = await manager.decompose_and_execute(
+            task, on_result=lambda result: writer({"swarm": result.model_dump()})
+        )
         return {"messages": [SystemMessage(content=f"Swarm Report: {report}")]}
     except Exception as e:
         return {"messages": [SystemMessage(content=f"Swarm Failed: {e}")]}
@@ -83,7 +84,7 @@ def review_node(state: AgentState):
     """Reviews code and runs tests."""
     task = state['task']
     try:
-        memory = CognitiveMemory()
+        memory = get_cognitive_memory()
         agent = create_software_engineer(memory)
 
         # In a real scenario, we would look for test files related to the task
@@ -103,7 +104,7 @@ def research_node(state: AgentState):
     task = state['task']
     # Use Memory (should be configured via env vars)
     try:
-        memory = CognitiveMemory()
+        memory = get_cognitive_memory()
         agent = create_research_agent(memory)
         result = agent.perform_research(task)
     except Exception as e:
@@ -115,7 +116,7 @@ def code_node(state: AgentState):
     """Executes coding."""
     task = state['task']
     try:
-        memory = CognitiveMemory()
+        memory = get_cognitive_memory()
         agent = create_software_engineer(memory)
 
         # We ask the agent to implement based on the last research
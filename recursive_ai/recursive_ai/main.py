@@ -1,5 +1,6 @@
 import sys
 import argparse
+import asyncio
 from langchain_core.messages import HumanMessage
 from recursive_ai.core.meta import load_dynamic_graph
 
@@ -23,15 +24,25 @@ def main():
 
     print("🧠 Cortex active. Thinking...")
     try:
-        for event in workflow.stream(initial_state):
-            for key, value in event.items():
-                print(f"\n--- Node: {key} ---")
-                if "messages" in value:
-                    print(f"Output: {value['messages'][-1].content[:200]}...") # Truncate for readability
-                if "next_step" in value:
-                    print(f"Decision: {value['next_step']}")
+        # The swarm node is async, so the graph runs on an event loop
+        asyncio.run(run_workflow(workflow, initial_state))
     except Exception as e:
         print(f"❌ Critical Error: {e}")
 
+async def run_workflow(workflow, initial_state):
+    async for mode, event in workflow.astream(initial_state, stream_mode=["updates", "custom"]):
+        if mode == "custom":
+            # Partial results of the swarm
+            if "swarm" in event:
+                result = event["swarm"]
+                print(f"🐝 Subtask {result['index'] + 1} {result['status']}: {result['output'][:200]}...")
+            continue
+        for key, value in event.items():
+            print(f"\n--- Node: {key} ---")
+            if "messages" in value:
+                print(f"Output: {value['messages'][-1].content[:200]}...") # Truncate for readability
+            if "next_step" in value:
+                print(f"Decision: {value['next_step']}")
+
 if __name__ == "__main__":
     main()
@@ -1,55 +1,183 @@
-import os
+import time
+import uuid
+from concurrent.futures import Future
+from functools import lru_cache
 from typing import List, Dict, Optional
-from langchain_chroma import Chroma
-from langchain_openai import OpenAIEmbeddings
 from langchain_core.documents import Document
+from recursive_ai.memory.service import get_memory_service
+
+
+def _where(filter_dict: Optional[Dict]) -> Optional[Dict]:
+    """Chroma filters take one condition, several are combined with $and."""
+    if not filter_dict:
+        return None
+    if len(filter_dict) == 1:
+        return dict(filter_dict)
+    return {"$and": [{key: value} for key, value in filter_dict.items()]}
+
 
 class CognitiveMemory:
     """Long-term memory using vector store."""
-    def __init__(self, collection_name: str = "recursive_ai_memory", persist_directory: str = "./db"):
+
+    def __init__(
+        self,
+        collection_name: str = "recursive_ai_memory",
+        persist_directory: str = "./db",
+    ):
         self.collection_name = collection_name
         self.persist_directory = persist_directory
-
-        # Initialize embeddings (assuming OPENAI_API_KEY is set)
-        if not os.getenv("OPENAI_API_KEY"):
+        if not self.embeddings:
             # Provide a warning or fallback
-            print("WARNING: OPENAI_API_KEY not found. Memory will not function correctly without it.")
-            self.embeddings = None
-        else:
-            self.embeddings = OpenAIEmbeddings()
-
-        if self.embeddings:
-            self.vector_store = Chroma(
-                collection_name=collection_name,
-                embedding_function=self.embeddings,
-                persist_directory=persist_directory
+            print(
+                "WARNING: OPENAI_API_KEY not found. Memory will not function correctly without it."
             )
-        else:
-            self.vector_store = None
+
+    # The store and the embeddings are shared by the whole process. They are
+    # looked up on each use, so a memory created before OPENAI_API_KEY was set
+    # is enabled once it is.
+    @property
+    def embeddings(self):
+        return get_memory_service(self.persist_directory).embeddings
+
+    @property
+    def vector_store(self):
+        return get_memory_service(self.persist_directory).get_vector_store(
+            self.collection_name
+        )
+
+    @property
+    def writer(self):
+        return get_memory_service(self.persist_directory).get_writer(
+            self.collection_name
+        )
+
+    @staticmethod
+    def _document(text: str, metadata: Optional[Dict[str, str]]) -> Document:
+        # The timestamp orders the metadata queries
+        return Document(
+            page_content=text, metadata={"timestamp": time.time(), **(metadata or {})}
+        )
+
+    def _submit(self, document: Document, doc_id: str) -> Optional[Future]:
+        """Queues a document, None when the memory is disabled."""
+        writer = self.writer
+        if not writer:
+            return None
+        try:
+            return writer.submit(document, doc_id)
+        except RuntimeError:
+            # The collection was cleared since the writer was looked up, and
+            # its writer closed: write to the new collection
+            writer = self.writer
+            return writer.submit(document, doc_id) if writer else None
+
+    def add_memory_async(self, text: str, metadata: Dict[str, str] = None) -> Future:
+        """Queues a piece of information, the future resolves to its ID once stored."""
+        future = self._submit(self._document(text, metadata), str(uuid.uuid4()))
+        if future is None:
+            future = Future()
+            future.set_result("Memory Disabled")
+        return future
 
     def add_memory(self, text: str, metadata: Dict[str, str] = None) -> str:
-        """Stores a piece of information."""
-        if not self.vector_store:
+        """Stores a piece of information in the background, returns its ID."""
+        doc_id = str(uuid.uuid4())
+        if self._submit(self._document(text, metadata), doc_id) is None:
             return "Memory Disabled"
+        return doc_id
 
-        doc = Document(page_content=text, metadata=metadata or {})
-        ids = self.vector_store.add_documents([doc])
-        return ids[0] if ids else ""
+    def flush(self, timeout: float = None) -> bool:
+        """Waits until the queued memories are stored."""
+        writer = self.writer
+        return writer.flush(timeout) if writer else True
 
     def retrieve_relevant(self, query: str, k: int = 5) -> List[Document]:
         """Retrieves most relevant memories."""
-        if not self.vector_store:
+        vector_store = self.vector_store
+        if not vector_store:
             return []
-        return self.vector_store.similarity_search(query, k=k)
+        # Reads see the memories added before them
+        self.flush()
+        return vector_store.similarity_search(query, k=k)
 
-    def search_by_metadata(self, filter_dict: Dict[str, str]) -> List[Document]:
-        """Find memories matching specific metadata."""
-        if not self.vector_store:
+    def search_by_metadata(
+        self,
+        filter_dict: Dict[str, str],
+        limit: Optional[int] = None,
+        offset: int = 0,
+        order: Optional[str] = None,
+    ) -> List[Document]:
+        """
+        Find memories matching specific metadata, without embedding anything.
+
+        All the matches are returned unless `limit` is given. `order` is "asc"
+        or "desc" to sort the memories by timestamp, oldest or newest first.
+        """
+        vector_store = self.vector_store
+        if not vector_store:
+            return []
+        if order not in (None, "asc", "desc"):
+            raise ValueError(f"Invalid order: {order}")
+        self.flush()
+        where = _where(filter_dict)
+
+        if order is None:
+            result = vector_store.get(
+                where=where,
+                limit=limit,
+                offset=offset or None,
+                include=["documents", "metadatas"],
+            )
+            return self._documents(result)
+
+        # Sort on the metadata alone, then read the documents of the page only
+        matches = vector_store.get(where=where, include=["metadatas"])
+        ranked = sorted(
+            zip(matches["ids"], matches["metadatas"]),
+            key=lambda match: (match[1] or {}).get("timestamp", 0),
+            reverse=order == "desc",
+        )
+        end = None if limit is None else offset + limit
+        page_ids = [doc_id for doc_id, _ in ranked[offset:end]]
+        if not page_ids:
             return []
-        # Chroma supports where filter
-        return self.vector_store.similarity_search(" ", k=100, filter=filter_dict)
+        documents = {
+            doc.id: doc
+            for doc in self._documents(
+                vector_store.get(ids=page_ids, include=["documents", "metadatas"])
+            )
+        }
+        return [documents[doc_id] for doc_id in page_ids if doc_id in documents]
+
+    def count_by_metadata(self, filter_dict: Optional[Dict[str, str]] = None) -> int:
+        """Counts the memories matching specific metadata, all of them without a filter."""
+        vector_store = self.vector_store
+        if not vector_store:
+            return 0
+        self.flush()
+        return len(vector_store.get(where=_where(filter_dict), include=[])["ids"])
+
+    @staticmethod
+    def _documents(result: Dict) -> List[Document]:
+        return [
+            Document(id=doc_id, page_content=text or "", metadata=metadata or {})
+            for doc_id, text, metadata in zip(
+                result["ids"], result["documents"], result["metadatas"]
+            )
+        ]
 
     def clear(self):
         """Wipes memory (Use with caution)."""
-        if self.vector_store:
-            self.vector_store.delete_collection()
+        vector_store = self.vector_store
+        if vector_store:
+            # The next use opens an empty collection
+            get_memory_service(self.persist_directory).forget(self.collection_name)
+            vector_store.delete_collection()
+
+
+@lru_cache(maxsize=None)
+def get_cognitive_memory(
+    collection_name: str = "recursive_ai_memory", persist_directory: str = "./db"
+) -> CognitiveMemory:
+    """Shared memory of a collection, opened once per process."""
+    return CognitiveMemory(collection_name, persist_directory)
@@ -0,0 +1,163 @@
+import os
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import List, Dict, Optional
+import chromadb
+from langchain_chroma import Chroma
+from langchain_core.embeddings import Embeddings
+from langchain_openai import OpenAIEmbeddings
+from recursive_ai.memory.writer import MemoryWriter
+
+
+class CachedEmbeddings(Embeddings):
+    """Embeddings cached by content hash, so identical texts are embedded once."""
+
+    def __init__(self, embeddings: Embeddings, max_entries: int = 10000):
+        self.embeddings = embeddings
+        self.max_entries = max_entries
+        self._cache: "OrderedDict[str, List[float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _key(text: str) -> str:
+        return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+    def _lookup(self, keys: List[str]) -> Dict[str, List[float]]:
+        with self._lock:
+            found = {}
+            for key in keys:
+                if key in self._cache:
+                    self._cache.move_to_end(key)
+                    found[key] = self._cache[key]
+            return found
+
+    def _store(self, vectors: Dict[str, List[float]]):
+        with self._lock:
+            self._cache.update(vectors)
+            while len(self._cache) > self.max_entries:
+                self._cache.popitem(last=False)
+
+    def _count(self, hits: int = 0, misses: int = 0):
+        # The embeddings are used by the graph nodes and the writer threads
+        with self._lock:
+            self.hits += hits
+            self.misses += misses
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        """Embeds the texts not in the cache, in one call."""
+        keys = [self._key(text) for text in texts]
+        found = self._lookup(keys)
+        missing = {key: text for key, text in zip(keys, texts) if key not in found}
+        self._count(hits=len(keys) - len(missing), misses=len(missing))
+        if missing:
+            vectors = self.embeddings.embed_documents(list(missing.values()))
+            computed = dict(zip(missing.keys(), vectors))
+            self._store(computed)
+            found.update(computed)
+        return [found[key] for key in keys]
+
+    def embed_query(self, text: str) -> List[float]:
+        key = f"query:{self._key(text)}"
+        found = self._lookup([key])
+        if key in found:
+            self._count(hits=1)
+            return found[key]
+        self._count(misses=1)
+        vector = self.embeddings.embed_query(text)
+        self._store({key: vector})
+        return vector
+
+
+class MemoryService:
+    """
+    Shares one Chroma client and one embedding cache between the memories.
+
+    Each collection is opened once, the vector stores and their write-behind
+    queues are reused by every CognitiveMemory and SkillLibrary of the process.
+    """
+
+    def __init__(
+        self,
+        persist_directory: str = "./db",
+        embeddings: Optional[Embeddings] = None,
+        batch_size: int = 32,
+        flush_interval: float = 1.0,
+    ):
+        self.persist_directory = persist_directory
+        self.embeddings = CachedEmbeddings(embeddings) if embeddings else None
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._client = None
+        self._stores: Dict[str, Chroma] = {}
+        self._writers: Dict[str, MemoryWriter] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def client(self):
+        with self._lock:
+            if self._client is None:
+                self._client = chromadb.PersistentClient(path=self.persist_directory)
+            return self._client
+
+    def get_vector_store(self, collection_name: str) -> Optional[Chroma]:
+        """Returns the vector store of a collection, None when embeddings are unavailable."""
+        if not self.embeddings:
+            return None
+        client = self.client
+        with self._lock:
+            if collection_name not in self._stores:
+                self._stores[collection_name] = Chroma(
+                    collection_name=collection_name,
+                    embedding_function=self.embeddings,
+                    client=client,
+                )
+            return self._stores[collection_name]
+
+    def get_writer(self, collection_name: str) -> Optional[MemoryWriter]:
+        """Returns the write-behind queue of a collection."""
+        vector_store = self.get_vector_store(collection_name)
+        if vector_store is None:
+            return None
+        with self._lock:
+            if collection_name not in self._writers:
+                self._writers[collection_name] = MemoryWriter(
+                    vector_store, self.batch_size, self.flush_interval
+                )
+            return self._writers[collection_name]
+
+    def forget(self, collection_name: str):
+        """
+        Drops the cached store of a deleted collection.
+
+        Its writer is closed once the queued documents are written, the next
+        lookup opens a new store and writer.
+        """
+        with self._lock:
+            self._stores.pop(collection_name, None)
+            writer = self._writers.pop(collection_name, None)
+        if writer:
+            writer.close()
+
+
+_services: Dict[str, MemoryService] = {}
+_services_lock = threading.Lock()
+
+
+def get_memory_service(persist_directory: str = "./db") -> MemoryService:
+    """
+    Process-wide memory service of a persist directory.
+
+    Embeddings need OPENAI_API_KEY, the memory is disabled without it. A
+    disabled service is not kept, so the key is checked again on the next call.
+    """
+    with _services_lock:
+        service = _services.get(persist_directory)
+        if service is None:
+            if not os.getenv("OPENAI_API_KEY"):
+                return MemoryService(persist_directory)
+            service = MemoryService(persist_directory, OpenAIEmbeddings())
+            _services[persist_directory] = service
+        return service
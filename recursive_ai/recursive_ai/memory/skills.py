@@ -1,42 +1,48 @@
+from functools import lru_cache
 from typing import List, Dict, Optional
-from langchain_chroma import Chroma
-from langchain_openai import OpenAIEmbeddings
 from langchain_core.documents import Document
+from recursive_ai.memory.service import get_memory_service
 
 class SkillLibrary:
     """Specialized memory for executable code patterns and strategies."""
     def __init__(self, collection_name: str = "recursive_ai_skills", persist_directory: str = "./db"):
         self.collection_name = collection_name
         self.persist_directory = persist_directory
+
+    @property
+    def vector_store(self):
+        """Looked up on each use, like the CognitiveMemory store."""
         try:
-            self.embeddings = OpenAIEmbeddings()
-            self.vector_store = Chroma(
-                collection_name=collection_name,
-                embedding_function=self.embeddings,
-                persist_directory=persist_directory
-            )
+            return get_memory_service(self.persist_directory).get_vector_store(self.collection_name)
         except Exception:
-            self.vector_store = None
+            return None
 
     def store_skill(self, name: str, code: str, description: str, usage_count: int = 0) -> str:
         """Stores a successful code pattern or function."""
-        if not self.vector_store:
+        vector_store = self.vector_store
+        if not vector_store:
             return "Skill Library Disabled"
 
         doc = Document(
             page_content=f"{description}\n\n```python\n{code}\n```",
             metadata={"name": name, "type": "code", "usage_count": usage_count}
         )
-        ids = self.vector_store.add_documents([doc])
+        ids = vector_store.add_documents([doc])
         return ids[0] if ids else ""
 
     def retrieve_skill(self, query: str, k: int = 3) -> List[Document]:
         """Finds code snippets relevant to the problem."""
-        if not self.vector_store:
+        vector_store = self.vector_store
+        if not vector_store:
             return []
-        return self.vector_store.similarity_search(query, k=k)
+        return vector_store.similarity_search(query, k=k)
 
     def update_usage(self, skill_id: str):
         """Increments usage count (simulated via metadata update - requires re-indexing in Chroma)."""
         # For simplicity in this iteration, we skip complex update logic
         pass
+
+@lru_cache(maxsize=None)
+def get_skill_library(collection_name: str = "recursive_ai_skills", persist_directory: str = "./db") -> SkillLibrary:
+    """Shared skill library of a collection, opened once per process."""
+    return SkillLibrary(collection_name, persist_directory)
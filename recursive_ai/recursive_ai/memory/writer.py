@@ -0,0 +1,107 @@
+import atexit
+import threading
+import time
+from concurrent.futures import Future
+from typing import List, Tuple
+from langchain_core.documents import Document
+
+
+class MemoryWriter:
+    """
+    Write-behind queue of a vector store.
+
+    Documents are written by a background thread in batches, embedded in one
+    call per batch. A batch is written once it holds `batch_size` documents,
+    `flush_interval` seconds after its first document was queued, on flush()
+    and at interpreter shutdown.
+    """
+
+    def __init__(self, vector_store, batch_size: int = 32, flush_interval: float = 1.0):
+        self.vector_store = vector_store
+        self.batch_size = max(1, batch_size)
+        self.flush_interval = flush_interval
+        # Queued documents, with their ID, future and the time they were queued
+        self._pending: List[Tuple[Document, str, Future, float]] = []
+        self._writing = 0
+        self._flush_requests = 0
+        self._closed = False
+        self._cond = threading.Condition()
+        self._thread = None
+
+    def submit(self, document: Document, doc_id: str) -> Future:
+        """Queues a document, the future resolves to its ID once it is written."""
+        future = Future()
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("Memory writer is closed")
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="memory-writer", daemon=True
+                )
+                self._thread.start()
+                atexit.register(self.close)
+            self._pending.append((document, doc_id, future, time.monotonic()))
+            self._cond.notify_all()
+        return future
+
+    def _next_batch(self) -> List[Tuple[Document, str, Future, float]]:
+        with self._cond:
+            while not self._pending and not self._closed:
+                self._cond.wait()
+            # Wait for a full batch, unless the oldest document waited long enough
+            while (
+                len(self._pending) < self.batch_size
+                and not self._flush_requests
+                and not self._closed
+            ):
+                queued_at = self._pending[0][3]
+                remaining = queued_at + self.flush_interval - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._cond.wait(remaining)
+            batch = self._pending[: self.batch_size]
+            self._pending = self._pending[self.batch_size :]
+            self._writing += len(batch)
+            return batch
+
+    def _run(self):
+        while True:
+            batch = self._next_batch()
+            if not batch:
+                return  # Closed and drained
+            try:
+                ids = self.vector_store.add_documents(
+                    [document for document, _, _, _ in batch],
+                    ids=[doc_id for _, doc_id, _, _ in batch],
+                )
+                for (_, _, future, _), doc_id in zip(batch, ids):
+                    future.set_result(doc_id)
+            except Exception as e:
+                print(f"WARNING: Failed to write {len(batch)} memories: {e}")
+                for _, _, future, _ in batch:
+                    future.set_exception(e)
+            finally:
+                with self._cond:
+                    self._writing -= len(batch)
+                    self._cond.notify_all()
+
+    def flush(self, timeout: float = None) -> bool:
+        """Writes the queued documents now, returns False on timeout."""
+        with self._cond:
+            self._flush_requests += 1
+            self._cond.notify_all()
+            try:
+                return self._cond.wait_for(
+                    lambda: not self._pending and not self._writing, timeout
+                )
+            finally:
+                self._flush_requests -= 1
+
+    def close(self):
+        """Writes the queued documents and stops the background thread."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+            thread = self._thread
+        if thread is not None:
+            thread.join()
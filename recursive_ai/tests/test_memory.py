@@ -0,0 +1,289 @@
+import unittest
+import os
+import tempfile
+import time
+from unittest.mock import MagicMock, PropertyMock, patch
+from langchain_core.documents import Document
+from langchain_core.embeddings import DeterministicFakeEmbedding
+from recursive_ai.memory import service as service_module
+from recursive_ai.memory.service import (
+    CachedEmbeddings,
+    MemoryService,
+    get_memory_service,
+)
+from recursive_ai.memory.long_term import CognitiveMemory, get_cognitive_memory
+from recursive_ai.memory.skills import SkillLibrary
+from recursive_ai.memory.writer import MemoryWriter
+
+
+class CountingEmbeddings(DeterministicFakeEmbedding):
+    calls: list = []
+
+    def embed_documents(self, texts):
+        self.calls.append(list(texts))
+        return super().embed_documents(texts)
+
+    def embed_query(self, text):
+        self.calls.append(text)
+        return super().embed_query(text)
+
+
+class TestMemoryService(unittest.TestCase):
+    def setUp(self):
+        os.environ["OPENAI_API_KEY"] = "sk-dummy-key"
+        self.tmp = tempfile.TemporaryDirectory()
+        self.embeddings = CountingEmbeddings(size=16, calls=[])
+        self.service = MemoryService(self.tmp.name, self.embeddings)
+        patcher = patch(
+            "recursive_ai.memory.long_term.get_memory_service",
+            return_value=self.service,
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        patcher = patch(
+            "recursive_ai.memory.skills.get_memory_service", return_value=self.service
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_identical_texts_embedded_once(self):
+        embeddings = CachedEmbeddings(self.embeddings)
+        first = embeddings.embed_documents(["alpha", "beta", "alpha"])
+        second = embeddings.embed_documents(["beta", "alpha"])
+
+        self.assertEqual(self.embeddings.calls, [["alpha", "beta"]])
+        self.assertEqual(first[0], first[2])
+        self.assertEqual(second, [first[1], first[0]])
+        self.assertEqual(embeddings.hits, 3)
+
+    def test_collections_opened_once(self):
+        first = CognitiveMemory(persist_directory=self.tmp.name)
+        second = CognitiveMemory(persist_directory=self.tmp.name)
+        skills = SkillLibrary(persist_directory=self.tmp.name)
+
+        self.assertIs(first.vector_store, second.vector_store)
+        self.assertIsNot(first.vector_store, skills.vector_store)
+        self.assertIs(
+            self.service.get_vector_store("recursive_ai_skills"), skills.vector_store
+        )
+
+        first.add_memory("Quantum computing breaks RSA", {"type": "report"})
+        found = second.retrieve_relevant("Quantum computing breaks RSA", k=1)
+        self.assertEqual(found[0].page_content, "Quantum computing breaks RSA")
+
+    def test_memories_written_in_batches(self):
+        memory = CognitiveMemory(persist_directory=self.tmp.name)
+        ids = [memory.add_memory(f"Finding {i}", {"type": "report"}) for i in range(5)]
+        future = memory.add_memory_async("Finding 5")
+
+        self.assertEqual(self.embeddings.calls, [])
+        self.assertTrue(memory.flush(timeout=5))
+        self.assertEqual(self.embeddings.calls, [[f"Finding {i}" for i in range(6)]])
+        self.assertEqual(
+            len(memory.vector_store.get(ids=ids + [future.result()])["ids"]), 6
+        )
+
+    def test_metadata_queries(self):
+        memory = CognitiveMemory(persist_directory=self.tmp.name)
+        with patch(
+            "recursive_ai.memory.long_term.time.time", side_effect=range(100, 200)
+        ):
+            for i in range(5):
+                memory.add_memory(
+                    f"Experiment {i}", {"type": "experiment", "id": str(i)}
+                )
+            memory.add_memory("Report", {"type": "report"})
+        memory.flush()
+        embedding_calls = len(self.embeddings.calls)
+
+        experiments = memory.search_by_metadata({"type": "experiment"})
+        self.assertEqual(len(experiments), 5)
+        self.assertEqual(memory.count_by_metadata({"type": "experiment"}), 5)
+        self.assertEqual(memory.count_by_metadata(), 6)
+        self.assertEqual(
+            [
+                d.page_content
+                for d in memory.search_by_metadata({"type": "experiment", "id": "3"})
+            ],
+            ["Experiment 3"],
+        )
+
+        newest = memory.search_by_metadata(
+            {"type": "experiment"}, limit=2, order="desc"
+        )
+        self.assertEqual(
+            [d.page_content for d in newest], ["Experiment 4", "Experiment 3"]
+        )
+        page = memory.search_by_metadata(
+            {"type": "experiment"}, limit=2, offset=2, order="asc"
+        )
+        self.assertEqual(
+            [d.page_content for d in page], ["Experiment 2", "Experiment 3"]
+        )
+        self.assertEqual(page[0].metadata["timestamp"], 102)
+        self.assertEqual(
+            len(memory.search_by_metadata({"type": "experiment"}, limit=2, offset=4)), 1
+        )
+        self.assertEqual(
+            memory.search_by_metadata({"type": "missing"}, order="desc"), []
+        )
+        # Nothing was embedded by the queries
+        self.assertEqual(len(self.embeddings.calls), embedding_calls)
+
+        with self.assertRaises(ValueError):
+            memory.search_by_metadata({"type": "report"}, order="newest")
+
+    def test_clear_reopens_collection(self):
+        memory = CognitiveMemory(persist_directory=self.tmp.name)
+        memory.add_memory("To be forgotten")
+        writer = memory.writer
+        memory.clear()
+
+        reopened = CognitiveMemory(persist_directory=self.tmp.name)
+        self.assertEqual(reopened.retrieve_relevant("To be forgotten"), [])
+
+        # The cleared instance keeps working
+        self.assertIs(memory.vector_store, reopened.vector_store)
+        self.assertIsNot(memory.writer, writer)
+        memory.add_memory("Remembered")
+        self.assertEqual(
+            [d.page_content for d in memory.retrieve_relevant("Remembered")],
+            ["Remembered"],
+        )
+
+    def test_other_memories_survive_clear(self):
+        memory = CognitiveMemory(persist_directory=self.tmp.name)
+        other = CognitiveMemory(persist_directory=self.tmp.name)
+        stale_writer = other.writer
+        memory.add_memory("To be forgotten")
+        memory.clear()
+
+        other.add_memory("Added after clear")
+        # A writer looked up before the clear was closed by it
+        with patch.object(
+            CognitiveMemory,
+            "writer",
+            new_callable=PropertyMock,
+            side_effect=[stale_writer, memory.writer],
+        ):
+            future = other.add_memory_async("Added during clear")
+        self.assertTrue(other.flush(timeout=5))
+
+        self.assertNotEqual(future.result(timeout=5), "Memory Disabled")
+        self.assertEqual(
+            sorted(d.page_content for d in memory.search_by_metadata({})),
+            ["Added after clear", "Added during clear"],
+        )
+
+    def test_shared_memory(self):
+        self.addCleanup(get_cognitive_memory.cache_clear)
+        self.assertIs(get_cognitive_memory(), get_cognitive_memory())
+
+
+class TestGetMemoryService(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.addCleanup(service_module._services.pop, self.tmp.name, None)
+        patcher = patch.dict(os.environ)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_memory_enabled_once_key_is_set(self):
+        os.environ.pop("OPENAI_API_KEY", None)
+        memory = CognitiveMemory(persist_directory=self.tmp.name)
+        self.assertEqual(memory.add_memory("Too early"), "Memory Disabled")
+        self.assertIsNot(
+            get_memory_service(self.tmp.name), get_memory_service(self.tmp.name)
+        )
+
+        os.environ["OPENAI_API_KEY"] = "sk-dummy-key"
+        service = get_memory_service(self.tmp.name)
+        self.assertIs(get_memory_service(self.tmp.name), service)
+        self.assertIsNotNone(memory.embeddings)
+        self.assertIs(
+            memory.vector_store, service.get_vector_store(memory.collection_name)
+        )
+
+
+class TestMemoryWriter(unittest.TestCase):
+    def setUp(self):
+        self.store = MagicMock()
+        self.store.add_documents.side_effect = lambda documents, ids: ids
+
+    def make_writer(self, **kwargs):
+        writer = MemoryWriter(self.store, **kwargs)
+        self.addCleanup(writer.close)
+        return writer
+
+    def test_writes_full_batches(self):
+        writer = self.make_writer(batch_size=3, flush_interval=60)
+        futures = [
+            writer.submit(Document(page_content=str(i)), f"id-{i}") for i in range(7)
+        ]
+
+        self.assertEqual(
+            [f.result(timeout=5) for f in futures[:6]], [f"id-{i}" for i in range(6)]
+        )
+        self.assertFalse(futures[6].done())
+        self.assertEqual(self.store.add_documents.call_count, 2)
+
+        self.assertTrue(writer.flush(timeout=5))
+        self.assertEqual(futures[6].result(), "id-6")
+        self.assertEqual(self.store.add_documents.call_count, 3)
+
+    def test_leftovers_written_at_their_own_deadline(self):
+        def add_documents(documents, ids):
+            if documents[0].page_content == "0":
+                time.sleep(0.3)
+            return ids
+
+        self.store.add_documents.side_effect = add_documents
+        writer = self.make_writer(batch_size=2, flush_interval=0.2)
+        started = time.monotonic()
+        for i in range(2):
+            writer.submit(Document(page_content=str(i)), str(i))
+        time.sleep(0.05)
+        futures = [
+            writer.submit(Document(page_content=str(i)), str(i)) for i in range(2, 5)
+        ]
+
+        # The leftover was queued during the slow first write, its deadline
+        # passed by the time the full batch after it is written
+        futures[-1].result(timeout=5)
+        self.assertLess(time.monotonic() - started, 0.45)
+        self.assertEqual(self.store.add_documents.call_count, 3)
+
+    def test_writes_after_flush_interval(self):
+        writer = self.make_writer(batch_size=100, flush_interval=0.05)
+        futures = [
+            writer.submit(Document(page_content=str(i)), str(i)) for i in range(3)
+        ]
+
+        self.assertEqual([f.result(timeout=5) for f in futures], ["0", "1", "2"])
+        self.store.add_documents.assert_called_once()
+
+    def test_close_drains_queue(self):
+        writer = MemoryWriter(self.store, batch_size=100, flush_interval=60)
+        future = writer.submit(Document(page_content="last"), "last")
+        writer.close()
+
+        self.assertEqual(future.result(timeout=0), "last")
+        with self.assertRaises(RuntimeError):
+            writer.submit(Document(page_content="late"), "late")
+
+    def test_failed_write_reported_on_futures(self):
+        self.store.add_documents.side_effect = ValueError("disk full")
+        writer = self.make_writer(batch_size=1)
+        future = writer.submit(Document(page_content="lost"), "lost")
+
+        with self.assertRaises(ValueError):
+            future.result(timeout=5)
+        self.assertTrue(writer.flush(timeout=5))
+
+
+if __name__ == "__main__":
+    unittest.main()
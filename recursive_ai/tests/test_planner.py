@@ -0,0 +1,86 @@
+import unittest
+import os
+import threading
+from langchain_core.messages import AIMessage
+from langchain_core.runnables import RunnableLambda
+from recursive_ai.core.planner import ToTPlanner, get_tot_planner
+
+GENERATION = """1. Step: Research prior work | Reasoning: Know the field
+2. Step: Write the code | Reasoning: Make progress
+3. Step: Run an experiment | Reasoning: Check the idea"""
+
+
+class FakeLLM:
+    """Answers the planner prompts and records them."""
+
+    def __init__(self, answer):
+        self.answer = answer
+        self.prompts = []
+        self.lock = threading.Lock()
+
+    def __call__(self, prompt_value):
+        text = prompt_value.to_string()
+        with self.lock:
+            self.prompts.append(text)
+        return AIMessage(content=self.answer(text))
+
+
+class TestToTPlanner(unittest.TestCase):
+    def setUp(self):
+        os.environ["OPENAI_API_KEY"] = "sk-dummy-key"
+
+    def make_planner(self, scores, **kwargs):
+        planner = ToTPlanner(**kwargs)
+        self.generator = FakeLLM(lambda text: GENERATION)
+        self.evaluator = FakeLLM(scores)
+        planner.llm = RunnableLambda(self.generator)
+        planner.evaluator = RunnableLambda(self.evaluator)
+        return planner
+
+    def test_thoughts_scored_in_one_call(self):
+        planner = self.make_planner(lambda text: "1: 0.2\n2: 0.9\n3: 0.4")
+
+        self.assertEqual(planner.select_best_step("Build a parser", []), "code")
+        self.assertEqual(len(self.generator.prompts), 1)
+        self.assertEqual(len(self.evaluator.prompts), 1)
+
+    def test_missing_scores_rated_individually(self):
+        def scores(text):
+            if "Proposed Steps:" in text:
+                return "1: 0.2\n3: 0.4"
+            return "0.95" if "Write the code" in text else "not a number"
+
+        planner = self.make_planner(scores)
+        thoughts = planner.evaluate_thoughts(
+            "Build a parser", planner.generate_thoughts("Build a parser", [])
+        )
+
+        self.assertEqual([t["score"] for t in thoughts], [0.2, 0.95, 0.4])
+        self.assertEqual(len(self.evaluator.prompts), 2)
+
+    def test_beam_search_with_node_budget(self):
+        def scores(text):
+            # Plans going on with an experiment score best
+            return (
+                "1: 0.5\n2: 0.1\n3: 0.7"
+                if "Planned steps so far" in text
+                else "1: 0.9\n2: 0.3\n3: 0.6"
+            )
+
+        planner = self.make_planner(scores, depth=3, beam_width=2, node_budget=9)
+        plan = planner.search("Build a parser", [])
+
+        # 3 thoughts at the first level, 2 plans expanded at the second,
+        # then the budget is spent
+        self.assertEqual(len(self.generator.prompts), 3)
+        self.assertEqual(len(self.evaluator.prompts), 3)
+        self.assertEqual(
+            [t["step"] for t in plan], ["Research prior work", "Run an experiment"]
+        )
+
+    def test_shared_planner(self):
+        self.assertIs(get_tot_planner(), get_tot_planner())
+
+
+if __name__ == "__main__":
+    unittest.main()
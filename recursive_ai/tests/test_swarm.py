@@ -0,0 +1,174 @@
+import unittest
+import asyncio
+import os
+from unittest.mock import patch
+from langgraph.graph import StateGraph, END
+from recursive_ai.core.swarm import SwarmManager, Subtask, parse_subtasks
+from recursive_ai.graph import AgentState, swarm_node
+
+
+class FakeAgent:
+    """Async agent that records how many calls run at the same time."""
+
+    def __init__(self, delays=None):
+        self.delays = delays or {}
+        self.running = 0
+        self.max_running = 0
+        self.cancelled = []
+
+    async def _run(self, description):
+        self.running += 1
+        self.max_running = max(self.max_running, self.running)
+        try:
+            delay = self.delays.get(description, 0.01)
+            if isinstance(delay, Exception):
+                raise delay
+            await asyncio.sleep(delay)
+            return f"done: {description}"
+        except asyncio.CancelledError:
+            self.cancelled.append(description)
+            raise
+        finally:
+            self.running -= 1
+
+    aperform_research = _run
+    aimplement_feature = _run
+
+
+class TestParseSubtasks(unittest.TestCase):
+    def test_json_objects(self):
+        text = '```json\n[{"description": "Find papers", "agent": "research"}, {"description": "Write module", "agent": "engineer"}]\n```'
+        self.assertEqual(
+            parse_subtasks(text, "task"),
+            [
+                Subtask(description="Find papers", agent="research"),
+                Subtask(description="Write module", agent="engineer"),
+            ],
+        )
+
+    def test_list_of_strings_routed(self):
+        subtasks = parse_subtasks('["Research X", "Write module Y"]', "task")
+        self.assertEqual([st.agent for st in subtasks], ["research", "engineer"])
+
+    def test_invalid_output_falls_back_to_task(self):
+        for text in ["not json", '{"description": "x"}', '[{"agent": "pilot"}]', "[]"]:
+            self.assertEqual(
+                parse_subtasks(text, "Find a cure"),
+                [Subtask(description="Find a cure", agent="research")],
+            )
+
+    def test_subtasks_capped(self):
+        self.assertEqual(
+            len(
+                parse_subtasks(
+                    str([f"Research {i}" for i in range(20)]).replace("'", '"'),
+                    "task",
+                    max_subtasks=5,
+                )
+            ),
+            5,
+        )
+
+
+class TestSwarmManager(unittest.TestCase):
+    def setUp(self):
+        os.environ["OPENAI_API_KEY"] = "sk-dummy-key"
+
+    def make_manager(self, agent, subtasks, **kwargs):
+        manager = SwarmManager(memory=None, **kwargs)
+        manager._researcher = manager._engineer = agent
+
+        async def decompose(task):
+            return subtasks
+
+        manager.decompose = decompose
+        return manager
+
+    def test_bounded_concurrency_and_agent_reuse(self):
+        agent = FakeAgent()
+        subtasks = [Subtask(description=f"Research {i}") for i in range(10)]
+        manager = self.make_manager(agent, subtasks, max_concurrency=3)
+        streamed = []
+
+        report = asyncio.run(
+            manager.decompose_and_execute("task", on_result=streamed.append)
+        )
+
+        self.assertEqual(agent.max_running, 3)
+        self.assertEqual(len(streamed), 10)
+        self.assertIs(manager.researcher, agent)
+        self.assertTrue(
+            report.startswith(
+                "Swarm Execution Complete.\nSubtask 1 (done): done: Research 0"
+            )
+        )
+
+    def test_timeouts_and_failures(self):
+        agent = FakeAgent({"slow": 5, "broken": ValueError("boom")})
+        subtasks = [Subtask(description=d) for d in ("slow", "broken", "fast")]
+        manager = self.make_manager(agent, subtasks, subtask_timeout=0.1)
+        streamed = []
+
+        report = asyncio.run(
+            manager.decompose_and_execute("task", on_result=streamed.append)
+        )
+
+        # Results are streamed as they complete, and reported in order
+        self.assertEqual(
+            [r.subtask.description for r in streamed], ["broken", "fast", "slow"]
+        )
+        self.assertEqual([r.status for r in streamed], ["failed", "done", "timeout"])
+        self.assertIn("Subtask 1 (timeout)", report)
+        self.assertIn("Subtask 2 (failed): Error: boom", report)
+        self.assertEqual(agent.cancelled, ["slow"])
+
+    def test_stopping_early_cancels_running_subtasks(self):
+        agent = FakeAgent({"slow": 5})
+        manager = self.make_manager(agent, [])
+
+        async def first_result():
+            results = manager.run_subtasks(
+                [Subtask(description="fast"), Subtask(description="slow")]
+            )
+            result = await anext(results)
+            await results.aclose()
+            return result
+
+        self.assertEqual(asyncio.run(first_result()).subtask.description, "fast")
+        self.assertEqual(agent.cancelled, ["slow"])
+
+    def test_swarm_node_streams_partial_results(self):
+        agent = FakeAgent()
+        manager = self.make_manager(
+            agent,
+            [Subtask(description="Research A"), Subtask(description="Research B")],
+        )
+
+        builder = StateGraph(AgentState)
+        builder.add_node("swarm", swarm_node)
+        builder.set_entry_point("swarm")
+        builder.add_edge("swarm", END)
+        graph = builder.compile()
+
+        async def run():
+            return [
+                chunk
+                async for chunk in graph.astream(
+                    {"task": "task", "messages": []}, stream_mode=["custom", "updates"]
+                )
+            ]
+
+        with patch("recursive_ai.graph.get_swarm_manager", return_value=manager):
+            chunks = asyncio.run(run())
+
+        partial = [
+            event["swarm"]["output"] for mode, event in chunks if mode == "custom"
+        ]
+        self.assertEqual(sorted(partial), ["done: Research A", "done: Research B"])
+        self.assertIn(
+            "Swarm Execution Complete", chunks[-1][1]["swarm"]["messages"][0].content
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
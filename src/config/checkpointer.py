@@ -0,0 +1,23 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+import enum
+import os
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+
+class CheckpointerBackend(enum.Enum):
+    MEMORY = "memory"
+    SQLITE = "sqlite"
+
+
+# Checkpointer configuration
+SELECTED_CHECKPOINTER = os.getenv("CHECKPOINTER", CheckpointerBackend.MEMORY.value)
+CHECKPOINTER_SQLITE_PATH = os.getenv("CHECKPOINTER_SQLITE_PATH", "checkpoints.sqlite")
+# Number of checkpoints kept per thread, older ones are compacted away
+CHECKPOINTER_KEEP_LAST = int(os.getenv("CHECKPOINTER_KEEP_LAST", "20"))
+# Threads idle for longer than this many seconds are evicted (0 disables eviction)
+CHECKPOINTER_THREAD_TTL = float(os.getenv("CHECKPOINTER_THREAD_TTL", "604800"))
@@ -24,6 +24,7 @@ class Configuration:
     mcp_settings: dict = None  # MCP settings, including dynamic loaded tools
     report_style: str = ReportStyle.ACADEMIC.value  # Report style
     enable_deep_thinking: bool = False  # Whether to enable deep thinking
+    max_concurrent_steps: int = 1  # Maximum number of research steps run at once
 
     @classmethod
     def from_runnable_config(
@@ -2,8 +2,9 @@
 # SPDX-License-Identifier: MIT
 
 from .article import Article
+from .cache import CrawlCache
 from .crawler import Crawler
 from .jina_client import JinaClient
 from .readability_extractor import ReadabilityExtractor
 
-__all__ = ["Article", "Crawler", "JinaClient", "ReadabilityExtractor"]
+__all__ = ["Article", "CrawlCache", "Crawler", "JinaClient", "ReadabilityExtractor"]
@@ -10,15 +10,23 @@ from markdownify import markdownify as md
 class Article:
     url: str
 
-    def __init__(self, title: str, html_content: str):
+    def __init__(self, title: str, html_content: str, markdown: str | None = None):
         self.title = title
         self.html_content = html_content
+        # Converted lazily and kept, markdownify is slow on large pages
+        self._markdown = markdown
+
+    @property
+    def markdown(self) -> str:
+        if self._markdown is None:
+            self._markdown = md(self.html_content)
+        return self._markdown
 
     def to_markdown(self, including_title: bool = True) -> str:
         markdown = ""
         if including_title:
             markdown += f"# {self.title}\n\n"
-        markdown += md(self.html_content)
+        markdown += self.markdown
         return markdown
 
     def to_message(self) -> list[dict]:
@@ -0,0 +1,253 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+"""
+Two-tier cache for crawled pages.
+
+Entries are keyed by the hash of the normalized URL and hold both the raw
+HTML and the extracted article, so a hit skips the Jina request as well as
+readability extraction and markdown conversion. An in-memory LRU sits in
+front of an optional on-disk store that survives restarts and is shared by
+server workers.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from typing import Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+logger = logging.getLogger(__name__)
+
+_DEFAULT_PORTS = {"http": 80, "https": 443}
+
+
+def normalize_url(url: str) -> str:
+    """Normalize a URL so that equivalent spellings share one cache entry."""
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or "").lower()
+    netloc = host
+    if parts.port and parts.port != _DEFAULT_PORTS.get(scheme):
+        netloc = f"{host}:{parts.port}"
+    if parts.username:
+        netloc = f"{parts.username}@{netloc}"
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    # The fragment is never sent to the server
+    return urlunsplit((scheme, netloc, parts.path or "/", query, ""))
+
+
+def cache_key(url: str) -> str:
+    return hashlib.sha256(normalize_url(url).encode("utf-8")).hexdigest()
+
+
+@dataclass
+class CrawlCacheEntry:
+    url: str
+    html: str
+    title: Optional[str]
+    html_content: Optional[str]
+    markdown: Optional[str]
+    created_at: float
+
+
+class CrawlCache:
+    """
+    Thread-safe LRU cache of crawled pages with an optional disk tier.
+
+    Entries expire `ttl` seconds after they were crawled. The memory tier
+    holds at most `max_entries` entries; the disk tier (enabled by passing
+    `cache_dir`) is trimmed to `max_disk_bytes` by deleting the least
+    recently written files.
+    """
+
+    def __init__(
+        self,
+        ttl: float = 86400.0,
+        max_entries: int = 256,
+        cache_dir: Optional[str] = None,
+        max_disk_bytes: int = 512 * 1024 * 1024,
+    ):
+        self.ttl = ttl
+        self.max_entries = max(1, max_entries)
+        self.cache_dir = cache_dir
+        self.max_disk_bytes = max_disk_bytes
+        self._entries: OrderedDict[str, CrawlCacheEntry] = OrderedDict()
+        self._lock = threading.RLock()
+        self._key_locks: dict[str, threading.Lock] = {}
+        self._stats = {
+            "memory_hits": 0,
+            "disk_hits": 0,
+            "misses": 0,
+            "evictions": 0,
+        }
+        self._disk_bytes = 0
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+            self._disk_bytes = sum(size for _, size, _ in self._disk_files())
+
+    def get(self, url: str) -> Optional[CrawlCacheEntry]:
+        """Return the cached entry of a URL, or None if missing or expired."""
+        key = cache_key(url)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if self._is_fresh(entry):
+                    self._entries.move_to_end(key)
+                    self._stats["memory_hits"] += 1
+                    return entry
+                del self._entries[key]
+
+        entry = self._read_disk(key)
+        with self._lock:
+            if entry is None:
+                self._stats["misses"] += 1
+                return None
+            self._stats["disk_hits"] += 1
+            self._store_memory(key, entry)
+        return entry
+
+    def put(self, entry: CrawlCacheEntry) -> None:
+        key = cache_key(entry.url)
+        with self._lock:
+            self._store_memory(key, entry)
+        self._write_disk(key, entry)
+
+    def lock(self, url: str) -> threading.Lock:
+        """
+        Return the lock of a URL, used to crawl each URL once when several
+        callers miss the cache at the same time.
+        """
+        key = cache_key(url)
+        with self._lock:
+            return self._key_locks.setdefault(key, threading.Lock())
+
+    def release(self, url: str) -> None:
+        """Forget the lock of a URL once nobody is crawling it."""
+        key = cache_key(url)
+        with self._lock:
+            lock = self._key_locks.get(key)
+            if lock is not None and not lock.locked():
+                del self._key_locks[key]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            for name, size, _ in self._disk_files():
+                self._remove_file(name, size)
+
+    def stats(self) -> dict[str, int]:
+        """Return hit/miss counters and the current size of both tiers."""
+        with self._lock:
+            return {
+                **self._stats,
+                "hits": self._stats["memory_hits"] + self._stats["disk_hits"],
+                "memory_entries": len(self._entries),
+                "disk_bytes": self._disk_bytes,
+            }
+
+    def _is_fresh(self, entry: CrawlCacheEntry) -> bool:
+        return self.ttl <= 0 or time.time() - entry.created_at < self.ttl
+
+    def _store_memory(self, key: str, entry: CrawlCacheEntry) -> None:
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self._stats["evictions"] += 1
+
+    def _read_disk(self, key: str) -> Optional[CrawlCacheEntry]:
+        if not self.cache_dir:
+            return None
+        path = os.path.join(self.cache_dir, f"{key}.json")
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+            entry = CrawlCacheEntry(**json.loads(data))
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, TypeError) as e:
+            logger.warning(f"Ignoring unreadable crawl cache file {path}: {e}")
+            return None
+        if not self._is_fresh(entry):
+            with self._lock:
+                self._remove_file(f"{key}.json", len(data))
+            return None
+        return entry
+
+    def _write_disk(self, key: str, entry: CrawlCacheEntry) -> None:
+        if not self.cache_dir:
+            return
+        path = os.path.join(self.cache_dir, f"{key}.json")
+        try:
+            fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(asdict(entry), f, ensure_ascii=False)
+            size = os.path.getsize(tmp_path)
+            with self._lock:
+                old_size = os.path.getsize(path) if os.path.exists(path) else 0
+                # Atomic, so readers never see a partially written entry
+                os.replace(tmp_path, path)
+                self._disk_bytes += size - old_size
+                if self._disk_bytes > self.max_disk_bytes:
+                    self._trim_disk()
+        except OSError as e:
+            logger.warning(f"Failed to write crawl cache file {path}: {e}")
+
+    def _trim_disk(self) -> None:
+        # Oldest first, until the disk tier is back under 90% of its budget
+        for name, size, _ in sorted(self._disk_files(), key=lambda f: f[2]):
+            if self._disk_bytes <= self.max_disk_bytes * 0.9:
+                break
+            self._remove_file(name, size)
+            self._stats["evictions"] += 1
+
+    def _disk_files(self) -> list[tuple[str, int, float]]:
+        if not self.cache_dir:
+            return []
+        files = []
+        with os.scandir(self.cache_dir) as it:
+            for f in it:
+                if f.name.endswith(".json"):
+                    stat = f.stat()
+                    files.append((f.name, stat.st_size, stat.st_mtime))
+        return files
+
+    def _remove_file(self, name: str, size: int) -> None:
+        try:
+            os.remove(os.path.join(self.cache_dir, name))
+            self._disk_bytes -= size
+        except FileNotFoundError:
+            pass
+
+
+_crawl_cache: Optional[CrawlCache] = None
+_crawl_cache_lock = threading.Lock()
+
+
+def get_crawl_cache() -> Optional[CrawlCache]:
+    """
+    Get the process-wide crawl cache, or None if crawl caching is disabled.
+
+    Configured by the CRAWL_CACHE_* environment variables.
+    """
+    global _crawl_cache
+    if os.getenv("CRAWL_CACHE_ENABLED", "false").lower() not in ("true", "1", "yes"):
+        return None
+    with _crawl_cache_lock:
+        if _crawl_cache is None:
+            _crawl_cache = CrawlCache(
+                ttl=float(os.getenv("CRAWL_CACHE_TTL", "86400")),
+                max_entries=int(os.getenv("CRAWL_CACHE_MAX_ENTRIES", "256")),
+                cache_dir=os.getenv("CRAWL_CACHE_DIR") or None,
+                max_disk_bytes=int(os.getenv("CRAWL_CACHE_MAX_DISK_MB", "512"))
+                * 1024
+                * 1024,
+            )
+        return _crawl_cache
@@ -1,15 +1,55 @@
 # Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
 # SPDX-License-Identifier: MIT
 
-import sys
+import logging
+import time
+from typing import Optional
 
 from .article import Article
+from .cache import CrawlCache, CrawlCacheEntry, get_crawl_cache
 from .jina_client import JinaClient
 from .readability_extractor import ReadabilityExtractor
 
+logger = logging.getLogger(__name__)
+
 
 class Crawler:
-    def crawl(self, url: str) -> Article:
+    def __init__(self, cache: Optional[CrawlCache] = None):
+        # Defaults to the process-wide cache, None if caching is disabled
+        self.cache = cache if cache is not None else get_crawl_cache()
+
+    def crawl(self, url: str, use_cache: bool = True) -> Article:
+        if self.cache is None or not use_cache:
+            _, article = self._fetch(url)
+            return article
+
+        # Concurrent crawls of the same URL wait for the first one and then
+        # read its result from the cache
+        try:
+            with self.cache.lock(url):
+                entry = self.cache.get(url)
+                if entry is not None:
+                    logger.debug(f"Crawl cache hit for {url}")
+                    article = Article(entry.title, entry.html_content, entry.markdown)
+                    article.url = url
+                    return article
+
+                html, article = self._fetch(url)
+                self.cache.put(
+                    CrawlCacheEntry(
+                        url=url,
+                        html=html,
+                        title=article.title,
+                        html_content=article.html_content,
+                        markdown=article.markdown,
+                        created_at=time.time(),
+                    )
+                )
+                return article
+        finally:
+            self.cache.release(url)
+
+    def _fetch(self, url: str) -> tuple[str, Article]:
         # To help LLMs better understand content, we extract clean
         # articles from HTML, convert them to markdown, and split
         # them into text and image blocks for one single and unified
@@ -25,4 +65,4 @@ class Crawler:
         extractor = ReadabilityExtractor()
         article = extractor.extract_article(html)
         article.url = url
-        return article
+        return html, article
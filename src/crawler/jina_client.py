@@ -4,13 +4,30 @@
 import logging
 import os
 
-import requests
+from src.utils import http_client
 
 logger = logging.getLogger(__name__)
 
+JINA_READER_URL = "https://r.jina.ai/"
+
 
 class JinaClient:
     def crawl(self, url: str, return_format: str = "html") -> str:
+        response = http_client.post(
+            JINA_READER_URL, headers=self._headers(return_format), json={"url": url}
+        )
+        # Error pages (rate limits, outages...) must not be read and cached
+        response.raise_for_status()
+        return response.text
+
+    async def acrawl(self, url: str, return_format: str = "html") -> str:
+        response = await http_client.apost(
+            JINA_READER_URL, headers=self._headers(return_format), json={"url": url}
+        )
+        response.raise_for_status()
+        return response.text
+
+    def _headers(self, return_format: str) -> dict[str, str]:
         headers = {
             "Content-Type": "application/json",
             "X-Return-Format": return_format,
@@ -21,6 +38,4 @@ class JinaClient:
             logger.warning(
                 "Jina API key is not set. Provide your own key to access a higher rate limit. See https://jina.ai/reader for more information."
             )
-        data = {"url": url}
-        response = requests.post("https://r.jina.ai/", headers=headers, json=data)
-        return response.text
+        return headers
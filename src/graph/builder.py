@@ -2,9 +2,9 @@
 # SPDX-License-Identifier: MIT
 
 from langgraph.graph import StateGraph, START, END
-from langgraph.checkpoint.memory import MemorySaver
 from src.prompts.planner_model import StepType
 
+from .checkpointer import build_checkpointer
 from .types import State
 from .nodes import (
     coordinator_node,
@@ -58,9 +58,9 @@ def _build_base_graph():
 
 def build_graph_with_memory():
     """Build and return the agent workflow graph with memory."""
-    # use persistent memory to save conversation history
-    # TODO: be compatible with SQLite / PostgreSQL
-    memory = MemorySaver()
+    # use persistent memory to save conversation history, the backend is
+    # selected by the CHECKPOINTER environment variable
+    memory = build_checkpointer()
 
     # build state graph
     builder = _build_base_graph()
@@ -1,16 +1,18 @@
 # Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
 # SPDX-License-Identifier: MIT
 
+import asyncio
+import copy
 import json
 import logging
 import os
+from contextlib import AsyncExitStack
 from typing import Annotated, Literal
 
 from langchain_core.messages import AIMessage, HumanMessage
 from langchain_core.runnables import RunnableConfig
 from langchain_core.tools import tool
 from langgraph.types import Command, interrupt
-from langchain_mcp_adapters.client import MultiServerMCPClient
 
 from src.agents import create_agent
 from src.tools.search import LoggedTavilySearch
@@ -20,14 +22,17 @@ from src.tools import (
     get_retriever_tool,
     python_repl_tool,
 )
+from src.tools.mcp_pool import get_mcp_client_pool
 
 from src.config.agents import AGENT_LLM_MAP
 from src.config.configuration import Configuration
 from src.llms.llm import get_llm_by_type
-from src.prompts.planner_model import Plan
+from src.prompts.planner_model import Plan, StepType
 from src.prompts.template import apply_prompt_template
 from src.utils.json_utils import repair_json_output
 
+from .observations import condense_observations
+from .step_context import build_findings_context
 from .types import State
 from ..config import SELECTED_SEARCH_ENGINE, SearchEngine
 
@@ -280,6 +285,12 @@ def reporter_node(state: State, config: RunnableConfig):
         )
     )
 
+    llm = get_llm_by_type(AGENT_LLM_MAP["reporter"])
+    # Large results are condensed in parallel first, so that the report fits
+    # in the context and its first tokens come sooner
+    observations = condense_observations(
+        observations, f"{current_plan.title}\n\n{current_plan.thought}", llm
+    )
     for observation in observations:
         invoke_messages.append(
             HumanMessage(
@@ -288,7 +299,7 @@ def reporter_node(state: State, config: RunnableConfig):
             )
         )
     logger.debug(f"Current invoke messages: {invoke_messages}")
-    response = get_llm_by_type(AGENT_LLM_MAP["reporter"]).invoke(invoke_messages)
+    response = llm.invoke(invoke_messages)
     response_content = response.content
     logger.info(f"reporter response: {response_content}")
 
@@ -301,37 +312,34 @@ def research_team_node(state: State):
     pass
 
 
-async def _execute_agent_step(
-    state: State, agent, agent_name: str
-) -> Command[Literal["research_team"]]:
-    """Helper function to execute a step using the specified agent."""
-    current_plan = state.get("current_plan")
-    observations = state.get("observations", [])
+def _get_independent_steps(current_plan) -> tuple[list, list]:
+    """Split the plan into completed steps and the next batch of independent steps.
 
-    # Find the first unexecuted step
-    current_step = None
+    The batch starts at the first unexecuted step and extends over the following
+    unexecuted research steps. Processing steps usually depend on earlier
+    findings, so they are always executed on their own.
+    """
     completed_steps = []
+    pending_steps = []
     for step in current_plan.steps:
-        if not step.execution_res:
-            current_step = step
-            break
-        else:
+        if step.execution_res:
+            if pending_steps:
+                break
             completed_steps.append(step)
+            continue
+        if pending_steps and (
+            getattr(pending_steps[0], "step_type", None) != StepType.RESEARCH
+            or getattr(step, "step_type", None) != StepType.RESEARCH
+        ):
+            break
+        pending_steps.append(step)
+    return completed_steps, pending_steps
 
-    if not current_step:
-        logger.warning("No unexecuted step found")
-        return Command(goto="research_team")
-
-    logger.info(f"Executing step: {current_step.title}, agent: {agent_name}")
-
-    # Format completed steps information
-    completed_steps_info = ""
-    if completed_steps:
-        completed_steps_info = "# Existing Research Findings\n\n"
-        for i, step in enumerate(completed_steps):
-            completed_steps_info += f"## Existing Finding {i + 1}: {step.title}\n\n"
-            completed_steps_info += f"<finding>\n{step.execution_res}\n</finding>\n\n"
 
+def _build_agent_input(
+    state: State, current_step, completed_steps_info: str, agent_name: str
+) -> dict:
+    """Build the agent input for a step, including the findings of completed steps."""
     # Prepare the input for the agent with completed steps info
     agent_input = {
         "messages": [
@@ -362,8 +370,22 @@ async def _execute_agent_step(
                 name="system",
             )
         )
+    return agent_input
 
-    # Invoke the agent
+
+async def _build_completed_steps_info(completed_steps: list) -> str:
+    """Format the findings of the completed steps within the context budget."""
+    completed_steps_info, _ = await build_findings_context(
+        completed_steps,
+        max_tokens=int(os.getenv("STEP_CONTEXT_MAX_TOKENS", "8000")),
+        summarize=os.getenv("STEP_CONTEXT_SUMMARIZE", "false").lower()
+        in ("true", "1", "yes"),
+    )
+    return completed_steps_info
+
+
+def _get_recursion_limit() -> int:
+    """Read the agent recursion limit from AGENT_RECURSION_LIMIT."""
     default_recursion_limit = 25
     try:
         env_value_str = os.getenv("AGENT_RECURSION_LIMIT", str(default_recursion_limit))
@@ -385,6 +407,39 @@ async def _execute_agent_step(
             f"Using default value {default_recursion_limit}."
         )
         recursion_limit = default_recursion_limit
+    return recursion_limit
+
+
+async def _execute_agent_step(
+    state: State, agent, agent_name: str
+) -> Command[Literal["research_team"]]:
+    """Helper function to execute a step using the specified agent."""
+    current_plan = state.get("current_plan")
+    observations = state.get("observations", [])
+
+    # Find the first unexecuted step
+    current_step = None
+    completed_steps = []
+    for step in current_plan.steps:
+        if not step.execution_res:
+            current_step = step
+            break
+        else:
+            completed_steps.append(step)
+
+    if not current_step:
+        logger.warning("No unexecuted step found")
+        return Command(goto="research_team")
+
+    logger.info(f"Executing step: {current_step.title}, agent: {agent_name}")
+
+    completed_steps_info = await _build_completed_steps_info(completed_steps)
+    agent_input = _build_agent_input(
+        state, current_step, completed_steps_info, agent_name
+    )
+
+    # Invoke the agent
+    recursion_limit = _get_recursion_limit()
 
     logger.info(f"Agent input: {agent_input}")
     result = await agent.ainvoke(
@@ -413,6 +468,83 @@ async def _execute_agent_step(
     )
 
 
+async def _execute_agent_steps_concurrently(
+    state: State,
+    agent,
+    agent_name: str,
+    completed_steps: list,
+    pending_steps: list,
+    max_concurrent_steps: int,
+) -> Command[Literal["research_team"]]:
+    """Execute independent steps concurrently and merge the results in plan order.
+
+    Every step only sees the findings of the steps completed before the batch,
+    so the steps of one batch do not depend on each other.
+    """
+    observations = state.get("observations", [])
+    recursion_limit = _get_recursion_limit()
+    semaphore = asyncio.Semaphore(max_concurrent_steps)
+    # Built once, every step of the batch sees the same findings
+    completed_steps_info = await _build_completed_steps_info(completed_steps)
+
+    async def _run(step) -> str:
+        async with semaphore:
+            logger.info(f"Executing step: {step.title}, agent: {agent_name}")
+            agent_input = _build_agent_input(
+                state, step, completed_steps_info, agent_name
+            )
+            logger.info(f"Agent input: {agent_input}")
+            result = await agent.ainvoke(
+                input=agent_input, config={"recursion_limit": recursion_limit}
+            )
+            response_content = result["messages"][-1].content
+            logger.debug(f"{agent_name.capitalize()} full response: {response_content}")
+            logger.info(f"Step '{step.title}' execution completed by {agent_name}")
+            return response_content
+
+    responses = await asyncio.gather(*(_run(step) for step in pending_steps))
+
+    # Update the steps only after the whole batch succeeded
+    for step, response_content in zip(pending_steps, responses):
+        step.execution_res = response_content
+
+    return Command(
+        update={
+            "messages": [
+                HumanMessage(content=response_content, name=agent_name)
+                for response_content in responses
+            ],
+            "observations": observations + list(responses),
+        },
+        goto="research_team",
+    )
+
+
+async def _run_agent(
+    state: State, config: RunnableConfig, agent, agent_type: str
+) -> Command[Literal["research_team"]]:
+    """Execute the next step, or the next batch of independent steps if enabled."""
+    current_plan = state.get("current_plan")
+    completed_steps, pending_steps = _get_independent_steps(current_plan)
+    if len(pending_steps) > 1:
+        configurable = Configuration.from_runnable_config(config)
+        max_concurrent_steps = int(configurable.max_concurrent_steps)
+        if max_concurrent_steps > 1:
+            logger.info(
+                f"Executing {len(pending_steps)} independent steps with up to "
+                f"{max_concurrent_steps} running at once"
+            )
+            return await _execute_agent_steps_concurrently(
+                state,
+                agent,
+                agent_type,
+                completed_steps,
+                pending_steps,
+                max_concurrent_steps,
+            )
+    return await _execute_agent_step(state, agent, agent_type)
+
+
 async def _setup_and_execute_agent_step(
     state: State,
     config: RunnableConfig,
@@ -424,7 +556,8 @@ async def _setup_and_execute_agent_step(
     This function handles the common logic for both researcher_node and coder_node:
     1. Configures MCP servers and tools based on agent type
     2. Creates an agent with the appropriate tools or uses the default agent
-    3. Executes the agent on the current step
+    3. Executes the agent on the current step, or on the next batch of
+       independent research steps when concurrent execution is enabled
 
     Args:
         state: The current state
@@ -456,20 +589,29 @@ async def _setup_and_execute_agent_step(
 
     # Create and execute agent with MCP tools if available
     if mcp_servers:
-        async with MultiServerMCPClient(mcp_servers) as client:
+        # Lease warm connections from the pool instead of spawning the MCP
+        # servers for every step
+        pool = get_mcp_client_pool()
+        async with AsyncExitStack() as stack:
             loaded_tools = default_tools[:]
-            for tool in client.get_tools():
-                if tool.name in enabled_tools:
-                    tool.description = (
-                        f"Powered by '{enabled_tools[tool.name]}'.\n{tool.description}"
-                    )
-                    loaded_tools.append(tool)
+            for server_name, server_config in mcp_servers.items():
+                server_tools = await stack.enter_async_context(
+                    pool.session(server_name, server_config)
+                )
+                for tool in server_tools:
+                    if enabled_tools.get(tool.name) == server_name:
+                        # Pooled tools are shared, so annotate a copy
+                        tool = copy.copy(tool)
+                        tool.description = (
+                            f"Powered by '{server_name}'.\n{tool.description}"
+                        )
+                        loaded_tools.append(tool)
             agent = create_agent(agent_type, agent_type, loaded_tools, agent_type)
-            return await _execute_agent_step(state, agent, agent_type)
+            return await _run_agent(state, config, agent, agent_type)
     else:
         # Use default tools if no MCP servers are configured
         agent = create_agent(agent_type, agent_type, default_tools, agent_type)
-        return await _execute_agent_step(state, agent, agent_type)
+        return await _run_agent(state, config, agent, agent_type)
 
 
 async def researcher_node(
@@ -0,0 +1,114 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+"""
+Map step of the reporter for large research results.
+
+When the observations exceed a token threshold, they are packed in chunks
+that are condensed into notes by parallel LLM calls. The reporter then
+writes the report from the notes instead of the raw observations.
+"""
+
+import logging
+import os
+from typing import Sequence
+
+from langchain_core.messages import HumanMessage, SystemMessage
+from langgraph.constants import TAG_NOSTREAM
+
+from src.graph.step_context import estimate_tokens
+from src.prompts.template import get_prompt_template
+
+logger = logging.getLogger(__name__)
+
+
+def split_by_tokens(text: str, max_tokens: int) -> list[str]:
+    """Split a text in pieces of at most about `max_tokens`, on paragraphs."""
+    pieces: list[str] = []
+    current = ""
+    for paragraph in text.split("\n\n"):
+        while estimate_tokens(paragraph) > max_tokens:
+            # A single paragraph over the limit is cut where it fits
+            end = max(1, len(paragraph) * max_tokens // estimate_tokens(paragraph))
+            pieces.extend(piece for piece in (current, paragraph[:end]) if piece)
+            current = ""
+            paragraph = paragraph[end:]
+        candidate = f"{current}\n\n{paragraph}" if current else paragraph
+        if current and estimate_tokens(candidate) > max_tokens:
+            pieces.append(current)
+            current = paragraph
+        else:
+            current = candidate
+    if current:
+        pieces.append(current)
+    return pieces
+
+
+def pack_observations(observations: Sequence[str], chunk_tokens: int) -> list[str]:
+    """Pack consecutive observations in chunks of at most `chunk_tokens`."""
+    chunks: list[str] = []
+    current: list[str] = []
+    current_tokens = 0
+    for observation in observations:
+        for piece in split_by_tokens(observation, chunk_tokens):
+            tokens = estimate_tokens(piece)
+            if current and current_tokens + tokens > chunk_tokens:
+                chunks.append("\n\n---\n\n".join(current))
+                current, current_tokens = [], 0
+            current.append(piece)
+            current_tokens += tokens
+    if current:
+        chunks.append("\n\n---\n\n".join(current))
+    return chunks
+
+
+def condense_observations(observations: Sequence[str], task: str, llm) -> list[str]:
+    """
+    Return the observations, or notes condensed from them if they are large.
+
+    Configured by the REPORTER_MAP_* environment variables. The notes of the
+    chunks are generated in parallel and are not streamed to the client,
+    only the report written from them is.
+    """
+    threshold = int(os.getenv("REPORTER_MAP_REDUCE_THRESHOLD", "32000"))
+    total_tokens = sum(estimate_tokens(observation) for observation in observations)
+    if threshold <= 0 or total_tokens <= threshold:
+        return list(observations)
+
+    chunk_tokens = int(os.getenv("REPORTER_MAP_CHUNK_TOKENS", "8000"))
+    chunks = pack_observations(observations, chunk_tokens)
+    logger.info(
+        f"Observations total {total_tokens} tokens, condensing them "
+        f"in {len(chunks)} chunks"
+    )
+    system_prompt = get_prompt_template("reporter_map")
+    responses = llm.batch(
+        [
+            [
+                SystemMessage(content=system_prompt),
+                HumanMessage(
+                    content=f"# Research Task\n\n{task}\n\n# Observations\n\n{chunk}"
+                ),
+            ]
+            for chunk in chunks
+        ],
+        config={
+            "max_concurrency": int(os.getenv("REPORTER_MAP_CONCURRENCY", "4")),
+            "tags": [TAG_NOSTREAM],
+        },
+        return_exceptions=True,
+    )
+
+    notes = []
+    for chunk, response in zip(chunks, responses):
+        if isinstance(response, BaseException):
+            # The report can still be written from the raw observations
+            logger.warning(f"Failed to condense observations: {response!r}")
+            notes.append(chunk)
+        else:
+            notes.append(response.content)
+    logger.info(
+        f"Condensed observations to "
+        f"{sum(estimate_tokens(note) for note in notes)} tokens"
+    )
+    return notes
@@ -0,0 +1,184 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+"""
+Token-budgeted context of the findings of completed research steps.
+
+Every step sees the findings of the steps completed before it. Once they
+exceed the budget, the oldest findings are condensed first: summarized by
+an LLM when enabled, truncated otherwise. A finding is summarized at most
+once per process, its summary is reused by every later step.
+"""
+
+import asyncio
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Optional, Sequence
+
+from langchain_core.messages import HumanMessage, SystemMessage
+
+from src.config.agents import AGENT_LLM_MAP
+from src.llms.llm import get_llm_by_type
+from src.prompts.template import get_prompt_template
+
+logger = logging.getLogger(__name__)
+
+TRUNCATION_NOTE = "\n\n[... truncated]"
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Estimate the number of tokens of a text without a tokenizer.
+
+    About 4 characters per token for Latin scripts and 1 token per character
+    for CJK scripts.
+    """
+    wide = sum(1 for char in text if ord(char) >= 0x2E80)
+    return (len(text) - wide + 3) // 4 + wide
+
+
+def truncate_to_tokens(text: str, max_tokens: int) -> str:
+    if estimate_tokens(text) <= max_tokens:
+        return text
+    # Shrink until the estimate fits, CJK text needs more than one pass
+    budget = max(0, max_tokens - estimate_tokens(TRUNCATION_NOTE))
+    end = budget * 4
+    while end > 0 and estimate_tokens(text[:end]) > budget:
+        end = end * budget // estimate_tokens(text[:end])
+    return text[:end].rstrip() + TRUNCATION_NOTE
+
+
+@dataclass
+class ContextStats:
+    original_tokens: int = 0
+    tokens: int = 0
+    summarized: int = 0
+    truncated: int = 0
+
+    @property
+    def saved_tokens(self) -> int:
+        return self.original_tokens - self.tokens
+
+
+class SummaryCache:
+    """Thread-safe LRU cache of finding summaries, keyed by the finding hash."""
+
+    def __init__(self, max_entries: int = 256):
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, str] = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(text: str) -> str:
+        return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+    def get(self, text: str) -> Optional[str]:
+        key = self.make_key(text)
+        with self._lock:
+            summary = self._entries.get(key)
+            if summary is not None:
+                self._entries.move_to_end(key)
+            return summary
+
+    def put(self, text: str, summary: str) -> None:
+        key = self.make_key(text)
+        with self._lock:
+            self._entries[key] = summary
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+summary_cache = SummaryCache()
+
+
+async def summarize_finding(text: str, max_tokens: int) -> str:
+    """Summarize a finding with the LLM, once per finding."""
+    summary = summary_cache.get(text)
+    if summary is None:
+        model = get_llm_by_type(AGENT_LLM_MAP["step_summarizer"])
+        response = await model.ainvoke(
+            [
+                SystemMessage(content=get_prompt_template("step_summarizer")),
+                HumanMessage(
+                    content=f"Length limit: about {max_tokens} tokens.\n\n"
+                    f"<finding>\n{text}\n</finding>"
+                ),
+            ]
+        )
+        summary = response.content.strip()
+        summary_cache.put(text, summary)
+    return summary
+
+
+def format_findings(titles: Sequence[str], findings: Sequence[str]) -> str:
+    if not findings:
+        return ""
+    context = "# Existing Research Findings\n\n"
+    for i, (title, finding) in enumerate(zip(titles, findings)):
+        context += f"## Existing Finding {i + 1}: {title}\n\n"
+        context += f"<finding>\n{finding}\n</finding>\n\n"
+    return context
+
+
+async def build_findings_context(
+    completed_steps: Sequence, max_tokens: int, summarize: bool = False
+) -> tuple[str, ContextStats]:
+    """
+    Format the findings of the completed steps within `max_tokens` tokens.
+
+    The oldest findings are condensed first, each down to an equal share of
+    the budget, until the findings fit. A budget of 0 disables the limit.
+    """
+    titles = [step.title for step in completed_steps]
+    findings = [step.execution_res or "" for step in completed_steps]
+    costs = [estimate_tokens(finding) for finding in findings]
+    stats = ContextStats(original_tokens=sum(costs), tokens=sum(costs))
+    if max_tokens <= 0 or stats.original_tokens <= max_tokens:
+        return format_findings(titles, findings), stats
+
+    share = max(1, max_tokens // len(findings))
+    condensed = []
+    total = stats.original_tokens
+    for i, cost in enumerate(costs):
+        if total <= max_tokens:
+            break
+        if cost > share:
+            condensed.append(i)
+            total -= cost - share
+
+    summaries: list[Optional[str]] = [None] * len(condensed)
+    if summarize:
+        results = await asyncio.gather(
+            *(summarize_finding(findings[i], share) for i in condensed),
+            return_exceptions=True,
+        )
+        for j, result in enumerate(results):
+            if isinstance(result, BaseException):
+                logger.warning(f"Failed to summarize a finding: {result!r}")
+            else:
+                summaries[j] = result
+
+    for i, summary in zip(condensed, summaries):
+        if summary is not None and estimate_tokens(summary) <= share:
+            findings[i] = summary
+            stats.summarized += 1
+        else:
+            findings[i] = truncate_to_tokens(summary or findings[i], share)
+            stats.truncated += 1
+        costs[i] = estimate_tokens(findings[i])
+
+    stats.tokens = sum(costs)
+    logger.info(
+        f"Findings context: {stats.tokens} tokens instead of "
+        f"{stats.original_tokens}, {stats.saved_tokens} saved "
+        f"({stats.summarized} summarized, {stats.truncated} truncated)"
+    )
+    return format_findings(titles, findings), stats
@@ -0,0 +1,331 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+"""
+Response cache for the chat models.
+
+The exact tier is keyed by the model, its parameters and the messages. The
+optional semantic tier serves a prompt whose non-system messages are close
+enough to a cached one, for the same model, parameters and system prompt.
+
+Only the calls made from the graph nodes listed in LLM_CACHE_NODES are
+cached, so agents whose answers depend on tool results are left out.
+"""
+
+import copy
+import fnmatch
+import functools
+import hashlib
+import json
+import logging
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Optional, Sequence, Type, TypeVar
+
+import numpy as np
+from langchain_core.load import dumps
+from langchain_core.messages import AIMessage, AIMessageChunk, BaseMessage
+from langchain_core.messages import SystemMessage
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+DEFAULT_CACHED_NODES = (
+    "coordinator,planner,reporter,script_writer,enhancer,ppt_composer,prose_*"
+)
+
+# The prompt templates embed the current time, which would make every key unique
+_TIMESTAMP_RE = re.compile(
+    r"\b[A-Z][a-z]{2} [A-Z][a-z]{2} \d{2} \d{4} \d{2}:\d{2}:\d{2}(?: [+-]\d{4})?"
+)
+
+
+def _normalize(text: str) -> str:
+    return _TIMESTAMP_RE.sub("<time>", text)
+
+
+class LLMResponseCache:
+    """
+    Thread-safe LRU cache of chat model generations.
+
+    Entries expire `ttl` seconds after they were stored. The semantic tier
+    is enabled by a `semantic_threshold`, the minimum cosine similarity of
+    the prompt embeddings.
+    """
+
+    def __init__(
+        self,
+        ttl: float = 3600.0,
+        max_entries: int = 1024,
+        nodes: Sequence[str] = tuple(DEFAULT_CACHED_NODES.split(",")),
+        semantic_threshold: Optional[float] = None,
+        embeddings: Any = None,
+    ):
+        self.ttl = ttl
+        self.max_entries = max(1, max_entries)
+        self.nodes = tuple(node.strip() for node in nodes if node.strip())
+        self.semantic_threshold = semantic_threshold
+        if semantic_threshold is not None and embeddings is None:
+            from src.rag.local import HashingEmbedder
+
+            embeddings = HashingEmbedder()
+        self.embeddings = embeddings
+        # key -> (created_at, semantic group, prompt embedding, generations)
+        self._entries: OrderedDict[
+            str, tuple[float, str, Optional[np.ndarray], list[ChatGeneration]]
+        ] = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {"exact_hits": 0, "semantic_hits": 0, "misses": 0}
+
+    def enabled_for(self, node: Optional[str]) -> bool:
+        return node is not None and any(
+            fnmatch.fnmatchcase(node, pattern) for pattern in self.nodes
+        )
+
+    @staticmethod
+    def make_key(llm_string: str, messages: list[BaseMessage]) -> str:
+        raw = f"{llm_string}\n{_normalize(dumps(messages))}"
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def _semantic_group(llm_string: str, messages: list[BaseMessage]) -> str:
+        system = [m for m in messages if isinstance(m, SystemMessage)]
+        raw = f"{llm_string}\n{_normalize(dumps(system))}"
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def _semantic_text(messages: list[BaseMessage]) -> str:
+        return "\n\n".join(
+            _normalize(str(m.content))
+            for m in messages
+            if not isinstance(m, SystemMessage)
+        )
+
+    def get(
+        self, llm_string: str, messages: list[BaseMessage]
+    ) -> Optional[list[ChatGeneration]]:
+        """Return a copy of the cached generations, or None on a miss."""
+        key = self.make_key(llm_string, messages)
+        now = time.time()
+        with self._lock:
+            item = self._entries.get(key)
+            if item is not None:
+                if now - item[0] < self.ttl:
+                    self._entries.move_to_end(key)
+                    self._stats["exact_hits"] += 1
+                    return copy.deepcopy(item[3])
+                del self._entries[key]
+            if self.semantic_threshold is None:
+                self._stats["misses"] += 1
+                return None
+
+        group = self._semantic_group(llm_string, messages)
+        vector = self._embed(messages)
+        with self._lock:
+            best_key, best_score = None, self.semantic_threshold
+            for other_key, (created_at, other_group, other, _) in self._entries.items():
+                if (
+                    other_group != group
+                    or other is None
+                    or now - created_at >= self.ttl
+                ):
+                    continue
+                score = float(np.dot(vector, other))
+                if score >= best_score:
+                    best_key, best_score = other_key, score
+            if best_key is None:
+                self._stats["misses"] += 1
+                return None
+            self._entries.move_to_end(best_key)
+            self._stats["semantic_hits"] += 1
+            logger.debug(f"Semantic LLM cache hit, similarity {best_score:.3f}")
+            return copy.deepcopy(self._entries[best_key][3])
+
+    def put(
+        self,
+        llm_string: str,
+        messages: list[BaseMessage],
+        generations: list[ChatGeneration],
+    ) -> None:
+        key = self.make_key(llm_string, messages)
+        group = self._semantic_group(llm_string, messages)
+        vector = self._embed(messages) if self.semantic_threshold is not None else None
+        with self._lock:
+            self._entries[key] = (
+                time.time(),
+                group,
+                vector,
+                copy.deepcopy(generations),
+            )
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict[str, float]:
+        with self._lock:
+            hits = self._stats["exact_hits"] + self._stats["semantic_hits"]
+            lookups = hits + self._stats["misses"]
+            return {
+                **self._stats,
+                "hits": hits,
+                "hit_rate": hits / lookups if lookups else 0.0,
+                "entries": len(self._entries),
+            }
+
+    def _embed(self, messages: list[BaseMessage]) -> np.ndarray:
+        vector = np.asarray(
+            self.embeddings.embed_query(self._semantic_text(messages)),
+            dtype=np.float32,
+        )
+        return vector / max(float(np.linalg.norm(vector)), 1e-12)
+
+
+_llm_response_cache: Optional[LLMResponseCache] = None
+_llm_response_cache_lock = threading.Lock()
+
+
+def get_llm_response_cache() -> Optional[LLMResponseCache]:
+    """
+    Get the process-wide LLM response cache, or None if it is disabled.
+
+    Configured by the LLM_CACHE_* environment variables.
+    """
+    global _llm_response_cache
+    if os.getenv("LLM_CACHE_ENABLED", "false").lower() not in ("true", "1", "yes"):
+        return None
+    with _llm_response_cache_lock:
+        if _llm_response_cache is None:
+            threshold = os.getenv("LLM_CACHE_SEMANTIC_THRESHOLD")
+            _llm_response_cache = LLMResponseCache(
+                ttl=float(os.getenv("LLM_CACHE_TTL", "3600")),
+                max_entries=int(os.getenv("LLM_CACHE_MAX_ENTRIES", "1024")),
+                nodes=os.getenv("LLM_CACHE_NODES", DEFAULT_CACHED_NODES).split(","),
+                semantic_threshold=float(threshold) if threshold else None,
+            )
+        return _llm_response_cache
+
+
+def _to_chunk(message: AIMessage, message_id: str) -> AIMessageChunk:
+    return AIMessageChunk(
+        content=message.content,
+        additional_kwargs=message.additional_kwargs,
+        response_metadata=message.response_metadata,
+        id=message_id,
+        tool_call_chunks=[
+            {
+                "name": tool_call["name"],
+                "args": json.dumps(tool_call["args"], ensure_ascii=False),
+                "id": tool_call["id"],
+                "index": index,
+            }
+            for index, tool_call in enumerate(message.tool_calls)
+        ],
+    )
+
+
+class CachedChatModelMixin:
+    """A mixin class that serves repeated chat model calls from the cache."""
+
+    def _response_cache(self, run_manager) -> Optional[LLMResponseCache]:
+        cache = get_llm_response_cache()
+        node = (getattr(run_manager, "metadata", None) or {}).get("langgraph_node")
+        return cache if cache and cache.enabled_for(node) else None
+
+    @staticmethod
+    def _replay(
+        generations: list[ChatGeneration], run_id: Optional[Any]
+    ) -> list[tuple[str, ChatGenerationChunk]]:
+        """
+        Give the cached messages the id of this run.
+
+        Returns the tokens to send to the streaming callbacks, as a streamed
+        response would.
+        """
+        tokens = []
+        for index, generation in enumerate(generations):
+            message_id = f"run-{run_id}" if run_id else None
+            if len(generations) > 1 and message_id:
+                message_id = f"{message_id}-{index}"
+            generation.message.id = message_id
+            if isinstance(generation.message, AIMessage):
+                chunk = ChatGenerationChunk(
+                    message=_to_chunk(generation.message, message_id)
+                )
+                tokens.append((str(generation.message.content), chunk))
+        return tokens
+
+    def _generate_with_cache(
+        self,
+        messages: list[BaseMessage],
+        stop: Optional[list[str]] = None,
+        run_manager=None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        cache = self._response_cache(run_manager)
+        if cache is None:
+            return super()._generate_with_cache(
+                messages, stop=stop, run_manager=run_manager, **kwargs
+            )
+        llm_string = self._get_llm_string(stop=stop, **kwargs)
+        if (generations := cache.get(llm_string, messages)) is not None:
+            run_id = run_manager.run_id if run_manager else None
+            for token, chunk in self._replay(generations, run_id):
+                run_manager.on_llm_new_token(token, chunk=chunk)
+            return ChatResult(generations=generations)
+        result = super()._generate_with_cache(
+            messages, stop=stop, run_manager=run_manager, **kwargs
+        )
+        cache.put(llm_string, messages, result.generations)
+        return result
+
+    async def _agenerate_with_cache(
+        self,
+        messages: list[BaseMessage],
+        stop: Optional[list[str]] = None,
+        run_manager=None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        cache = self._response_cache(run_manager)
+        if cache is None:
+            return await super()._agenerate_with_cache(
+                messages, stop=stop, run_manager=run_manager, **kwargs
+            )
+        llm_string = self._get_llm_string(stop=stop, **kwargs)
+        if (generations := cache.get(llm_string, messages)) is not None:
+            run_id = run_manager.run_id if run_manager else None
+            for token, chunk in self._replay(generations, run_id):
+                await run_manager.on_llm_new_token(token, chunk=chunk)
+            return ChatResult(generations=generations)
+        result = await super()._agenerate_with_cache(
+            messages, stop=stop, run_manager=run_manager, **kwargs
+        )
+        cache.put(llm_string, messages, result.generations)
+        return result
+
+
+@functools.cache
+def create_cached_chat_model(base_model_class: Type[T]) -> Type[T]:
+    """
+    Factory function to create a cached version of a chat model class.
+
+    Args:
+        base_model_class: The original chat model class
+
+    Returns:
+        A new class that inherits from both CachedChatModelMixin and the base model class
+    """
+
+    class CachedChatModel(CachedChatModelMixin, base_model_class):
+        pass
+
+    CachedChatModel.__name__ = f"Cached{base_model_class.__name__}"
+    return CachedChatModel
@@ -11,6 +11,14 @@ from typing import get_args
 
 from src.config import load_yaml_config
 from src.config.agents import LLMType
+from src.llms.cache import create_cached_chat_model, get_llm_response_cache
+from src.llms.pool import (
+    ENDPOINT_KEYS,
+    Endpoint,
+    ModelPool,
+    create_pooled_chat_model,
+    split_pool_conf,
+)
 
 # Cache for LLM instances
 _llm_cache: dict[LLMType, ChatOpenAI] = {}
@@ -45,6 +53,14 @@ def _get_env_llm_conf(llm_type: str) -> Dict[str, Any]:
     return conf
 
 
+def _get_model_conf(llm_type: LLMType, conf: Dict[str, Any]) -> Dict[str, Any]:
+    """Get the arguments of the model class from a model configuration."""
+    conf = dict(conf)
+    if llm_type == "reasoning":
+        conf["api_base"] = conf.pop("base_url", None)
+    return conf
+
+
 def _create_llm_use_conf(
     llm_type: LLMType, conf: Dict[str, Any]
 ) -> ChatOpenAI | ChatDeepSeek:
@@ -68,14 +84,30 @@ def _create_llm_use_conf(
     if not merged_conf:
         raise ValueError(f"No configuration found for LLM type: {llm_type}")
 
-    if llm_type == "reasoning":
-        merged_conf["api_base"] = merged_conf.pop("base_url", None)
-
-    return (
-        ChatOpenAI(**merged_conf)
-        if llm_type != "reasoning"
-        else ChatDeepSeek(**merged_conf)
-    )
+    model_class = ChatOpenAI if llm_type != "reasoning" else ChatDeepSeek
+    pool_conf = split_pool_conf(merged_conf)
+    if pool_conf:
+        options, endpoint_confs = pool_conf
+        endpoints = []
+        for i, endpoint_conf in enumerate(endpoint_confs):
+            limits = {key: endpoint_conf.pop(key, None) for key in ENDPOINT_KEYS}
+            if len(endpoint_confs) > 1:
+                # Fail over to the next endpoint instead of retrying the same one
+                endpoint_conf.setdefault("max_retries", 0)
+            endpoint_conf = _get_model_conf(llm_type, endpoint_conf)
+            name = f"{llm_type}[{i}] {endpoint_conf.get('model')}"
+            endpoints.append(Endpoint(name, model_class(**endpoint_conf), **limits))
+        model_class = create_pooled_chat_model(model_class)
+        merged_conf = {
+            **_get_model_conf(llm_type, endpoint_confs[0]),
+            "pool": ModelPool(endpoints, **options),
+        }
+    else:
+        merged_conf = _get_model_conf(llm_type, merged_conf)
+
+    if get_llm_response_cache():
+        model_class = create_cached_chat_model(model_class)
+    return model_class(**merged_conf)
 
 
 def get_llm_by_type(
@@ -117,10 +149,14 @@ def get_configured_llm_models() -> dict[str, list[str]]:
             # Merge configurations, with environment variables taking precedence
             merged_conf = {**yaml_conf, **env_conf}
 
-            # Check if model is configured
-            model_name = merged_conf.get("model")
-            if model_name:
-                configured_models.setdefault(llm_type, []).append(model_name)
+            # Check if model is configured, by itself or by the endpoints of a pool
+            pool_conf = split_pool_conf(merged_conf)
+            endpoint_confs = pool_conf[1] if pool_conf else [merged_conf]
+            for endpoint_conf in endpoint_confs:
+                model_name = endpoint_conf.get("model")
+                models = configured_models.get(llm_type, [])
+                if model_name and model_name not in models:
+                    configured_models.setdefault(llm_type, []).append(model_name)
 
         return configured_models
 
@@ -0,0 +1,375 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+"""
+Pool of endpoints serving the same LLM type.
+
+Each endpoint is a chat model with its own base URL or API key, optionally
+limited in concurrency and in requests per minute. Every call is routed to
+the least loaded endpoint, or the fastest one with the "latency" routing,
+and fails over to the next one on rate limits, server and connection errors.
+"""
+
+import asyncio
+import functools
+import json
+import logging
+import threading
+import time
+import weakref
+from contextlib import asynccontextmanager, contextmanager
+from typing import Any, AsyncIterator, Callable, Iterator, Optional, Type, TypeVar
+
+from langchain_core.rate_limiters import InMemoryRateLimiter
+from pydantic import Field
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+POOL_KEYS = ("endpoints", "routing", "cooldown")
+ENDPOINT_KEYS = ("max_concurrency", "requests_per_minute")
+ROUTING_STRATEGIES = ("least_loaded", "latency")
+
+# Weight of the last call in the moving average of the latency
+LATENCY_SMOOTHING = 0.3
+
+
+def is_retryable_error(error: BaseException) -> bool:
+    """Whether another endpoint may succeed: rate limits, 5xx and network errors."""
+    import openai
+
+    if isinstance(error, (openai.APIConnectionError, openai.RateLimitError)):
+        return True
+    status_code = getattr(error, "status_code", None)
+    return isinstance(status_code, int) and (status_code == 429 or status_code >= 500)
+
+
+def _retry_after(error: BaseException) -> Optional[float]:
+    response = getattr(error, "response", None)
+    value = getattr(response, "headers", {}).get("retry-after")
+    try:
+        return float(value) if value is not None else None
+    except ValueError:
+        return None
+
+
+class Endpoint:
+    """A chat model of the pool, with its limits and its load."""
+
+    def __init__(
+        self,
+        name: str,
+        model: Any,
+        max_concurrency: Optional[int] = None,
+        requests_per_minute: Optional[float] = None,
+    ):
+        self.name = name
+        self.model = model
+        self.max_concurrency = int(max_concurrency) if max_concurrency else None
+        self.rate_limiter = (
+            InMemoryRateLimiter(
+                requests_per_second=float(requests_per_minute) / 60,
+                check_every_n_seconds=0.05,
+            )
+            if requests_per_minute
+            else None
+        )
+        # Calls routed to the endpoint, running or waiting for a slot
+        self.load = 0
+        self.latency: Optional[float] = None
+        self.cooldown_until = 0.0
+        self.requests = 0
+        self.failures = 0
+        self._lock = threading.Lock()
+        self._semaphore = (
+            threading.BoundedSemaphore(self.max_concurrency)
+            if self.max_concurrency
+            else None
+        )
+        # asyncio semaphores are bound to an event loop
+        self._async_semaphores: (
+            "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]"
+        ) = weakref.WeakKeyDictionary()
+
+    @property
+    def cooling_down(self) -> bool:
+        return self.cooldown_until > time.monotonic()
+
+    @property
+    def saturated(self) -> bool:
+        return self.max_concurrency is not None and self.load >= self.max_concurrency
+
+    def _async_semaphore(self) -> Optional[asyncio.Semaphore]:
+        if not self.max_concurrency:
+            return None
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            semaphore = self._async_semaphores.get(loop)
+            if semaphore is None:
+                semaphore = asyncio.Semaphore(self.max_concurrency)
+                self._async_semaphores[loop] = semaphore
+        return semaphore
+
+    def reserve(self) -> None:
+        with self._lock:
+            self.load += 1
+            self.requests += 1
+
+    def release(self, latency: Optional[float]) -> None:
+        with self._lock:
+            self.load -= 1
+            if latency is not None:
+                self.latency = (
+                    latency
+                    if self.latency is None
+                    else LATENCY_SMOOTHING * latency
+                    + (1 - LATENCY_SMOOTHING) * self.latency
+                )
+
+    def fail(self, error: BaseException, cooldown: float) -> None:
+        cooldown = _retry_after(error) or cooldown
+        with self._lock:
+            self.failures += 1
+            self.cooldown_until = time.monotonic() + cooldown
+        logger.warning(
+            f"LLM endpoint {self.name} failed, cooling down for {cooldown:.0f}s: "
+            f"{error!r}"
+        )
+
+    @contextmanager
+    def slot(self) -> Iterator[None]:
+        """Wait for a concurrency slot and the rate limit, then time the call."""
+        self.reserve()
+        latency = None
+        try:
+            if self._semaphore:
+                self._semaphore.acquire()
+            try:
+                if self.rate_limiter:
+                    self.rate_limiter.acquire()
+                started = time.monotonic()
+                yield
+                latency = time.monotonic() - started
+            finally:
+                if self._semaphore:
+                    self._semaphore.release()
+        finally:
+            self.release(latency)
+
+    @asynccontextmanager
+    async def aslot(self) -> AsyncIterator[None]:
+        self.reserve()
+        latency = None
+        semaphore = self._async_semaphore()
+        try:
+            if semaphore:
+                await semaphore.acquire()
+            try:
+                if self.rate_limiter:
+                    await self.rate_limiter.aacquire()
+                started = time.monotonic()
+                yield
+                latency = time.monotonic() - started
+            finally:
+                if semaphore:
+                    semaphore.release()
+        finally:
+            self.release(latency)
+
+
+class ModelPool:
+    """
+    Routes the calls over the endpoints, with failover.
+
+    An endpoint that failed with a retryable error is tried last for
+    `cooldown` seconds, or for the delay of its Retry-After header.
+    """
+
+    def __init__(
+        self,
+        endpoints: list[Endpoint],
+        routing: str = "least_loaded",
+        cooldown: float = 30.0,
+    ):
+        if not endpoints:
+            raise ValueError("A model pool needs at least one endpoint")
+        if routing not in ROUTING_STRATEGIES:
+            raise ValueError(
+                f"Unknown routing strategy: {routing}, "
+                f"expected one of {', '.join(ROUTING_STRATEGIES)}"
+            )
+        self.endpoints = endpoints
+        self.routing = routing
+        self.cooldown = float(cooldown)
+
+    def _score(self, endpoint: Endpoint) -> tuple:
+        if self.routing == "latency":
+            # Endpoints without calls yet are probed first
+            expected = (endpoint.load + 1) * (endpoint.latency or 0)
+            return (endpoint.cooling_down, endpoint.saturated, expected)
+        load = endpoint.load / (endpoint.max_concurrency or 1)
+        return (endpoint.cooling_down, endpoint.saturated, load)
+
+    def _select(self, tried: list[Endpoint]) -> Optional[Endpoint]:
+        candidates = [e for e in self.endpoints if e not in tried]
+        return min(candidates, key=self._score) if candidates else None
+
+    def _endpoints(self) -> Iterator[Endpoint]:
+        """Yield the best endpoint not tried yet, chosen when it is needed."""
+        tried: list[Endpoint] = []
+        while (endpoint := self._select(tried)) is not None:
+            tried.append(endpoint)
+            yield endpoint
+
+    def _handle(self, endpoint: Endpoint, error: Exception, started: bool) -> None:
+        """Re-raise the errors that another endpoint cannot recover."""
+        if started or not is_retryable_error(error):
+            raise error
+        endpoint.fail(error, self.cooldown)
+
+    def run(self, call: Callable[[Any], T]) -> T:
+        """Call `call` with the model of an endpoint."""
+        error = None
+        for endpoint in self._endpoints():
+            try:
+                with endpoint.slot():
+                    return call(endpoint.model)
+            except Exception as e:
+                self._handle(endpoint, e, started=False)
+                error = e
+        raise error
+
+    async def arun(self, call: Callable[[Any], Any]) -> Any:
+        error = None
+        for endpoint in self._endpoints():
+            try:
+                async with endpoint.aslot():
+                    return await call(endpoint.model)
+            except Exception as e:
+                self._handle(endpoint, e, started=False)
+                error = e
+        raise error
+
+    def stream(self, call: Callable[[Any], Iterator[T]]) -> Iterator[T]:
+        """
+        Yield the chunks streamed by an endpoint.
+
+        Fails over only until the first chunk, the chunks already sent to
+        the callbacks cannot be taken back.
+        """
+        error = None
+        for endpoint in self._endpoints():
+            started = False
+            try:
+                with endpoint.slot():
+                    for chunk in call(endpoint.model):
+                        started = True
+                        yield chunk
+                return
+            except Exception as e:
+                self._handle(endpoint, e, started)
+                error = e
+        raise error
+
+    async def astream(
+        self, call: Callable[[Any], AsyncIterator[T]]
+    ) -> AsyncIterator[T]:
+        error = None
+        for endpoint in self._endpoints():
+            started = False
+            try:
+                async with endpoint.aslot():
+                    async for chunk in call(endpoint.model):
+                        started = True
+                        yield chunk
+                return
+            except Exception as e:
+                self._handle(endpoint, e, started)
+                error = e
+        raise error
+
+    def stats(self) -> list[dict[str, Any]]:
+        return [
+            {
+                "name": endpoint.name,
+                "load": endpoint.load,
+                "requests": endpoint.requests,
+                "failures": endpoint.failures,
+                "latency": endpoint.latency,
+                "cooling_down": endpoint.cooling_down,
+            }
+            for endpoint in self.endpoints
+        ]
+
+
+def split_pool_conf(
+    conf: dict[str, Any],
+) -> Optional[tuple[dict[str, Any], list[dict[str, Any]]]]:
+    """
+    Split a model configuration in the pool options and the endpoint configurations.
+
+    Each endpoint inherits the keys of the model configuration. Returns None
+    if the configuration has no pool option, a single model is used then.
+    Endpoints set in an environment variable are given as a JSON list.
+    """
+    if not any(key in conf for key in POOL_KEYS + ENDPOINT_KEYS):
+        return None
+    conf = dict(conf)
+    endpoints = conf.pop("endpoints", None) or [{}]
+    if isinstance(endpoints, str):
+        endpoints = json.loads(endpoints)
+    options = {key: conf.pop(key) for key in ("routing", "cooldown") if key in conf}
+    return options, [{**conf, **endpoint} for endpoint in endpoints]
+
+
+class PooledChatModelMixin:
+    """A mixin class that sends the chat model calls to the endpoints of its pool."""
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs):
+        return self.pool.run(
+            lambda model: model._generate(
+                messages, stop=stop, run_manager=run_manager, **kwargs
+            )
+        )
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs):
+        return await self.pool.arun(
+            lambda model: model._agenerate(
+                messages, stop=stop, run_manager=run_manager, **kwargs
+            )
+        )
+
+    def _stream(self, messages, stop=None, run_manager=None, **kwargs):
+        yield from self.pool.stream(
+            lambda model: model._stream(
+                messages, stop=stop, run_manager=run_manager, **kwargs
+            )
+        )
+
+    async def _astream(self, messages, stop=None, run_manager=None, **kwargs):
+        async for chunk in self.pool.astream(
+            lambda model: model._astream(
+                messages, stop=stop, run_manager=run_manager, **kwargs
+            )
+        ):
+            yield chunk
+
+
+@functools.cache
+def create_pooled_chat_model(base_model_class: Type[T]) -> Type[T]:
+    """
+    Factory function to create a pooled version of a chat model class.
+
+    Args:
+        base_model_class: The original chat model class
+
+    Returns:
+        A new class that inherits from both PooledChatModelMixin and the base model class
+    """
+
+    class PooledChatModel(PooledChatModelMixin, base_model_class):
+        pool: Any = Field(default=None, exclude=True)
+
+    PooledChatModel.__name__ = f"Pooled{base_model_class.__name__}"
+    return PooledChatModel
@@ -9,6 +9,9 @@ logger = logging.getLogger(__name__)
 
 
 def audio_mixer_node(state: PodcastState):
+    if state.get("stream_audio"):
+        # The chunks were streamed by the TTS node, the consumer has the mix
+        return {}
     logger.info("Mixing audio chunks for podcast...")
     audio_chunks = state["audio_chunks"]
     combined_audio = b"".join(audio_chunks)
@@ -13,6 +13,8 @@ class PodcastState(MessagesState):
 
     # Input
     input: str = ""
+    # The audio is streamed as it is synthesized, it is not kept in the state
+    stream_audio: bool = False
 
     # Output
     output: Optional[bytes] = None
@@ -1,36 +1,126 @@
 # Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
 # SPDX-License-Identifier: MIT
 
+import asyncio
 import base64
 import logging
 import os
+from typing import Optional
+
+from langgraph.config import get_stream_writer
 
 from src.podcast.graph.state import PodcastState
+from src.podcast.types import ScriptLine
 from src.tools.tts import VolcengineTTS
+from src.tools.tts_cache import get_tts_cache, tts_cache_key
 
 logger = logging.getLogger(__name__)
 
+MALE_VOICE_TYPE = "BV002_streaming"
+FEMALE_VOICE_TYPE = "BV001_streaming"
+SPEED_RATIO = 1.05
+
 
-def tts_node(state: PodcastState):
+async def tts_node(state: PodcastState):
     logger.info("Generating audio chunks for podcast...")
-    tts_client = _create_tts_client()
-    for line in state["script"].lines:
-        tts_client.voice_type = (
-            "BV002_streaming" if line.speaker == "male" else "BV001_streaming"
+    tts_clients = create_tts_clients()
+    concurrency = int(os.getenv("PODCAST_TTS_CONCURRENCY", "4"))
+    max_retries = int(os.getenv("PODCAST_TTS_MAX_RETRIES", "2"))
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+
+    lines = state["script"].lines
+    stream_audio = state.get("stream_audio", False)
+    results: list[Optional[bytes]] = [None] * len(lines)
+    done = [False] * len(lines)
+    next_index = 0
+    write = _get_stream_writer()
+
+    async def synthesize(index: int, line: ScriptLine) -> None:
+        nonlocal next_index
+        results[index] = await _synthesize_line(
+            tts_clients["male" if line.speaker == "male" else "female"],
+            line,
+            max_retries,
+            semaphore,
         )
-        result = tts_client.text_to_speech(line.paragraph, speed_ratio=1.05)
+        done[index] = True
+        # Stream the chunks in script order, as soon as all previous lines
+        # are done
+        while next_index < len(lines) and done[next_index]:
+            if results[next_index] is not None:
+                write({"audio_chunk": results[next_index], "line": next_index})
+                if stream_audio:
+                    # Only the lines that cannot be streamed yet are kept
+                    results[next_index] = None
+            next_index += 1
+
+    await asyncio.gather(*(synthesize(i, line) for i, line in enumerate(lines)))
+    if stream_audio:
+        return {}
+    return {
+        "audio_chunks": state["audio_chunks"]
+        + [chunk for chunk in results if chunk is not None],
+    }
+
+
+async def _synthesize_line(
+    tts_client: VolcengineTTS,
+    line: ScriptLine,
+    max_retries: int,
+    semaphore: asyncio.Semaphore,
+) -> Optional[bytes]:
+    cache = get_tts_cache()
+    cache_key = tts_cache_key(
+        line.paragraph, tts_client.voice_type, speed_ratio=SPEED_RATIO
+    )
+    if cache and (audio_chunk := await cache.aget(cache_key)) is not None:
+        return audio_chunk
+
+    for attempt in range(max_retries + 1):
+        # The slot is released during the backoff, so other lines can run
+        async with semaphore:
+            # The retries of a line are all made here, not by the HTTP client
+            result = await tts_client.atext_to_speech(
+                line.paragraph, speed_ratio=SPEED_RATIO, max_retries=0
+            )
         if result["success"]:
-            audio_data = result["audio_data"]
-            audio_chunk = base64.b64decode(audio_data)
-            state["audio_chunks"].append(audio_chunk)
-        else:
-            logger.error(result["error"])
+            audio_chunk = base64.b64decode(result["audio_data"])
+            if cache:
+                await cache.aput(cache_key, audio_chunk)
+            return audio_chunk
+        logger.error(result["error"])
+        if attempt < max_retries:
+            await asyncio.sleep(0.5 * 2**attempt)
+    logger.error(f"Skipping podcast line after {max_retries + 1} attempts")
+    return None
+
+
+def _get_stream_writer():
+    try:
+        return get_stream_writer()
+    except RuntimeError:
+        # Called outside of a graph run
+        return lambda _: None
+
+
+def podcast_cache_key(content: str) -> str:
+    """TTS cache key of the full mix of a podcast."""
+    return tts_cache_key(
+        content,
+        f"podcast:{MALE_VOICE_TYPE}+{FEMALE_VOICE_TYPE}",
+        speed_ratio=SPEED_RATIO,
+    )
+
+
+def create_tts_clients() -> dict[str, VolcengineTTS]:
+    """Create the TTS clients of both speakers, raises if TTS is not configured."""
     return {
-        "audio_chunks": state["audio_chunks"],
+        "male": _create_tts_client(MALE_VOICE_TYPE),
+        "female": _create_tts_client(FEMALE_VOICE_TYPE),
     }
 
 
-def _create_tts_client():
+def _create_tts_client(voice_type: str = FEMALE_VOICE_TYPE):
     app_id = os.getenv("VOLCENGINE_TTS_APPID", "")
     if not app_id:
         raise Exception("VOLCENGINE_TTS_APPID is not set")
@@ -38,7 +128,6 @@ def _create_tts_client():
     if not access_token:
         raise Exception("VOLCENGINE_TTS_ACCESS_TOKEN is not set")
     cluster = os.getenv("VOLCENGINE_TTS_CLUSTER", "volcano_tts")
-    voice_type = "BV001_streaming"
     return VolcengineTTS(
         appid=app_id,
         access_token=access_token,
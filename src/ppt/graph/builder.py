@@ -23,9 +23,13 @@ def build_graph():
 workflow = build_graph()
 
 if __name__ == "__main__":
+    import asyncio
+
     from dotenv import load_dotenv
 
     load_dotenv()
 
     report_content = open("examples/nanjing_tangbao.md").read()
-    final_state = workflow.invoke({"input": report_content})
+    final_state = asyncio.run(workflow.ainvoke({"input": report_content}))
+    with open("final.pptx", "wb") as f:
+        f.write(final_state["output"])
@@ -13,8 +13,7 @@ class PPTState(MessagesState):
     input: str = ""
 
     # Output
-    generated_file_path: str = ""
+    output: Optional[bytes] = None
 
     # Assets
     ppt_content: str = ""
-    ppt_file_path: str = ""
@@ -0,0 +1,98 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+"""
+Async PPTX rendering with the marp CLI.
+
+The markdown is piped to marp over stdin and the presentation is read back
+from its stdout, so nothing is written to disk. The number of marp processes
+running at the same time is capped, each of them starts a headless browser.
+"""
+
+import asyncio
+import os
+import threading
+import weakref
+from typing import Sequence
+
+PPT_RENDER_CONCURRENCY = int(os.getenv("PPT_RENDER_CONCURRENCY", "2"))
+PPT_RENDER_TIMEOUT = float(os.getenv("PPT_RENDER_TIMEOUT", "120"))
+MARP_COMMAND = os.getenv("MARP_COMMAND", "marp")
+
+
+class MarpRenderer:
+    """
+    Bounded pool of marp processes bound to one event loop.
+
+    Renders are queued once `max_workers` processes are running.
+    """
+
+    def __init__(
+        self,
+        max_workers: int = PPT_RENDER_CONCURRENCY,
+        timeout: float = PPT_RENDER_TIMEOUT,
+        command: Sequence[str] = (MARP_COMMAND,),
+    ):
+        self.max_workers = max(1, max_workers)
+        self.timeout = timeout
+        self.command = tuple(command)
+        self._semaphore = asyncio.Semaphore(self.max_workers)
+
+    async def render(self, markdown: str) -> bytes:
+        """Render marp markdown to PPTX bytes."""
+        async with self._semaphore:
+            # https://github.com/marp-team/marp-cli?tab=readme-ov-file
+            # With no input file marp reads stdin, `-o -` writes to stdout
+            process = await asyncio.create_subprocess_exec(
+                *self.command,
+                "--pptx",
+                "-o",
+                "-",
+                stdin=asyncio.subprocess.PIPE,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+            )
+            try:
+                stdout, stderr = await asyncio.wait_for(
+                    process.communicate(markdown.encode("utf-8")), self.timeout
+                )
+            except BaseException:
+                # Timed out or cancelled, do not leave the browser running
+                if process.returncode is None:
+                    process.kill()
+                    await process.wait()
+                raise
+        if process.returncode != 0:
+            message = stderr.decode("utf-8", errors="replace").strip()
+            raise RuntimeError(
+                f"marp exited with code {process.returncode}: {message[-500:]}"
+            )
+        if not stdout:
+            raise RuntimeError("marp produced no output")
+        return stdout
+
+
+_renderers: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, MarpRenderer]" = (
+    weakref.WeakKeyDictionary()
+)
+_renderers_lock = threading.Lock()
+
+
+def get_marp_renderer() -> MarpRenderer:
+    """
+    Get the marp renderer of the running event loop.
+
+    The pool is limited with an asyncio semaphore, which is bound to a loop,
+    so every loop gets its own renderer.
+    """
+    loop = asyncio.get_running_loop()
+    with _renderers_lock:
+        renderer = _renderers.get(loop)
+        if renderer is None:
+            renderer = MarpRenderer()
+            _renderers[loop] = renderer
+    return renderer
+
+
+async def render_pptx(markdown: str) -> bytes:
+    return await get_marp_renderer().render(markdown)
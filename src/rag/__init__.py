@@ -3,6 +3,19 @@
 
 from .retriever import Retriever, Document, Resource, Chunk
 from .ragflow import RAGFlowProvider
+from .local import LocalRetriever
+from .cache import RAGCache, CachedRetriever, get_rag_cache
 from .builder import build_retriever
 
-__all__ = [Retriever, Document, Resource, RAGFlowProvider, Chunk, build_retriever]
+__all__ = [
+    Retriever,
+    Document,
+    Resource,
+    RAGFlowProvider,
+    LocalRetriever,
+    Chunk,
+    RAGCache,
+    CachedRetriever,
+    get_rag_cache,
+    build_retriever,
+]
@@ -2,13 +2,20 @@
 # SPDX-License-Identifier: MIT
 
 from src.config.tools import SELECTED_RAG_PROVIDER, RAGProvider
+from src.rag.cache import CachedRetriever, get_rag_cache
+from src.rag.local import get_local_retriever
 from src.rag.ragflow import RAGFlowProvider
 from src.rag.retriever import Retriever
 
 
 def build_retriever() -> Retriever | None:
     if SELECTED_RAG_PROVIDER == RAGProvider.RAGFLOW.value:
-        return RAGFlowProvider()
+        retriever = RAGFlowProvider()
+    elif SELECTED_RAG_PROVIDER == RAGProvider.LOCAL.value:
+        retriever = get_local_retriever()
     elif SELECTED_RAG_PROVIDER:
         raise ValueError(f"Unsupported RAG provider: {SELECTED_RAG_PROVIDER}")
-    return None
+    else:
+        return None
+    cache = get_rag_cache()
+    return CachedRetriever(retriever, cache) if cache else retriever
@@ -0,0 +1,206 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+"""
+Cache of RAG provider responses.
+
+Resource listings are keyed by the listing query and kept for a short time,
+as the resource picker lists them on every keystroke. Retrieved documents are
+keyed by the query and the sorted resource URIs.
+"""
+
+import copy
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Optional
+
+from src.rag.retriever import Document, Resource, Retriever
+
+logger = logging.getLogger(__name__)
+
+RESOURCES = "resources"
+DOCUMENTS = "documents"
+
+
+class RAGCache:
+    """
+    Thread-safe LRU cache of resource listings and retrieved documents.
+
+    Each kind of entry has its own time to live. Entries can be invalidated
+    explicitly, e.g. after a knowledge base was updated.
+    """
+
+    def __init__(
+        self,
+        resources_ttl: float = 60.0,
+        documents_ttl: float = 600.0,
+        max_entries: int = 512,
+    ):
+        self.ttls = {RESOURCES: resources_ttl, DOCUMENTS: documents_ttl}
+        self.max_entries = max(1, max_entries)
+        # key -> (created_at, resource URIs, value)
+        self._entries: OrderedDict[tuple, tuple[float, tuple[str, ...], Any]] = (
+            OrderedDict()
+        )
+        self._lock = threading.Lock()
+        self._stats = {
+            kind: {"hits": 0, "misses": 0, "invalidations": 0}
+            for kind in (RESOURCES, DOCUMENTS)
+        }
+
+    @staticmethod
+    def resources_key(provider: str, query: str | None) -> tuple:
+        return (RESOURCES, provider, (query or "").strip().lower())
+
+    @staticmethod
+    def documents_key(provider: str, query: str, resources: list[Resource]) -> tuple:
+        uris = tuple(sorted({resource.uri for resource in resources}))
+        return (DOCUMENTS, provider, " ".join(query.split()), uris)
+
+    def get(self, key: tuple) -> Optional[Any]:
+        """Return a copy of the cached value, or None if missing or expired."""
+        kind = key[0]
+        with self._lock:
+            item = self._entries.get(key)
+            if item is not None:
+                created_at, _, value = item
+                if time.time() - created_at < self.ttls[kind]:
+                    self._entries.move_to_end(key)
+                    self._stats[kind]["hits"] += 1
+                    return copy.deepcopy(value)
+                del self._entries[key]
+            self._stats[kind]["misses"] += 1
+            return None
+
+    def put(self, key: tuple, value: Any) -> None:
+        uris = key[3] if key[0] == DOCUMENTS else ()
+        with self._lock:
+            self._entries[key] = (time.time(), uris, copy.deepcopy(value))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate_resources(self) -> int:
+        """Drop every cached resource listing."""
+        return self._invalidate(lambda key, uris: key[0] == RESOURCES, RESOURCES)
+
+    def invalidate_documents(self, resource_uri: str | None = None) -> int:
+        """
+        Drop the cached documents, or only those retrieved from a resource.
+
+        A dataset URI also drops the entries of the documents it contains.
+        """
+
+        def matches(key: tuple, uris: tuple[str, ...]) -> bool:
+            if key[0] != DOCUMENTS:
+                return False
+            if resource_uri is None:
+                return True
+            return any(
+                uri == resource_uri or uri.startswith(f"{resource_uri}#")
+                for uri in uris
+            )
+
+        return self._invalidate(matches, DOCUMENTS)
+
+    def clear(self) -> None:
+        self.invalidate_resources()
+        self.invalidate_documents()
+
+    def stats(self) -> dict[str, dict[str, float]]:
+        """Return the hit/miss counters and hit rate of each kind of entry."""
+        with self._lock:
+            stats = {}
+            for kind, counters in self._stats.items():
+                lookups = counters["hits"] + counters["misses"]
+                stats[kind] = {
+                    **counters,
+                    "hit_rate": counters["hits"] / lookups if lookups else 0.0,
+                    "entries": sum(1 for key in self._entries if key[0] == kind),
+                }
+            return stats
+
+    def _invalidate(self, matches, kind: str) -> int:
+        with self._lock:
+            keys = [
+                key for key, (_, uris, _) in self._entries.items() if matches(key, uris)
+            ]
+            for key in keys:
+                del self._entries[key]
+            self._stats[kind]["invalidations"] += 1
+        logger.info(f"Invalidated {len(keys)} cached RAG {kind}")
+        return len(keys)
+
+
+class CachedRetriever(Retriever):
+    """A retriever that serves repeated calls of another one from a cache."""
+
+    def __init__(self, retriever: Retriever, cache: RAGCache):
+        self.retriever = retriever
+        self.cache = cache
+        self.provider = type(retriever).__name__
+
+    def list_resources(self, query: str | None = None) -> list[Resource]:
+        key = self.cache.resources_key(self.provider, query)
+        if (resources := self.cache.get(key)) is not None:
+            return resources
+        resources = self.retriever.list_resources(query)
+        self.cache.put(key, resources)
+        return resources
+
+    async def alist_resources(self, query: str | None = None) -> list[Resource]:
+        key = self.cache.resources_key(self.provider, query)
+        if (resources := self.cache.get(key)) is not None:
+            return resources
+        resources = await self.retriever.alist_resources(query)
+        self.cache.put(key, resources)
+        return resources
+
+    def query_relevant_documents(
+        self, query: str, resources: list[Resource] = []
+    ) -> list[Document]:
+        key = self.cache.documents_key(self.provider, query, resources)
+        if (documents := self.cache.get(key)) is not None:
+            return documents
+        documents = self.retriever.query_relevant_documents(query, resources)
+        # Empty results may come from an index still being built, retry them
+        if documents:
+            self.cache.put(key, documents)
+        return documents
+
+    async def aquery_relevant_documents(
+        self, query: str, resources: list[Resource] = []
+    ) -> list[Document]:
+        key = self.cache.documents_key(self.provider, query, resources)
+        if (documents := self.cache.get(key)) is not None:
+            return documents
+        documents = await self.retriever.aquery_relevant_documents(query, resources)
+        if documents:
+            self.cache.put(key, documents)
+        return documents
+
+
+_rag_cache: Optional[RAGCache] = None
+_rag_cache_lock = threading.Lock()
+
+
+def get_rag_cache() -> Optional[RAGCache]:
+    """
+    Get the process-wide RAG cache, or None if RAG caching is disabled.
+
+    Configured by the RAG_CACHE_* environment variables.
+    """
+    global _rag_cache
+    if os.getenv("RAG_CACHE_ENABLED", "false").lower() not in ("true", "1", "yes"):
+        return None
+    with _rag_cache_lock:
+        if _rag_cache is None:
+            _rag_cache = RAGCache(
+                resources_ttl=float(os.getenv("RAG_CACHE_RESOURCES_TTL", "60")),
+                documents_ttl=float(os.getenv("RAG_CACHE_DOCUMENTS_TTL", "600")),
+                max_entries=int(os.getenv("RAG_CACHE_MAX_ENTRIES", "512")),
+            )
+        return _rag_cache
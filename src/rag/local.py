@@ -0,0 +1,522 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+"""
+In-process retriever backed by a NumPy embedding matrix.
+
+Documents are grouped in datasets and addressed with the same `rag://` URIs
+as the other providers: `rag://dataset/<dataset>#<document>`. Texts are
+embedded locally with feature hashing, so no service is called at ingestion
+or query time. Any LangChain `Embeddings` can be passed instead.
+
+Small collections are searched exhaustively. Once a collection reaches
+`ivf_min_chunks` chunks, an inverted file index (k-means clusters of the
+embeddings) is built and only the `nprobe` closest clusters are scanned.
+
+The collection is persisted to a directory as an `.npy` matrix, memory-mapped
+on load, and a JSON file with the documents and chunks.
+"""
+
+import json
+import logging
+import os
+import re
+import threading
+import zlib
+from typing import Any, Iterable, Optional, Sequence
+
+import numpy as np
+
+from src.rag.ragflow import parse_uri
+from src.rag.retriever import Chunk, Document, Resource, Retriever
+
+logger = logging.getLogger(__name__)
+
+EMBEDDINGS_FILE = "embeddings.npy"
+METADATA_FILE = "metadata.json"
+INGESTED_EXTENSIONS = (".md", ".markdown", ".txt")
+
+_WORD_RE = re.compile(r"\w+")
+
+
+class HashingEmbedder:
+    """
+    Embeds texts with signed feature hashing of their words.
+
+    Words outside of ASCII also contribute their character bigrams, so texts
+    without spaces between words (Chinese, Japanese...) can be matched too.
+    """
+
+    def __init__(self, dim: int = 512):
+        self.dim = dim
+
+    def _tokens(self, text: str) -> list[str]:
+        tokens = []
+        for word in _WORD_RE.findall(text.lower()):
+            tokens.append(word)
+            if not word.isascii() and len(word) > 1:
+                tokens.extend(word[i : i + 2] for i in range(len(word) - 1))
+        return tokens
+
+    def embed_documents(self, texts: Sequence[str]) -> np.ndarray:
+        vectors = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            hashes = np.fromiter(
+                (zlib.crc32(token.encode("utf-8")) for token in self._tokens(text)),
+                dtype=np.uint32,
+            )
+            if not hashes.size:
+                continue
+            signs = np.where(hashes & 1, 1.0, -1.0).astype(np.float32)
+            np.add.at(vectors[row], (hashes >> 1) % self.dim, signs)
+        # Sublinear term frequency, then unit length for cosine similarity
+        vectors = np.sign(vectors) * np.log1p(np.abs(vectors))
+        return _normalize(vectors)
+
+    def embed_query(self, text: str) -> np.ndarray:
+        return self.embed_documents([text])[0]
+
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors / np.maximum(norms, 1e-12)
+
+
+def split_text(text: str, chunk_size: int) -> list[str]:
+    """Split a text in chunks of about `chunk_size` characters, on paragraphs."""
+    chunks: list[str] = []
+    current = ""
+    for paragraph in re.split(r"\n\s*\n", text):
+        paragraph = paragraph.strip()
+        if not paragraph:
+            continue
+        while len(paragraph) > chunk_size:
+            if current:
+                chunks.append(current)
+                current = ""
+            chunks.append(paragraph[:chunk_size])
+            paragraph = paragraph[chunk_size:]
+        if current and len(current) + len(paragraph) + 2 > chunk_size:
+            chunks.append(current)
+            current = ""
+        current = f"{current}\n\n{paragraph}" if current else paragraph
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+def _kmeans(
+    vectors: np.ndarray, n_clusters: int, iterations: int = 10, seed: int = 0
+) -> np.ndarray:
+    """Spherical k-means, returns unit length centroids."""
+    rng = np.random.default_rng(seed)
+    centroids = vectors[rng.choice(len(vectors), n_clusters, replace=False)].copy()
+    for _ in range(iterations):
+        assignments = np.argmax(vectors @ centroids.T, axis=1)
+        for cluster in range(n_clusters):
+            members = vectors[assignments == cluster]
+            if len(members):
+                centroids[cluster] = members.sum(axis=0)
+        centroids = _normalize(centroids)
+    return centroids
+
+
+class LocalRetriever(Retriever):
+    """
+    Retriever over a collection of documents held in memory.
+
+    Thread-safe: searches and ingestion can run from several threads.
+    """
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        embeddings: Any = None,
+        dim: int = 512,
+        chunk_size: int = 1000,
+        top_k: int = 10,
+        nprobe: int = 8,
+        ivf_min_chunks: int = 4096,
+    ):
+        self.path = path
+        self.embeddings = embeddings or HashingEmbedder(dim)
+        self.chunk_size = chunk_size
+        self.top_k = top_k
+        self.nprobe = nprobe
+        self.ivf_min_chunks = ivf_min_chunks
+        self._lock = threading.RLock()
+        # One entry per document: {"id", "dataset", "title"}
+        self._documents: list[dict[str, str]] = []
+        self._document_index: dict[tuple[str, str], int] = {}
+        self._chunk_texts: list[str] = []
+        self._chunk_documents = np.zeros(0, dtype=np.int64)
+        self._matrix: Optional[np.ndarray] = None
+        self._centroids: Optional[np.ndarray] = None
+        self._assignments: Optional[np.ndarray] = None
+        if path and os.path.exists(os.path.join(path, METADATA_FILE)):
+            self.load()
+
+    def __len__(self) -> int:
+        return len(self._chunk_texts)
+
+    # Ingestion
+
+    def add_document(
+        self,
+        dataset: str,
+        document_id: str,
+        text: str,
+        title: Optional[str] = None,
+    ) -> str:
+        """Add or replace a document, returns its `rag://` URI."""
+        self.add_documents(dataset, [(document_id, text, title)])
+        return f"rag://dataset/{dataset}#{document_id}"
+
+    def add_documents(
+        self,
+        dataset: str,
+        documents: Iterable[tuple[str, str, Optional[str]]],
+    ) -> int:
+        """
+        Add or replace (id, text, title) documents in a dataset.
+
+        All the chunks are embedded in one batch. Returns the number of chunks
+        added.
+        """
+        if not re.fullmatch(r"[\w.-]+", dataset):
+            raise ValueError(f"Invalid dataset name: {dataset}")
+        documents = list(documents)
+        with self._lock:
+            self._remove({(dataset, document_id) for document_id, _, _ in documents})
+            texts: list[str] = []
+            owners: list[int] = []
+            for document_id, text, title in documents:
+                index = len(self._documents)
+                self._documents.append(
+                    {"id": document_id, "dataset": dataset, "title": title or ""}
+                )
+                self._document_index[(dataset, document_id)] = index
+                chunks = split_text(text, self.chunk_size)
+                texts.extend(chunks)
+                owners.extend([index] * len(chunks))
+            if not texts:
+                return 0
+            vectors = np.asarray(
+                self.embeddings.embed_documents(texts), dtype=np.float32
+            )
+            vectors = _normalize(vectors)
+            if self._matrix is None or not len(self._matrix):
+                self._matrix = vectors
+            else:
+                self._matrix = np.concatenate([self._matrix, vectors])
+            self._chunk_texts.extend(texts)
+            self._chunk_documents = np.concatenate(
+                [self._chunk_documents, np.asarray(owners, dtype=np.int64)]
+            )
+            self._centroids = None
+            logger.info(
+                f"Added {len(documents)} documents ({len(texts)} chunks) "
+                f"to dataset {dataset}"
+            )
+            return len(texts)
+
+    def ingest_path(self, path: str, dataset: Optional[str] = None) -> int:
+        """
+        Add a text file, or every text file under a directory, to a dataset.
+
+        The dataset defaults to the directory name and documents are named
+        after their path relative to it. Returns the number of chunks added.
+        """
+        path = os.path.abspath(path)
+        root = path if os.path.isdir(path) else os.path.dirname(path)
+        dataset = dataset or re.sub(r"[^\w.-]", "_", os.path.basename(root))
+        files = []
+        if os.path.isdir(path):
+            for directory, _, names in sorted(os.walk(path)):
+                files.extend(
+                    os.path.join(directory, name)
+                    for name in sorted(names)
+                    if name.lower().endswith(INGESTED_EXTENSIONS)
+                )
+        else:
+            files.append(path)
+
+        documents = []
+        for file in files:
+            with open(file, encoding="utf-8", errors="replace") as f:
+                text = f.read()
+            document_id = os.path.relpath(file, root).replace(os.sep, "/")
+            title = os.path.splitext(os.path.basename(file))[0]
+            documents.append((document_id, text, title))
+        return self.add_documents(dataset, documents)
+
+    def remove_dataset(self, dataset: str) -> None:
+        with self._lock:
+            self._remove({key for key in self._document_index if key[0] == dataset})
+
+    def _remove(self, keys: set[tuple[str, str]]) -> None:
+        removed = {
+            self._document_index[key] for key in keys if key in self._document_index
+        }
+        if not removed:
+            return
+        keep_chunks = ~np.isin(self._chunk_documents, list(removed))
+        keep_documents = [i for i in range(len(self._documents)) if i not in removed]
+        renumber = np.full(len(self._documents), -1, dtype=np.int64)
+        renumber[keep_documents] = np.arange(len(keep_documents))
+
+        self._documents = [self._documents[i] for i in keep_documents]
+        self._document_index = {
+            (doc["dataset"], doc["id"]): i for i, doc in enumerate(self._documents)
+        }
+        self._chunk_texts = [
+            text for text, keep in zip(self._chunk_texts, keep_chunks) if keep
+        ]
+        self._chunk_documents = renumber[self._chunk_documents[keep_chunks]]
+        if self._matrix is not None:
+            self._matrix = np.asarray(self._matrix[keep_chunks])
+        self._centroids = None
+
+    # Persistence
+
+    def save(self, path: Optional[str] = None) -> None:
+        path = path or self.path
+        if not path:
+            raise ValueError("No path to save the local retriever to")
+        os.makedirs(path, exist_ok=True)
+        with self._lock:
+            matrix = (
+                self._matrix
+                if self._matrix is not None
+                else np.zeros((0, 0), dtype=np.float32)
+            )
+            metadata = {
+                "documents": self._documents,
+                "chunks": [
+                    {"document": int(document), "content": text}
+                    for document, text in zip(self._chunk_documents, self._chunk_texts)
+                ],
+            }
+            # Write aside and rename, a crash never leaves a partial collection
+            tmp_matrix = os.path.join(path, f"{EMBEDDINGS_FILE}.tmp")
+            with open(tmp_matrix, "wb") as f:
+                np.save(f, matrix)
+            tmp_metadata = os.path.join(path, f"{METADATA_FILE}.tmp")
+            with open(tmp_metadata, "w", encoding="utf-8") as f:
+                json.dump(metadata, f, ensure_ascii=False)
+            os.replace(tmp_matrix, os.path.join(path, EMBEDDINGS_FILE))
+            os.replace(tmp_metadata, os.path.join(path, METADATA_FILE))
+        logger.info(f"Saved {len(self)} chunks to {path}")
+
+    def load(self, path: Optional[str] = None) -> None:
+        path = path or self.path
+        with open(os.path.join(path, METADATA_FILE), encoding="utf-8") as f:
+            metadata = json.load(f)
+        # Memory-mapped, pages are read from disk when they are searched
+        matrix = np.load(os.path.join(path, EMBEDDINGS_FILE), mmap_mode="r")
+        with self._lock:
+            self._documents = metadata["documents"]
+            self._document_index = {
+                (doc["dataset"], doc["id"]): i for i, doc in enumerate(self._documents)
+            }
+            self._chunk_texts = [chunk["content"] for chunk in metadata["chunks"]]
+            self._chunk_documents = np.asarray(
+                [chunk["document"] for chunk in metadata["chunks"]], dtype=np.int64
+            )
+            self._matrix = matrix if len(self._chunk_texts) else None
+            self._centroids = None
+        logger.info(f"Loaded {len(self)} chunks from {path}")
+
+    # Search
+
+    def search(
+        self,
+        queries: Sequence[str],
+        top_k: Optional[int] = None,
+        resources: Sequence[Resource] = (),
+    ) -> list[list[tuple[int, float]]]:
+        """
+        Find the chunks most similar to each query.
+
+        Returns (chunk index, cosine similarity) pairs, best first, for each
+        query. All the queries are embedded and scored in one batch.
+        """
+        top_k = top_k or self.top_k
+        with self._lock:
+            if self._matrix is None or not queries:
+                return [[] for _ in queries]
+            matrix = self._matrix
+            mask = self._resource_mask(resources)
+            query_vectors = _normalize(
+                np.atleast_2d(
+                    np.asarray(self.embeddings.embed_documents(queries), np.float32)
+                )
+            )
+            if len(matrix) >= self.ivf_min_chunks:
+                return self._search_ivf(matrix, query_vectors, top_k, mask)
+            scores = query_vectors @ matrix.T
+            if mask is not None:
+                scores[:, ~mask] = -np.inf
+            return [self._top_k(row, np.arange(len(row)), top_k) for row in scores]
+
+    def _search_ivf(
+        self,
+        matrix: np.ndarray,
+        query_vectors: np.ndarray,
+        top_k: int,
+        mask: Optional[np.ndarray],
+    ) -> list[list[tuple[int, float]]]:
+        if self._centroids is None:
+            self._build_ivf(matrix)
+        nprobe = min(self.nprobe, len(self._centroids))
+        cluster_scores = query_vectors @ self._centroids.T
+        probes = np.argpartition(-cluster_scores, nprobe - 1, axis=1)[:, :nprobe]
+        results = []
+        for query_vector, clusters in zip(query_vectors, probes):
+            candidates = np.isin(self._assignments, clusters)
+            if mask is not None:
+                candidates &= mask
+            candidates = np.flatnonzero(candidates)
+            scores = np.asarray(matrix[candidates]) @ query_vector
+            results.append(self._top_k(scores, candidates, top_k))
+        return results
+
+    def _build_ivf(self, matrix: np.ndarray) -> None:
+        rng = np.random.default_rng(0)
+        n_clusters = max(1, int(np.sqrt(len(matrix))))
+        sample = matrix
+        if len(matrix) > 64 * n_clusters:
+            sample = matrix[np.sort(rng.choice(len(matrix), 64 * n_clusters, False))]
+        self._centroids = _kmeans(np.asarray(sample), n_clusters)
+        self._assignments = np.empty(len(matrix), dtype=np.int64)
+        # Assign in blocks, the matrix may be memory-mapped
+        for start in range(0, len(matrix), 8192):
+            block = np.asarray(matrix[start : start + 8192])
+            self._assignments[start : start + 8192] = np.argmax(
+                block @ self._centroids.T, axis=1
+            )
+        logger.info(
+            f"Built an index of {n_clusters} clusters over {len(matrix)} chunks"
+        )
+
+    @staticmethod
+    def _top_k(
+        scores: np.ndarray, indices: np.ndarray, top_k: int
+    ) -> list[tuple[int, float]]:
+        valid = np.isfinite(scores)
+        scores, indices = scores[valid], indices[valid]
+        if len(scores) > top_k:
+            best = np.argpartition(-scores, top_k - 1)[:top_k]
+            scores, indices = scores[best], indices[best]
+        order = np.argsort(-scores, kind="stable")
+        return [(int(indices[i]), float(scores[i])) for i in order]
+
+    def _resource_mask(self, resources: Sequence[Resource]) -> Optional[np.ndarray]:
+        """Return the chunks of the given resources, or None for all chunks."""
+        if not resources:
+            return None
+        allowed = set()
+        for resource in resources:
+            dataset, document_id = parse_uri(resource.uri)
+            if document_id:
+                if (dataset, document_id) in self._document_index:
+                    allowed.add(self._document_index[(dataset, document_id)])
+            else:
+                allowed.update(
+                    i
+                    for (name, _), i in self._document_index.items()
+                    if name == dataset
+                )
+        return np.isin(self._chunk_documents, list(allowed))
+
+    # Retriever
+
+    def list_resources(self, query: str | None = None) -> list[Resource]:
+        with self._lock:
+            counts: dict[str, int] = {}
+            for doc in self._documents:
+                counts[doc["dataset"]] = counts.get(doc["dataset"], 0) + 1
+        return [
+            Resource(
+                uri=f"rag://dataset/{dataset}",
+                title=dataset,
+                description=f"{count} documents",
+            )
+            for dataset, count in sorted(counts.items())
+            if not query or query.lower() in dataset.lower()
+        ]
+
+    def query_relevant_documents(
+        self, query: str, resources: list[Resource] = []
+    ) -> list[Document]:
+        return self.batch_query_relevant_documents([query], resources)[0]
+
+    def batch_query_relevant_documents(
+        self, queries: Sequence[str], resources: list[Resource] = []
+    ) -> list[list[Document]]:
+        """Query the documents relevant to several queries in one batch."""
+        results = []
+        for hits in self.search(queries, resources=resources):
+            with self._lock:
+                documents: dict[int, Document] = {}
+                for chunk_index, similarity in hits:
+                    owner = int(self._chunk_documents[chunk_index])
+                    if owner not in documents:
+                        doc = self._documents[owner]
+                        documents[owner] = Document(
+                            id=doc["id"],
+                            url=f"rag://dataset/{doc['dataset']}#{doc['id']}",
+                            title=doc["title"] or doc["id"],
+                            chunks=[],
+                        )
+                    documents[owner].chunks.append(
+                        Chunk(
+                            content=self._chunk_texts[chunk_index],
+                            similarity=similarity,
+                        )
+                    )
+            results.append(list(documents.values()))
+        return results
+
+
+_local_retriever: Optional[LocalRetriever] = None
+_local_retriever_lock = threading.Lock()
+
+
+def get_local_retriever() -> LocalRetriever:
+    """
+    Get the process-wide local retriever.
+
+    Configured by the LOCAL_RAG_* environment variables.
+    """
+    global _local_retriever
+    with _local_retriever_lock:
+        if _local_retriever is None:
+            _local_retriever = LocalRetriever(
+                path=os.getenv("LOCAL_RAG_DIR", ".cache/rag"),
+                dim=int(os.getenv("LOCAL_RAG_EMBEDDING_DIM", "512")),
+                chunk_size=int(os.getenv("LOCAL_RAG_CHUNK_SIZE", "1000")),
+                top_k=int(os.getenv("LOCAL_RAG_TOP_K", "10")),
+                nprobe=int(os.getenv("LOCAL_RAG_NPROBE", "8")),
+                ivf_min_chunks=int(os.getenv("LOCAL_RAG_IVF_MIN_CHUNKS", "4096")),
+            )
+        return _local_retriever
+
+
+if __name__ == "__main__":
+    import argparse
+
+    from dotenv import load_dotenv
+
+    load_dotenv()
+    logging.basicConfig(level=logging.INFO)
+
+    parser = argparse.ArgumentParser(description="Ingest files in the local RAG")
+    parser.add_argument("paths", nargs="+", help="Text files or directories")
+    parser.add_argument("--dataset", help="Dataset name, defaults to the directory")
+    args = parser.parse_args()
+
+    retriever = get_local_retriever()
+    for path in args.paths:
+        retriever.ingest_path(path, args.dataset)
+    retriever.save()
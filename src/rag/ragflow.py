@@ -1,11 +1,15 @@
 # Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
 # SPDX-License-Identifier: MIT
 
+import asyncio
+import logging
 import os
-import requests
-from src.rag.retriever import Chunk, Document, Resource, Retriever
+from src.rag.retriever import Chunk, Document, Resource, Retriever, merge_documents
+from src.utils import http_client
 from urllib.parse import urlparse
 
+logger = logging.getLogger(__name__)
+
 
 class RAGFlowProvider(Retriever):
     """
@@ -15,6 +19,8 @@ class RAGFlowProvider(Retriever):
     api_url: str
     api_key: str
     page_size: int = 10
+    top_k: int | None = None
+    retrieval_timeout: float = 10.0
 
     def __init__(self):
         api_url = os.getenv("RAGFLOW_API_URL")
@@ -31,14 +37,112 @@ class RAGFlowProvider(Retriever):
         if page_size:
             self.page_size = int(page_size)
 
+        top_k = os.getenv("RAGFLOW_TOP_K")
+        if top_k:
+            self.top_k = int(top_k)
+
+        retrieval_timeout = os.getenv("RAGFLOW_RETRIEVAL_TIMEOUT")
+        if retrieval_timeout:
+            self.retrieval_timeout = float(retrieval_timeout)
+
     def query_relevant_documents(
         self, query: str, resources: list[Resource] = []
     ) -> list[Document]:
-        headers = {
+        response = http_client.post(
+            f"{self.api_url}/api/v1/retrieval",
+            headers=self._headers(),
+            json=self._retrieval_payload(query, resources),
+        )
+        return self._parse_documents(response)
+
+    async def aquery_relevant_documents(
+        self, query: str, resources: list[Resource] = []
+    ) -> list[Document]:
+        """
+        Query every dataset concurrently and merge the results.
+
+        Datasets that do not answer within `retrieval_timeout` seconds are
+        left out, so the latency does not grow with the number of datasets.
+        """
+        groups = self._group_resources(resources)
+        if len(groups) <= 1:
+            return await self._aquery_group(query, resources)
+
+        tasks = [
+            asyncio.create_task(self._aquery_group(query, group)) for group in groups
+        ]
+        done, pending = await asyncio.wait(tasks, timeout=self.retrieval_timeout)
+        for task in pending:
+            task.cancel()
+        # Wait for the cancelled requests to release their connections
+        await asyncio.gather(*pending, return_exceptions=True)
+        if pending:
+            logger.warning(
+                f"{len(pending)} of {len(tasks)} datasets did not answer "
+                f"within {self.retrieval_timeout}s"
+            )
+
+        results = []
+        errors = []
+        for task in tasks:
+            if task not in done:
+                continue
+            if task.exception() is not None:
+                logger.warning(f"Failed to query dataset: {task.exception()!r}")
+                errors.append(task.exception())
+            else:
+                results.append(task.result())
+        if errors and not results:
+            raise errors[0]
+        return merge_documents(results, top_k=self.top_k or self.page_size)
+
+    async def _aquery_group(
+        self, query: str, resources: list[Resource]
+    ) -> list[Document]:
+        response = await http_client.apost(
+            f"{self.api_url}/api/v1/retrieval",
+            headers=self._headers(),
+            json=self._retrieval_payload(query, resources),
+        )
+        return self._parse_documents(response)
+
+    def list_resources(self, query: str | None = None) -> list[Resource]:
+        response = http_client.get(
+            f"{self.api_url}/api/v1/datasets",
+            headers=self._headers(),
+            params=self._list_params(query),
+        )
+        return self._parse_resources(response)
+
+    async def alist_resources(self, query: str | None = None) -> list[Resource]:
+        response = await http_client.aget(
+            f"{self.api_url}/api/v1/datasets",
+            headers=self._headers(),
+            params=self._list_params(query),
+        )
+        return self._parse_resources(response)
+
+    def _headers(self) -> dict[str, str]:
+        return {
             "Authorization": f"Bearer {self.api_key}",
             "Content-Type": "application/json",
         }
 
+    def _group_resources(self, resources: list[Resource]) -> list[list[Resource]]:
+        """Group the resources by dataset, one retrieval call per group."""
+        groups: dict[str, list[Resource]] = {}
+        for resource in resources:
+            dataset_id, document_id = parse_uri(resource.uri)
+            group = groups.setdefault(dataset_id, [])
+            if group and not parse_uri(group[0].uri)[1]:
+                # The whole dataset is already queried
+                continue
+            if not document_id:
+                group.clear()
+            group.append(resource)
+        return list(groups.values())
+
+    def _retrieval_payload(self, query: str, resources: list[Resource]) -> dict:
         dataset_ids: list[str] = []
         document_ids: list[str] = []
 
@@ -48,17 +152,14 @@ class RAGFlowProvider(Retriever):
             if document_id:
                 document_ids.append(document_id)
 
-        payload = {
+        return {
             "question": query,
             "dataset_ids": dataset_ids,
             "document_ids": document_ids,
             "page_size": self.page_size,
         }
 
-        response = requests.post(
-            f"{self.api_url}/api/v1/retrieval", headers=headers, json=payload
-        )
-
+    def _parse_documents(self, response) -> list[Document]:
         if response.status_code != 200:
             raise Exception(f"Failed to query documents: {response.text}")
 
@@ -86,20 +187,13 @@ class RAGFlowProvider(Retriever):
 
         return list(docs.values())
 
-    def list_resources(self, query: str | None = None) -> list[Resource]:
-        headers = {
-            "Authorization": f"Bearer {self.api_key}",
-            "Content-Type": "application/json",
-        }
-
+    def _list_params(self, query: str | None) -> dict:
         params = {}
         if query:
             params["name"] = query
+        return params
 
-        response = requests.get(
-            f"{self.api_url}/api/v1/datasets", headers=headers, params=params
-        )
-
+    def _parse_resources(self, response) -> list[Resource]:
         if response.status_code != 200:
             raise Exception(f"Failed to list resources: {response.text}")
 
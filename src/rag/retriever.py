@@ -2,10 +2,19 @@
 # SPDX-License-Identifier: MIT
 
 import abc
+import asyncio
+import json
+from typing import Iterable, Iterator
+
 from pydantic import BaseModel, Field
 
+# Same output as json.dumps(..., ensure_ascii=False) for a string
+_encode = json.encoder.encode_basestring
+
 
 class Chunk:
+    __slots__ = ("content", "similarity")
+
     content: str
     similarity: float
 
@@ -17,29 +26,43 @@ class Chunk:
 class Document:
     """
     Document is a class that represents a document.
+
+    The joined content of the chunks is built once, when it is first needed.
     """
 
+    __slots__ = ("id", "url", "title", "chunks", "_content", "_content_chunks")
+
     id: str
-    url: str | None = None
-    title: str | None = None
-    chunks: list[Chunk] = []
+    url: str | None
+    title: str | None
+    chunks: list[Chunk]
 
     def __init__(
         self,
         id: str,
         url: str | None = None,
         title: str | None = None,
-        chunks: list[Chunk] = [],
+        chunks: list[Chunk] | None = None,
     ):
         self.id = id
         self.url = url
         self.title = title
-        self.chunks = chunks
+        self.chunks = chunks if chunks is not None else []
+        self._content: str | None = None
+        self._content_chunks = -1
+
+    @property
+    def content(self) -> str:
+        # Chunks are appended while a response is parsed, rebuild if it grew
+        if self._content is None or self._content_chunks != len(self.chunks):
+            self._content = "\n\n".join([chunk.content for chunk in self.chunks])
+            self._content_chunks = len(self.chunks)
+        return self._content
 
     def to_dict(self) -> dict:
         d = {
             "id": self.id,
-            "content": "\n\n".join([chunk.content for chunk in self.chunks]),
+            "content": self.content,
         }
         if self.url:
             d["url"] = self.url
@@ -47,6 +70,80 @@ class Document:
             d["title"] = self.title
         return d
 
+    def iter_json(self) -> Iterator[str]:
+        """
+        Yield the JSON of `to_dict()` piece by piece.
+
+        The chunks are escaped one by one, the joined content is never built.
+        """
+        yield f'{{"id": {_encode(self.id)}, "content": "'
+        for i, chunk in enumerate(self.chunks):
+            if i:
+                yield "\\n\\n"
+            yield _encode(chunk.content)[1:-1]
+        yield '"'
+        if self.url:
+            yield f', "url": {_encode(self.url)}'
+        if self.title:
+            yield f', "title": {_encode(self.title)}'
+        yield "}"
+
+
+def iter_documents_json(documents: Iterable[Document]) -> Iterator[str]:
+    """Yield the JSON array of the documents piece by piece."""
+    yield "["
+    for i, doc in enumerate(documents):
+        if i:
+            yield ", "
+        yield from doc.iter_json()
+    yield "]"
+
+
+def documents_to_json(documents: Iterable[Document]) -> str:
+    """
+    Serialize the documents as `json.dumps([doc.to_dict() ...])` would.
+
+    This is the format of a tool message, the documents are written once
+    instead of being copied into dicts, joined strings and then JSON.
+    """
+    return "".join(iter_documents_json(documents))
+
+
+def merge_documents(
+    results: Iterable[list[Document]], top_k: int | None = None
+) -> list[Document]:
+    """
+    Merge the documents returned by several queries.
+
+    Identical chunks are kept once, with their best similarity, and only the
+    `top_k` most similar chunks are kept overall. Documents are ordered by
+    their most similar chunk and their chunks by similarity.
+    """
+    best: dict[str, tuple[Chunk, Document]] = {}
+    for documents in results:
+        for doc in documents:
+            for chunk in doc.chunks:
+                seen = best.get(chunk.content)
+                if seen is None or (chunk.similarity or 0.0) > (
+                    seen[0].similarity or 0.0
+                ):
+                    best[chunk.content] = (chunk, doc)
+
+    ranked = sorted(
+        best.values(), key=lambda item: item[0].similarity or 0.0, reverse=True
+    )
+    if top_k:
+        ranked = ranked[:top_k]
+
+    merged: dict[str, Document] = {}
+    for chunk, doc in ranked:
+        if doc.id not in merged:
+            merged[doc.id] = Document(
+                id=doc.id, url=doc.url, title=doc.title, chunks=[]
+            )
+        merged[doc.id].chunks.append(chunk)
+    return list(merged.values())
+
 
 class Resource(BaseModel):
     """
@@ -78,3 +175,17 @@ class Retriever(abc.ABC):
         Query relevant documents from the resources.
         """
         pass
+
+    async def alist_resources(self, query: str | None = None) -> list[Resource]:
+        """
+        List resources from the rag provider without blocking the event loop.
+        """
+        return await asyncio.to_thread(self.list_resources, query)
+
+    async def aquery_relevant_documents(
+        self, query: str, resources: list[Resource] = []
+    ) -> list[Document]:
+        """
+        Query relevant documents without blocking the event loop.
+        """
+        return await asyncio.to_thread(self.query_relevant_documents, query, resources)
@@ -1,10 +1,12 @@
 # Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
 # SPDX-License-Identifier: MIT
 
+import asyncio
 import base64
 import json
 import logging
 import os
+from contextlib import asynccontextmanager
 from typing import Annotated, List, cast
 from uuid import uuid4
 
@@ -18,6 +20,7 @@ from src.config.report_style import ReportStyle
 from src.config.tools import SELECTED_RAG_PROVIDER
 from src.graph.builder import build_graph_with_memory
 from src.podcast.graph.builder import build_graph as build_podcast_graph
+from src.podcast.graph.tts_node import create_tts_clients, podcast_cache_key
 from src.ppt.graph.builder import build_graph as build_ppt_graph
 from src.prose.graph.builder import build_graph as build_prose_graph
 from src.prompt_enhancer.graph.builder import build_graph as build_prompt_enhancer_graph
@@ -39,17 +42,42 @@ from src.server.rag_request import (
     RAGResourcesResponse,
 )
 from src.server.config_request import ConfigResponse
+from src.server.graph_registry import GraphRegistry
 from src.llms.llm import get_configured_llm_models
 from src.tools import VolcengineTTS
+from src.tools.mcp_pool import close_mcp_client_pool
+from src.tools.tavily_search.tavily_search_api_wrapper import close_tavily_client
+from src.tools.tts_cache import get_tts_cache, tts_cache_key
+from src.utils.http_client import close_async_client
 
 logger = logging.getLogger(__name__)
 
 INTERNAL_SERVER_ERROR_DETAIL = "Internal Server Error"
 
+# Workflow graphs are compiled once and shared by all requests. The builders
+# are looked up when the graph is first compiled, so they can be patched.
+graph_registry = GraphRegistry()
+graph_registry.register("podcast", lambda: build_podcast_graph())
+graph_registry.register("ppt", lambda: build_ppt_graph())
+graph_registry.register("prose", lambda: build_prose_graph())
+graph_registry.register("prompt_enhancer", lambda: build_prompt_enhancer_graph())
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    graph_registry.warm_up()
+    yield
+    # Close pooled MCP connections and their server processes
+    await close_mcp_client_pool()
+    await close_async_client()
+    await close_tavily_client()
+
+
 app = FastAPI(
     title="DeerFlow API",
     description="API for Deer",
     version="0.1.0",
+    lifespan=lifespan,
 )
 
 # Add CORS middleware
@@ -83,6 +111,7 @@ async def chat_stream(request: ChatRequest):
             request.enable_background_investigation,
             request.report_style,
             request.enable_deep_thinking,
+            request.max_concurrent_steps,
         ),
         media_type="text/event-stream",
     )
@@ -101,6 +130,7 @@ async def _astream_workflow_generator(
     enable_background_investigation: bool,
     report_style: ReportStyle,
     enable_deep_thinking: bool,
+    max_concurrent_steps: int = 1,
 ):
     input_ = {
         "messages": messages,
@@ -129,6 +159,7 @@ async def _astream_workflow_generator(
             "mcp_settings": mcp_settings,
             "report_style": report_style.value,
             "enable_deep_thinking": enable_deep_thinking,
+            "max_concurrent_steps": max_concurrent_steps,
         },
         stream_mode=["messages", "updates"],
         subgraphs=True,
@@ -220,23 +251,39 @@ async def text_to_speech(request: TTSRequest):
             cluster=cluster,
             voice_type=voice_type,
         )
-        # Call the TTS API
-        result = tts_client.text_to_speech(
-            text=request.text[:1024],
+        text = request.text[:1024]
+        cache = get_tts_cache()
+        cache_key = tts_cache_key(
+            text,
+            voice_type,
             encoding=request.encoding,
             speed_ratio=request.speed_ratio,
             volume_ratio=request.volume_ratio,
             pitch_ratio=request.pitch_ratio,
             text_type=request.text_type,
-            with_frontend=request.with_frontend,
-            frontend_type=request.frontend_type,
         )
+        audio_data = await cache.aget(cache_key) if cache else None
+
+        if audio_data is None:
+            # Call the TTS API
+            result = await tts_client.atext_to_speech(
+                text=text,
+                encoding=request.encoding,
+                speed_ratio=request.speed_ratio,
+                volume_ratio=request.volume_ratio,
+                pitch_ratio=request.pitch_ratio,
+                text_type=request.text_type,
+                with_frontend=request.with_frontend,
+                frontend_type=request.frontend_type,
+            )
 
-        if not result["success"]:
-            raise HTTPException(status_code=500, detail=str(result["error"]))
+            if not result["success"]:
+                raise HTTPException(status_code=500, detail=str(result["error"]))
 
-        # Decode the base64 audio data
-        audio_data = base64.b64decode(result["audio_data"])
+            # Decode the base64 audio data
+            audio_data = base64.b64decode(result["audio_data"])
+            if cache:
+                await cache.aput(cache_key, audio_data)
 
         # Return the audio file
         return Response(
@@ -259,27 +306,83 @@ async def generate_podcast(request: GeneratePodcastRequest):
     try:
         report_content = request.content
         print(report_content)
-        workflow = build_podcast_graph()
-        final_state = workflow.invoke({"input": report_content})
+        cache = get_tts_cache()
+        cache_key = podcast_cache_key(report_content)
+        if cache:
+            audio_bytes = await cache.aget(cache_key)
+            if audio_bytes is not None:
+                return Response(content=audio_bytes, media_type="audio/mp3")
+        workflow = graph_registry.get("podcast")
+        if request.stream:
+            # Configuration and script errors are reported before the response
+            # starts, only failures while the audio is sent truncate it
+            create_tts_clients()
+            chunks = _astream_podcast_audio(workflow, report_content)
+            first_chunk = await anext(chunks, None)
+            if first_chunk is None:
+                return Response(content=b"", media_type="audio/mp3")
+            return StreamingResponse(
+                _astream_started_audio(first_chunk, chunks, cache_key),
+                media_type="audio/mp3",
+            )
+        with graph_registry.track("podcast"):
+            final_state = await workflow.ainvoke({"input": report_content})
         audio_bytes = final_state["output"]
+        if cache:
+            await cache.aput(cache_key, audio_bytes)
         return Response(content=audio_bytes, media_type="audio/mp3")
     except Exception as e:
         logger.exception(f"Error occurred during podcast generation: {str(e)}")
         raise HTTPException(status_code=500, detail=INTERNAL_SERVER_ERROR_DETAIL)
 
 
+async def _astream_podcast_audio(workflow, report_content: str):
+    # MP3 frames can be concatenated, so every line is playable as soon as
+    # it is sent
+    with graph_registry.track("podcast"):
+        async for event in workflow.astream(
+            {"input": report_content, "stream_audio": True}, stream_mode="custom"
+        ):
+            if audio_chunk := event.get("audio_chunk"):
+                yield audio_chunk
+
+
+async def _astream_started_audio(first_chunk: bytes, chunks, cache_key: str):
+    # The full mix is written to the TTS cache as it is sent, and stored once
+    # the whole episode was sent
+    cache = get_tts_cache()
+    writer = await asyncio.to_thread(cache.open_writer, cache_key) if cache else None
+    try:
+        if writer:
+            await asyncio.to_thread(writer.write, first_chunk)
+        yield first_chunk
+        try:
+            async for audio_chunk in chunks:
+                if writer:
+                    await asyncio.to_thread(writer.write, audio_chunk)
+                yield audio_chunk
+        except Exception as e:
+            # The response has already started, the client sees a truncated stream
+            logger.exception(f"Error occurred during podcast streaming: {str(e)}")
+            return
+        if writer:
+            await asyncio.to_thread(writer.commit)
+    finally:
+        if writer:
+            # Partial episodes are not cached
+            writer.discard()
+
+
 @app.post("/api/ppt/generate")
 async def generate_ppt(request: GeneratePPTRequest):
     try:
         report_content = request.content
         print(report_content)
-        workflow = build_ppt_graph()
-        final_state = workflow.invoke({"input": report_content})
-        generated_file_path = final_state["generated_file_path"]
-        with open(generated_file_path, "rb") as f:
-            ppt_bytes = f.read()
+        workflow = graph_registry.get("ppt")
+        with graph_registry.track("ppt"):
+            final_state = await workflow.ainvoke({"input": report_content})
         return Response(
-            content=ppt_bytes,
+            content=final_state["output"],
             media_type="application/vnd.openxmlformats-officedocument.presentationml.presentation",
         )
     except Exception as e:
@@ -292,18 +395,16 @@ async def generate_prose(request: GenerateProseRequest):
     try:
         sanitized_prompt = request.prompt.replace("\r\n", "").replace("\n", "")
         logger.info(f"Generating prose for prompt: {sanitized_prompt}")
-        workflow = build_prose_graph()
-        events = workflow.astream(
-            {
-                "content": request.prompt,
-                "option": request.option,
-                "command": request.command,
-            },
-            stream_mode="messages",
-            subgraphs=True,
-        )
+        workflow = graph_registry.get("prose")
         return StreamingResponse(
-            (f"data: {event[0].content}\n\n" async for _, event in events),
+            _astream_prose(
+                workflow,
+                {
+                    "content": request.prompt,
+                    "option": request.option,
+                    "command": request.command,
+                },
+            ),
             media_type="text/event-stream",
         )
     except Exception as e:
@@ -311,6 +412,14 @@ async def generate_prose(request: GenerateProseRequest):
         raise HTTPException(status_code=500, detail=INTERNAL_SERVER_ERROR_DETAIL)
 
 
+async def _astream_prose(workflow, input: dict):
+    with graph_registry.track("prose"):
+        async for _, event in workflow.astream(
+            input, stream_mode="messages", subgraphs=True
+        ):
+            yield f"data: {event[0].content}\n\n"
+
+
 @app.post("/api/prompt/enhance")
 async def enhance_prompt(request: EnhancePromptRequest):
     try:
@@ -341,14 +450,15 @@ async def enhance_prompt(request: EnhancePromptRequest):
         else:
             report_style = ReportStyle.ACADEMIC
 
-        workflow = build_prompt_enhancer_graph()
-        final_state = workflow.invoke(
-            {
-                "prompt": request.prompt,
-                "context": request.context,
-                "report_style": report_style,
-            }
-        )
+        workflow = graph_registry.get("prompt_enhancer")
+        with graph_registry.track("prompt_enhancer"):
+            final_state = workflow.invoke(
+                {
+                    "prompt": request.prompt,
+                    "context": request.context,
+                    "report_style": report_style,
+                }
+            )
         return {"result": final_state["output"]}
     except Exception as e:
         logger.exception(f"Error occurred during prompt enhancement: {str(e)}")
@@ -403,7 +513,8 @@ async def rag_resources(request: Annotated[RAGResourceRequest, Query()]):
     """Get the resources of the RAG."""
     retriever = build_retriever()
     if retriever:
-        return RAGResourcesResponse(resources=retriever.list_resources(request.query))
+        resources = await retriever.alist_resources(request.query)
+        return RAGResourcesResponse(resources=resources)
     return RAGResourcesResponse(resources=[])
 
 
@@ -65,6 +65,9 @@ class ChatRequest(BaseModel):
     enable_deep_thinking: Optional[bool] = Field(
         False, description="Whether to enable deep thinking"
     )
+    max_concurrent_steps: Optional[int] = Field(
+        1, description="The maximum number of research steps run at once"
+    )
 
 
 class TTSRequest(BaseModel):
@@ -85,6 +88,9 @@ class TTSRequest(BaseModel):
 
 class GeneratePodcastRequest(BaseModel):
     content: str = Field(..., description="The content of the podcast")
+    stream: Optional[bool] = Field(
+        False, description="Whether to stream the audio as each line is synthesized"
+    )
 
 
 class GeneratePPTRequest(BaseModel):
@@ -0,0 +1,102 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+"""
+Registry of compiled workflow graphs shared across requests.
+
+Compiled graphs without a checkpointer hold no per-run state, so each graph
+is compiled once, on first use or at startup, and reused by every request.
+"""
+
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, Callable, Iterator
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class GraphStats:
+    compile_seconds: float = 0.0
+    invocations: int = 0
+    errors: int = 0
+    total_invocation_seconds: float = 0.0
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "compile_seconds": self.compile_seconds,
+            "invocations": self.invocations,
+            "errors": self.errors,
+            "avg_invocation_seconds": (
+                self.total_invocation_seconds / self.invocations
+                if self.invocations
+                else 0.0
+            ),
+        }
+
+
+class GraphRegistry:
+    def __init__(self):
+        self._builders: dict[str, Callable[[], Any]] = {}
+        self._graphs: dict[str, Any] = {}
+        self._stats: dict[str, GraphStats] = {}
+        self._lock = threading.Lock()
+
+    def register(self, name: str, builder: Callable[[], Any]) -> None:
+        with self._lock:
+            self._builders[name] = builder
+            self._graphs.pop(name, None)
+            self._stats[name] = GraphStats()
+
+    def get(self, name: str) -> Any:
+        """Return the compiled graph, compiling it on first use."""
+        graph = self._graphs.get(name)
+        if graph is not None:
+            return graph
+        with self._lock:
+            if name not in self._graphs:
+                if name not in self._builders:
+                    raise KeyError(f"Unknown graph: {name}")
+                started_at = time.perf_counter()
+                self._graphs[name] = self._builders[name]()
+                elapsed = time.perf_counter() - started_at
+                self._stats[name].compile_seconds = elapsed
+                logger.info(f"Compiled graph '{name}' in {elapsed:.3f}s")
+            return self._graphs[name]
+
+    def warm_up(self) -> None:
+        """Compile all registered graphs ahead of the first request."""
+        for name in list(self._builders):
+            self.get(name)
+
+    def clear(self) -> None:
+        """Drop the compiled graphs, they are rebuilt on next use."""
+        with self._lock:
+            self._graphs.clear()
+            for name in self._stats:
+                self._stats[name] = GraphStats()
+
+    @contextmanager
+    def track(self, name: str) -> Iterator[None]:
+        """Record the duration and outcome of one invocation of a graph."""
+        started_at = time.perf_counter()
+        try:
+            yield
+        except Exception:
+            # Cancellations and closed generators (e.g. a client that
+            # disconnected from a stream) are not errors
+            with self._lock:
+                self._stats[name].errors += 1
+            raise
+        finally:
+            elapsed = time.perf_counter() - started_at
+            with self._lock:
+                self._stats[name].invocations += 1
+                self._stats[name].total_invocation_seconds += elapsed
+
+    def stats(self) -> dict[str, dict[str, Any]]:
+        with self._lock:
+            return {name: stats.to_dict() for name, stats in self._stats.items()}
@@ -0,0 +1,290 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+"""
+Process-wide pool of MCP client connections.
+
+Opening a MultiServerMCPClient spawns the server process (for stdio servers)
+and lists its tools, which takes seconds. The pool keeps connections warm and
+hands them out to agent steps, keyed by the normalized server configuration.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import threading
+import time
+import weakref
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator
+
+from langchain_core.tools import BaseTool
+from langchain_mcp_adapters.client import MultiServerMCPClient
+
+logger = logging.getLogger(__name__)
+
+# Keys of an MCP server config that define the connection itself
+CONNECTION_KEYS = ("transport", "command", "args", "url", "env")
+
+
+def normalize_server_config(server_config: dict[str, Any]) -> str:
+    """Return a stable key for the connection part of an MCP server config."""
+    normalized = {
+        k: server_config[k] for k in CONNECTION_KEYS if server_config.get(k) is not None
+    }
+    normalized.setdefault("transport", "stdio")
+    return json.dumps(normalized, sort_keys=True, default=str)
+
+
+class _PooledConnection:
+    """
+    A single MCP connection owned by a background task.
+
+    The MCP transports use anyio cancel scopes, which must be exited by the
+    task that entered them, so every connection lives in its own task and is
+    closed by signalling that task.
+    """
+
+    def __init__(self, key: str, server_name: str, connection: dict[str, Any]):
+        self.key = key
+        self.server_name = server_name
+        self.connection = connection
+        self.client: MultiServerMCPClient | None = None
+        self.last_used = time.monotonic()
+        self._ready: asyncio.Future = asyncio.get_running_loop().create_future()
+        self._closing = asyncio.Event()
+        self._task: asyncio.Task | None = None
+
+    async def open(self, timeout: float) -> None:
+        self._task = asyncio.create_task(self._run())
+        try:
+            await asyncio.wait_for(asyncio.shield(self._ready), timeout)
+        except BaseException:
+            await self.close()
+            raise
+
+    async def _run(self) -> None:
+        try:
+            async with MultiServerMCPClient(
+                {self.server_name: self.connection}
+            ) as client:
+                self.client = client
+                self._ready.set_result(client)
+                await self._closing.wait()
+        except Exception as e:
+            if not self._ready.done():
+                self._ready.set_exception(e)
+            else:
+                logger.warning(f"MCP connection to '{self.server_name}' failed: {e}")
+        finally:
+            self.client = None
+            if not self._ready.done():
+                self._ready.cancel()
+
+    def get_tools(self) -> list[BaseTool]:
+        return self.client.get_tools() if self.client else []
+
+    async def is_healthy(self, timeout: float) -> bool:
+        """Check that the connection is still open and the server answers pings."""
+        if self.client is None or self._task is None or self._task.done():
+            return False
+        session = getattr(self.client, "sessions", {}).get(self.server_name)
+        if session is None:
+            return True
+        try:
+            await asyncio.wait_for(session.send_ping(), timeout)
+            return True
+        except Exception as e:
+            logger.warning(f"MCP server '{self.server_name}' failed health check: {e}")
+            return False
+
+    async def close(self) -> None:
+        self._closing.set()
+        if self._task:
+            try:
+                await self._task
+            except BaseException as e:
+                logger.debug(f"Error closing MCP connection '{self.server_name}': {e}")
+
+
+class MCPClientPool:
+    """
+    Pool of warm MCP connections for the running event loop.
+
+    Connections are leased exclusively. At most `max_clients_per_server`
+    connections are opened for one server config; further callers wait for a
+    connection to be released. Idle connections are health checked before
+    they are reused and closed after `idle_timeout` seconds.
+    """
+
+    def __init__(
+        self,
+        max_clients_per_server: int = 4,
+        idle_timeout: float = 300.0,
+        connect_timeout: float = 60.0,
+        health_check_timeout: float = 5.0,
+    ):
+        self.max_clients_per_server = max(1, max_clients_per_server)
+        self.idle_timeout = idle_timeout
+        self.connect_timeout = connect_timeout
+        self.health_check_timeout = health_check_timeout
+        self._idle: dict[str, list[_PooledConnection]] = {}
+        self._sizes: dict[str, int] = {}
+        self._condition = asyncio.Condition()
+        self._reap_handle: asyncio.TimerHandle | None = None
+        self._closed = False
+
+    @asynccontextmanager
+    async def session(
+        self, server_name: str, server_config: dict[str, Any]
+    ) -> AsyncIterator[list[BaseTool]]:
+        """Lease a connection to an MCP server and yield its tools."""
+        conn = await self._acquire(server_name, server_config)
+        try:
+            yield conn.get_tools()
+        finally:
+            await self._release(conn)
+
+    def stats(self) -> dict[str, dict[str, int]]:
+        """Return the number of open and idle connections per server config."""
+        return {
+            key: {"open": size, "idle": len(self._idle.get(key, []))}
+            for key, size in self._sizes.items()
+        }
+
+    async def _acquire(
+        self, server_name: str, server_config: dict[str, Any]
+    ) -> _PooledConnection:
+        if self._closed:
+            raise RuntimeError("MCP client pool is closed")
+        key = normalize_server_config(server_config)
+        while True:
+            conn = None
+            async with self._condition:
+                idle = self._idle.setdefault(key, [])
+                if idle:
+                    # Prefer the most recently used connection
+                    conn = idle.pop()
+                elif self._sizes.get(key, 0) < self.max_clients_per_server:
+                    self._sizes[key] = self._sizes.get(key, 0) + 1
+                else:
+                    await self._condition.wait()
+                    continue
+
+            if conn is None:
+                return await self._open(key, server_name, server_config)
+            if await conn.is_healthy(self.health_check_timeout):
+                return conn
+            logger.info(f"Evicting unhealthy MCP connection to '{conn.server_name}'")
+            await self._discard(conn)
+
+    async def _open(
+        self, key: str, server_name: str, server_config: dict[str, Any]
+    ) -> _PooledConnection:
+        connection = {
+            k: server_config[k] for k in CONNECTION_KEYS if k in server_config
+        }
+        conn = _PooledConnection(key, server_name, connection)
+        started_at = time.perf_counter()
+        try:
+            await conn.open(self.connect_timeout)
+        except BaseException:
+            async with self._condition:
+                self._sizes[key] -= 1
+                self._condition.notify_all()
+            raise
+        logger.info(
+            f"Opened MCP connection to '{server_name}' in "
+            f"{time.perf_counter() - started_at:.2f}s"
+        )
+        return conn
+
+    async def _release(self, conn: _PooledConnection) -> None:
+        if self._closed:
+            await self._discard(conn)
+            return
+        conn.last_used = time.monotonic()
+        async with self._condition:
+            self._idle.setdefault(conn.key, []).append(conn)
+            self._condition.notify()
+        self._schedule_reap()
+
+    async def _discard(self, conn: _PooledConnection) -> None:
+        await conn.close()
+        async with self._condition:
+            self._sizes[conn.key] -= 1
+            if not self._sizes[conn.key]:
+                del self._sizes[conn.key]
+            self._condition.notify_all()
+
+    def _schedule_reap(self) -> None:
+        if self._reap_handle is None and self.idle_timeout > 0:
+            loop = asyncio.get_running_loop()
+            self._reap_handle = loop.call_later(
+                self.idle_timeout, lambda: loop.create_task(self.evict_idle())
+            )
+
+    async def evict_idle(self) -> int:
+        """Close connections idle for longer than `idle_timeout`."""
+        self._reap_handle = None
+        now = time.monotonic()
+        expired: list[_PooledConnection] = []
+        async with self._condition:
+            for key, idle in self._idle.items():
+                expired += [c for c in idle if now - c.last_used >= self.idle_timeout]
+                idle[:] = [c for c in idle if now - c.last_used < self.idle_timeout]
+        for conn in expired:
+            logger.info(f"Closing idle MCP connection to '{conn.server_name}'")
+            await self._discard(conn)
+        if any(self._idle.values()):
+            self._schedule_reap()
+        return len(expired)
+
+    async def close(self) -> None:
+        """Close all idle connections; leased ones are closed on release."""
+        self._closed = True
+        if self._reap_handle:
+            self._reap_handle.cancel()
+            self._reap_handle = None
+        async with self._condition:
+            idle = [c for conns in self._idle.values() for c in conns]
+            self._idle.clear()
+        for conn in idle:
+            await self._discard(conn)
+
+
+_pools: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, MCPClientPool]" = (
+    weakref.WeakKeyDictionary()
+)
+_pools_lock = threading.Lock()
+
+
+def get_mcp_client_pool() -> MCPClientPool:
+    """
+    Get the MCP client pool of the running event loop.
+
+    MCP sessions are bound to the event loop that opened them, so every loop
+    (e.g. every worker thread running its own loop) gets its own pool.
+    """
+    loop = asyncio.get_running_loop()
+    with _pools_lock:
+        pool = _pools.get(loop)
+        if pool is None:
+            pool = MCPClientPool(
+                max_clients_per_server=int(
+                    os.getenv("MCP_POOL_MAX_CLIENTS_PER_SERVER", "4")
+                ),
+                idle_timeout=float(os.getenv("MCP_POOL_IDLE_TIMEOUT", "300")),
+            )
+            _pools[loop] = pool
+    return pool
+
+
+async def close_mcp_client_pool() -> None:
+    """Close the MCP client pool of the running event loop, if any."""
+    loop = asyncio.get_running_loop()
+    with _pools_lock:
+        pool = _pools.pop(loop, None)
+    if pool:
+        await pool.close()
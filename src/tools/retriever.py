@@ -12,6 +12,7 @@ from pydantic import BaseModel, Field
 
 from src.config.tools import SELECTED_RAG_PROVIDER
 from src.rag import Document, Retriever, Resource, build_retriever
+from src.rag.retriever import documents_to_json
 
 logger = logging.getLogger(__name__)
 
@@ -34,21 +35,32 @@ class RetrieverTool(BaseTool):
         self,
         keywords: str,
         run_manager: Optional[CallbackManagerForToolRun] = None,
-    ) -> list[Document]:
+    ) -> str:
         logger.info(
             f"Retriever tool query: {keywords}", extra={"resources": self.resources}
         )
         documents = self.retriever.query_relevant_documents(keywords, self.resources)
-        if not documents:
-            return "No results found from the local knowledge base."
-        return [doc.to_dict() for doc in documents]
+        return self._format_documents(documents)
 
     async def _arun(
         self,
         keywords: str,
         run_manager: Optional[AsyncCallbackManagerForToolRun] = None,
-    ) -> list[Document]:
-        return self._run(keywords, run_manager.get_sync())
+    ) -> str:
+        logger.info(
+            f"Retriever tool query: {keywords}", extra={"resources": self.resources}
+        )
+        documents = await self.retriever.aquery_relevant_documents(
+            keywords, self.resources
+        )
+        return self._format_documents(documents)
+
+    @staticmethod
+    def _format_documents(documents: list[Document]) -> str:
+        if not documents:
+            return "No results found from the local knowledge base."
+        # Serialized here, as the tool message would, in a single pass
+        return documents_to_json(documents)
 
 
 def get_retriever_tool(resources: List[Resource]) -> RetrieverTool | None:
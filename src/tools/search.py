@@ -15,14 +15,45 @@ from src.tools.tavily_search.tavily_search_results_with_images import (
 )
 
 from src.tools.decorators import create_logged_tool
+from src.tools.search_cache import create_cached_tool
 
 logger = logging.getLogger(__name__)
 
-# Create logged versions of the search tools
-LoggedTavilySearch = create_logged_tool(TavilySearchResultsWithImages)
-LoggedDuckDuckGoSearch = create_logged_tool(DuckDuckGoSearchResults)
-LoggedBraveSearch = create_logged_tool(BraveSearch)
-LoggedArxivSearch = create_logged_tool(ArxivQueryRun)
+# Create logged and cached versions of the search tools, keyed by the
+# parameters that change their results
+LoggedTavilySearch = create_logged_tool(
+    create_cached_tool(
+        TavilySearchResultsWithImages,
+        [
+            "max_results",
+            "search_depth",
+            "include_domains",
+            "exclude_domains",
+            "include_answer",
+            "include_raw_content",
+            "include_images",
+            "include_image_descriptions",
+        ],
+    )
+)
+LoggedDuckDuckGoSearch = create_logged_tool(
+    create_cached_tool(
+        DuckDuckGoSearchResults, ["max_results", "backend", "output_format"]
+    )
+)
+LoggedBraveSearch = create_logged_tool(
+    create_cached_tool(BraveSearch, ["search_wrapper.search_kwargs"])
+)
+LoggedArxivSearch = create_logged_tool(
+    create_cached_tool(
+        ArxivQueryRun,
+        [
+            "api_wrapper.top_k_results",
+            "api_wrapper.load_max_docs",
+            "api_wrapper.load_all_available_meta",
+        ],
+    )
+)
 
 
 # Get the selected search tool
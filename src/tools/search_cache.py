@@ -0,0 +1,255 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+"""
+Result cache for the web search tools.
+
+Results are keyed by the search engine, the normalized query and the tool
+parameters that change the results (number of results, domains, images...).
+"""
+
+import copy
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, ClassVar, Optional, Sequence, Type, TypeVar
+
+from langchain_core.runnables.config import run_in_executor
+from langchain_core.tools import BaseTool
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+def normalize_query(query: str) -> str:
+    return " ".join(query.lower().split())
+
+
+class SearchCache:
+    """
+    Thread-safe LRU cache of search results with an optional SQLite tier.
+
+    Entries expire `ttl` seconds after they were stored. The SQLite tier
+    (enabled by passing `sqlite_path`) keeps results across restarts.
+    """
+
+    def __init__(
+        self,
+        ttl: float = 3600.0,
+        max_entries: int = 1024,
+        sqlite_path: Optional[str] = None,
+    ):
+        self.ttl = ttl
+        self.max_entries = max(1, max_entries)
+        self._entries: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+        self._lock = threading.RLock()
+        self._stats = {"memory_hits": 0, "sqlite_hits": 0, "misses": 0, "puts": 0}
+        self._conn: Optional[sqlite3.Connection] = None
+        if sqlite_path:
+            self._conn = sqlite3.connect(sqlite_path, check_same_thread=False)
+            with self._conn:
+                self._conn.execute(
+                    "CREATE TABLE IF NOT EXISTS search_cache "
+                    "(key TEXT PRIMARY KEY, value TEXT NOT NULL, created_at REAL NOT NULL)"
+                )
+
+    @staticmethod
+    def make_key(engine: str, query: str, params: dict[str, Any]) -> str:
+        raw = json.dumps(
+            [engine, normalize_query(query), params], sort_keys=True, default=str
+        )
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return a copy of the cached result, or None if missing or expired."""
+        now = time.time()
+        with self._lock:
+            item = self._entries.get(key)
+            if item is not None:
+                created_at, value = item
+                if self._is_fresh(created_at, now):
+                    self._entries.move_to_end(key)
+                    self._stats["memory_hits"] += 1
+                    return copy.deepcopy(value)
+                del self._entries[key]
+
+            if self._conn is not None:
+                row = self._conn.execute(
+                    "SELECT value, created_at FROM search_cache WHERE key = ?", (key,)
+                ).fetchone()
+                if row and self._is_fresh(row[1], now):
+                    value = self._loads(row[0])
+                    self._store_memory(key, row[1], value)
+                    self._stats["sqlite_hits"] += 1
+                    return copy.deepcopy(value)
+
+            self._stats["misses"] += 1
+            return None
+
+    def put(self, key: str, value: Any) -> None:
+        now = time.time()
+        with self._lock:
+            self._store_memory(key, now, copy.deepcopy(value))
+            self._stats["puts"] += 1
+            if self._conn is not None:
+                with self._conn:
+                    self._conn.execute(
+                        "INSERT OR REPLACE INTO search_cache (key, value, created_at) "
+                        "VALUES (?, ?, ?)",
+                        (key, self._dumps(value), now),
+                    )
+                    # Drop expired rows from time to time
+                    if self.ttl > 0 and self._stats["puts"] % 100 == 0:
+                        self._conn.execute(
+                            "DELETE FROM search_cache WHERE created_at < ?",
+                            (now - self.ttl,),
+                        )
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            if self._conn is not None:
+                with self._conn:
+                    self._conn.execute("DELETE FROM search_cache")
+
+    def stats(self) -> dict[str, int]:
+        """Return hit/miss counters and the number of entries in memory."""
+        with self._lock:
+            return {
+                **self._stats,
+                "hits": self._stats["memory_hits"] + self._stats["sqlite_hits"],
+                "memory_entries": len(self._entries),
+            }
+
+    def _is_fresh(self, created_at: float, now: float) -> bool:
+        return self.ttl <= 0 or now - created_at < self.ttl
+
+    def _store_memory(self, key: str, created_at: float, value: Any) -> None:
+        self._entries[key] = (created_at, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    # Tools with an artifact return a (content, artifact) tuple, which has to
+    # come back as a tuple from the SQLite tier
+
+    @staticmethod
+    def _dumps(value: Any) -> str:
+        return json.dumps(
+            {"tuple": isinstance(value, tuple), "value": value},
+            ensure_ascii=False,
+            default=str,
+        )
+
+    @staticmethod
+    def _loads(data: str) -> Any:
+        item = json.loads(data)
+        return tuple(item["value"]) if item["tuple"] else item["value"]
+
+
+_search_cache: Optional[SearchCache] = None
+_search_cache_lock = threading.Lock()
+
+
+def get_search_cache() -> Optional[SearchCache]:
+    """
+    Get the process-wide search cache, or None if search caching is disabled.
+
+    Configured by the SEARCH_CACHE_* environment variables.
+    """
+    global _search_cache
+    if os.getenv("SEARCH_CACHE_ENABLED", "false").lower() not in ("true", "1", "yes"):
+        return None
+    with _search_cache_lock:
+        if _search_cache is None:
+            _search_cache = SearchCache(
+                ttl=float(os.getenv("SEARCH_CACHE_TTL", "3600")),
+                max_entries=int(os.getenv("SEARCH_CACHE_MAX_ENTRIES", "1024")),
+                sqlite_path=os.getenv("SEARCH_CACHE_SQLITE_PATH") or None,
+            )
+        return _search_cache
+
+
+class CachedSearchToolMixin:
+    """A mixin class that serves repeated searches from the search cache."""
+
+    # Tool attributes that change the results, dotted paths are allowed
+    cache_key_fields: ClassVar[Sequence[str]] = ()
+
+    def _cache_key(self, args: tuple, kwargs: dict) -> Optional[str]:
+        query = kwargs.get("query", args[0] if args else None)
+        if not isinstance(query, str):
+            return None
+        params = {}
+        for field in self.cache_key_fields:
+            value = self
+            for attr in field.split("."):
+                value = getattr(value, attr, None)
+            params[field] = value
+        engine = self.__class__.__name__.replace("Logged", "").replace("Cached", "")
+        return SearchCache.make_key(engine, query, params)
+
+    @staticmethod
+    def _is_cacheable(result: Any) -> bool:
+        # Some tools report failures as a (message, {}) tuple instead of raising
+        if isinstance(result, tuple) and len(result) == 2:
+            return not (isinstance(result[0], str) and not result[1])
+        return bool(result)
+
+    def _run(self, *args: Any, **kwargs: Any) -> Any:
+        cache = get_search_cache()
+        key = self._cache_key(args, kwargs) if cache else None
+        if key is None:
+            return super()._run(*args, **kwargs)
+        if (result := cache.get(key)) is not None:
+            logger.debug(f"Search cache hit for {args or kwargs}")
+            return result
+        result = super()._run(*args, **kwargs)
+        if self._is_cacheable(result):
+            cache.put(key, result)
+        return result
+
+    async def _arun(self, *args: Any, **kwargs: Any) -> Any:
+        if getattr(super()._arun, "__func__", None) is BaseTool._arun:
+            # The tool has no async implementation, `_run` does the caching
+            return await run_in_executor(None, self._run, *args, **kwargs)
+        cache = get_search_cache()
+        key = self._cache_key(args, kwargs) if cache else None
+        if key is None:
+            return await super()._arun(*args, **kwargs)
+        if (result := cache.get(key)) is not None:
+            logger.debug(f"Search cache hit for {args or kwargs}")
+            return result
+        result = await super()._arun(*args, **kwargs)
+        if self._is_cacheable(result):
+            cache.put(key, result)
+        return result
+
+
+def create_cached_tool(
+    base_tool_class: Type[T], cache_key_fields: Sequence[str]
+) -> Type[T]:
+    """
+    Factory function to create a cached version of a search tool class.
+
+    Args:
+        base_tool_class: The original search tool class
+        cache_key_fields: Tool attributes that are part of the cache key
+
+    Returns:
+        A new class that inherits from both CachedSearchToolMixin and the base tool class
+    """
+
+    key_fields = tuple(cache_key_fields)
+
+    class CachedTool(CachedSearchToolMixin, base_tool_class):
+        cache_key_fields: ClassVar[Sequence[str]] = key_fields
+
+    CachedTool.__name__ = f"Cached{base_tool_class.__name__}"
+    return CachedTool
@@ -2,16 +2,102 @@
 # Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
 # SPDX-License-Identifier: MIT
 
+import asyncio
 import json
+import logging
+import os
+import threading
+import weakref
 from typing import Dict, List, Optional
 
 import aiohttp
-import requests
 from langchain_community.utilities.tavily_search import TAVILY_API_URL
 from langchain_community.utilities.tavily_search import (
     TavilySearchAPIWrapper as OriginalTavilySearchAPIWrapper,
 )
 
+from src.utils import http_client
+
+logger = logging.getLogger(__name__)
+
+
+class _AsyncTavilyClient:
+    """
+    Long-lived aiohttp session for the Tavily API, bound to one event loop.
+
+    Identical searches that are in flight at the same time share a single
+    upstream request.
+    """
+
+    def __init__(self):
+        self.session: Optional[aiohttp.ClientSession] = None
+        self.inflight: Dict[str, asyncio.Future] = {}
+
+    async def search(self, params: Dict) -> Dict:
+        key = json.dumps(params, sort_keys=True)
+        future = self.inflight.get(key)
+        if future is None:
+            future = asyncio.ensure_future(self._post(params))
+            self.inflight[key] = future
+            future.add_done_callback(lambda _: self.inflight.pop(key, None))
+        else:
+            logger.debug(f"Joining in-flight Tavily search: {params['query']}")
+        # Shielded so that one cancelled caller doesn't fail the others, and
+        # parsed per caller so that nobody shares a mutable result
+        return json.loads(await asyncio.shield(future))
+
+    async def _post(self, params: Dict) -> str:
+        async with self._get_session().post(
+            f"{TAVILY_API_URL}/search", json=params
+        ) as res:
+            if res.status == 200:
+                data = await res.text()
+                return data
+            else:
+                raise Exception(f"Error {res.status}: {res.reason}")
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        if self.session is None or self.session.closed:
+            self.session = aiohttp.ClientSession(
+                trust_env=True,
+                connector=aiohttp.TCPConnector(
+                    limit_per_host=http_client.HTTP_MAX_CONNECTIONS_PER_HOST,
+                    ttl_dns_cache=300,
+                ),
+                timeout=aiohttp.ClientTimeout(total=http_client.HTTP_TIMEOUT),
+            )
+        return self.session
+
+    async def close(self) -> None:
+        if self.session is not None:
+            await self.session.close()
+            self.session = None
+
+
+_async_clients: (
+    "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, _AsyncTavilyClient]"
+) = weakref.WeakKeyDictionary()
+_async_clients_lock = threading.Lock()
+
+
+def _get_async_client() -> _AsyncTavilyClient:
+    loop = asyncio.get_running_loop()
+    with _async_clients_lock:
+        client = _async_clients.get(loop)
+        if client is None:
+            client = _AsyncTavilyClient()
+            _async_clients[loop] = client
+    return client
+
+
+async def close_tavily_client() -> None:
+    """Close the Tavily session of the running event loop, if any."""
+    loop = asyncio.get_running_loop()
+    with _async_clients_lock:
+        client = _async_clients.pop(loop, None)
+    if client:
+        await client.close()
+
 
 class EnhancedTavilySearchAPIWrapper(OriginalTavilySearchAPIWrapper):
     def raw_results(
@@ -38,7 +124,7 @@ class EnhancedTavilySearchAPIWrapper(OriginalTavilySearchAPIWrapper):
             "include_images": include_images,
             "include_image_descriptions": include_image_descriptions,
         }
-        response = requests.post(
+        response = http_client.post(
             # type: ignore
             f"{TAVILY_API_URL}/search",
             json=params,
@@ -59,31 +145,19 @@ class EnhancedTavilySearchAPIWrapper(OriginalTavilySearchAPIWrapper):
         include_image_descriptions: Optional[bool] = False,
     ) -> Dict:
         """Get results from the Tavily Search API asynchronously."""
-
-        # Function to perform the API call
-        async def fetch() -> str:
-            params = {
-                "api_key": self.tavily_api_key.get_secret_value(),
-                "query": query,
-                "max_results": max_results,
-                "search_depth": search_depth,
-                "include_domains": include_domains,
-                "exclude_domains": exclude_domains,
-                "include_answer": include_answer,
-                "include_raw_content": include_raw_content,
-                "include_images": include_images,
-                "include_image_descriptions": include_image_descriptions,
-            }
-            async with aiohttp.ClientSession(trust_env=True) as session:
-                async with session.post(f"{TAVILY_API_URL}/search", json=params) as res:
-                    if res.status == 200:
-                        data = await res.text()
-                        return data
-                    else:
-                        raise Exception(f"Error {res.status}: {res.reason}")
-
-        results_json_str = await fetch()
-        return json.loads(results_json_str)
+        params = {
+            "api_key": self.tavily_api_key.get_secret_value(),
+            "query": query,
+            "max_results": max_results,
+            "search_depth": search_depth,
+            "include_domains": include_domains,
+            "exclude_domains": exclude_domains,
+            "include_answer": include_answer,
+            "include_raw_content": include_raw_content,
+            "include_images": include_images,
+            "include_image_descriptions": include_image_descriptions,
+        }
+        return await _get_async_client().search(params)
 
     def clean_results_with_images(
         self, raw_results: Dict[str, List[Dict]]
@@ -8,9 +8,10 @@ Text-to-Speech module using volcengine TTS API.
 import json
 import uuid
 import logging
-import requests
 from typing import Optional, Dict, Any
 
+from src.utils import http_client
+
 logger = logging.getLogger(__name__)
 
 
@@ -74,10 +75,88 @@ class VolcengineTTS:
         Returns:
             Dictionary containing the API response and base64-encoded audio data
         """
+        request_json = self._build_request(
+            text,
+            encoding,
+            speed_ratio,
+            volume_ratio,
+            pitch_ratio,
+            text_type,
+            with_frontend,
+            frontend_type,
+            uid,
+        )
+        try:
+            self._log_request(text)
+            response = http_client.post(
+                self.api_url, json.dumps(request_json), headers=self.header
+            )
+            return self._parse_response(response)
+
+        except Exception as e:
+            logger.exception(f"Error in TTS API call: {str(e)}")
+            return {"success": False, "error": "TTS API call error", "audio_data": None}
+
+    async def atext_to_speech(
+        self,
+        text: str,
+        encoding: str = "mp3",
+        speed_ratio: float = 1.0,
+        volume_ratio: float = 1.0,
+        pitch_ratio: float = 1.0,
+        text_type: str = "plain",
+        with_frontend: int = 1,
+        frontend_type: str = "unitTson",
+        uid: Optional[str] = None,
+        max_retries: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        """
+        Async version of `text_to_speech`, using the pooled async HTTP client.
+
+        `max_retries` overrides the HTTP retries, e.g. 0 for callers that
+        retry failed syntheses themselves.
+        """
+        request_json = self._build_request(
+            text,
+            encoding,
+            speed_ratio,
+            volume_ratio,
+            pitch_ratio,
+            text_type,
+            with_frontend,
+            frontend_type,
+            uid,
+        )
+        try:
+            self._log_request(text)
+            response = await http_client.apost(
+                self.api_url,
+                json.dumps(request_json),
+                headers=self.header,
+                max_retries=max_retries,
+            )
+            return self._parse_response(response)
+
+        except Exception as e:
+            logger.exception(f"Error in TTS API call: {str(e)}")
+            return {"success": False, "error": "TTS API call error", "audio_data": None}
+
+    def _build_request(
+        self,
+        text: str,
+        encoding: str,
+        speed_ratio: float,
+        volume_ratio: float,
+        pitch_ratio: float,
+        text_type: str,
+        with_frontend: int,
+        frontend_type: str,
+        uid: Optional[str],
+    ) -> Dict[str, Any]:
         if not uid:
             uid = str(uuid.uuid4())
 
-        request_json = {
+        return {
             "app": {
                 "appid": self.appid,
                 "token": self.access_token,
@@ -101,32 +180,27 @@ class VolcengineTTS:
             },
         }
 
-        try:
-            sanitized_text = text.replace("\r\n", "").replace("\n", "")
-            logger.debug(f"Sending TTS request for text: {sanitized_text[:50]}...")
-            response = requests.post(
-                self.api_url, json.dumps(request_json), headers=self.header
-            )
-            response_json = response.json()
+    def _log_request(self, text: str) -> None:
+        sanitized_text = text.replace("\r\n", "").replace("\n", "")
+        logger.debug(f"Sending TTS request for text: {sanitized_text[:50]}...")
 
-            if response.status_code != 200:
-                logger.error(f"TTS API error: {response_json}")
-                return {"success": False, "error": response_json, "audio_data": None}
+    def _parse_response(self, response) -> Dict[str, Any]:
+        response_json = response.json()
 
-            if "data" not in response_json:
-                logger.error(f"TTS API returned no data: {response_json}")
-                return {
-                    "success": False,
-                    "error": "No audio data returned",
-                    "audio_data": None,
-                }
+        if response.status_code != 200:
+            logger.error(f"TTS API error: {response_json}")
+            return {"success": False, "error": response_json, "audio_data": None}
 
+        if "data" not in response_json:
+            logger.error(f"TTS API returned no data: {response_json}")
             return {
-                "success": True,
-                "response": response_json,
-                "audio_data": response_json["data"],  # Base64 encoded audio data
+                "success": False,
+                "error": "No audio data returned",
+                "audio_data": None,
             }
 
-        except Exception as e:
-            logger.exception(f"Error in TTS API call: {str(e)}")
-            return {"success": False, "error": "TTS API call error", "audio_data": None}
+        return {
+            "success": True,
+            "response": response_json,
+            "audio_data": response_json["data"],  # Base64 encoded audio data
+        }
@@ -0,0 +1,211 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+"""
+Disk cache of synthesized speech.
+
+Audio is stored decoded, one file per entry, named after the hash of the
+text and every parameter that changes the audio. An in-memory index of the
+files is kept in least recently used order to enforce the size cap.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+
+def tts_cache_key(
+    text: str,
+    voice_type: str,
+    encoding: str = "mp3",
+    speed_ratio: float = 1.0,
+    volume_ratio: float = 1.0,
+    pitch_ratio: float = 1.0,
+    text_type: str = "plain",
+) -> str:
+    raw = json.dumps(
+        [
+            text,
+            voice_type,
+            encoding,
+            float(speed_ratio),
+            float(volume_ratio),
+            float(pitch_ratio),
+            text_type,
+        ],
+        ensure_ascii=False,
+    )
+    return f"{hashlib.sha256(raw.encode('utf-8')).hexdigest()}.{encoding}"
+
+
+class TTSCache:
+    """
+    Thread-safe, size-capped disk cache of audio bytes.
+
+    When the files exceed `max_bytes`, the least recently used ones are
+    deleted.
+    """
+
+    def __init__(self, cache_dir: str, max_bytes: int = 256 * 1024 * 1024):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self._index: OrderedDict[str, int] = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "evictions": 0}
+        os.makedirs(cache_dir, exist_ok=True)
+        files = []
+        with os.scandir(cache_dir) as it:
+            for f in it:
+                if f.is_file() and not f.name.endswith(".tmp"):
+                    stat = f.stat()
+                    files.append((stat.st_mtime, f.name, stat.st_size))
+        for _, name, size in sorted(files):
+            self._index[name] = size
+            self._size += size
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            if key not in self._index:
+                self._stats["misses"] += 1
+                return None
+            self._index.move_to_end(key)
+        try:
+            with open(os.path.join(self.cache_dir, key), "rb") as f:
+                audio = f.read()
+        except OSError:
+            with self._lock:
+                self._forget(key)
+                self._stats["misses"] += 1
+            return None
+        with self._lock:
+            self._stats["hits"] += 1
+        return audio
+
+    def put(self, key: str, audio: bytes) -> None:
+        writer = self.open_writer(key)
+        writer.write(audio)
+        writer.commit()
+
+    async def aget(self, key: str) -> Optional[bytes]:
+        """Async version of `get`, the file is read in a worker thread."""
+        return await asyncio.to_thread(self.get, key)
+
+    async def aput(self, key: str, audio: bytes) -> None:
+        """Async version of `put`, the file is written in a worker thread."""
+        await asyncio.to_thread(self.put, key, audio)
+
+    def open_writer(self, key: str) -> "TTSCacheWriter":
+        """Write an entry incrementally, e.g. audio that is being streamed."""
+        return TTSCacheWriter(self, key)
+
+    def _store(self, key: str, tmp_path: str, size: int) -> None:
+        with self._lock:
+            os.replace(tmp_path, os.path.join(self.cache_dir, key))
+            self._forget(key)
+            self._index[key] = size
+            self._size += size
+            while self._size > self.max_bytes and len(self._index) > 1:
+                old_key, _ = next(iter(self._index.items()))
+                self._remove(old_key)
+                self._stats["evictions"] += 1
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {**self._stats, "entries": len(self._index), "bytes": self._size}
+
+    def _forget(self, key: str) -> None:
+        size = self._index.pop(key, None)
+        if size is not None:
+            self._size -= size
+
+    def _remove(self, key: str) -> None:
+        self._forget(key)
+        try:
+            os.remove(os.path.join(self.cache_dir, key))
+        except FileNotFoundError:
+            pass
+
+
+class TTSCacheWriter:
+    """
+    An entry of a TTSCache written in parts.
+
+    The parts go to a temporary file, which becomes the entry on commit().
+    Nothing is stored if the writer is discarded or a write fails.
+    """
+
+    def __init__(self, cache: TTSCache, key: str):
+        self.cache = cache
+        self.key = key
+        self._size = 0
+        self._file = None
+        self._tmp_path = None
+        try:
+            fd, self._tmp_path = tempfile.mkstemp(dir=cache.cache_dir, suffix=".tmp")
+            self._file = os.fdopen(fd, "wb")
+        except OSError as e:
+            logger.warning(f"Failed to open TTS cache file for {key}: {e}")
+
+    def write(self, audio: bytes) -> None:
+        if self._file is None:
+            return
+        try:
+            self._file.write(audio)
+            self._size += len(audio)
+        except OSError as e:
+            logger.warning(f"Failed to write TTS cache file for {self.key}: {e}")
+            self.discard()
+
+    def commit(self) -> None:
+        if self._file is None:
+            return
+        try:
+            self._file.close()
+            self._file = None
+            self.cache._store(self.key, self._tmp_path, self._size)
+            self._tmp_path = None
+        except OSError as e:
+            logger.warning(f"Failed to write TTS cache file for {self.key}: {e}")
+            self.discard()
+
+    def discard(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        if self._tmp_path is not None:
+            try:
+                os.remove(self._tmp_path)
+            except FileNotFoundError:
+                pass
+            self._tmp_path = None
+
+
+_tts_cache: Optional[TTSCache] = None
+_tts_cache_lock = threading.Lock()
+
+
+def get_tts_cache() -> Optional[TTSCache]:
+    """
+    Get the process-wide TTS cache, or None if TTS caching is disabled.
+
+    Configured by the TTS_CACHE_* environment variables.
+    """
+    global _tts_cache
+    if os.getenv("TTS_CACHE_ENABLED", "false").lower() not in ("true", "1", "yes"):
+        return None
+    with _tts_cache_lock:
+        if _tts_cache is None:
+            _tts_cache = TTSCache(
+                cache_dir=os.getenv("TTS_CACHE_DIR", ".cache/tts"),
+                max_bytes=int(os.getenv("TTS_CACHE_MAX_MB", "256")) * 1024 * 1024,
+            )
+        return _tts_cache
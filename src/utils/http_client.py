@@ -0,0 +1,242 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+"""
+Shared HTTP clients for calls to external services.
+
+The sync client is a process-wide `requests.Session` and the async client is
+an `httpx.AsyncClient` per event loop. Both keep connections alive, cap the
+connections per host, apply a default timeout and retry transient failures
+(connection errors and 429/502/503/504 responses) with exponential backoff.
+
+Only idempotent requests are retried after they may have reached the server.
+A POST can run twice (e.g. a paid TTS synthesis) if it is sent again after a
+read timeout or a 5xx, so it is only retried when it was never sent (connect
+errors) or was rejected with a 429 and a Retry-After header.
+"""
+
+import asyncio
+import logging
+import os
+import random
+import threading
+import weakref
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Any, Optional
+from urllib.parse import urlsplit
+
+import httpx
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+logger = logging.getLogger(__name__)
+
+HTTP_TIMEOUT = float(os.getenv("HTTP_TIMEOUT", "60"))
+HTTP_MAX_CONNECTIONS_PER_HOST = int(os.getenv("HTTP_MAX_CONNECTIONS_PER_HOST", "10"))
+HTTP_MAX_RETRIES = int(os.getenv("HTTP_MAX_RETRIES", "2"))
+HTTP_BACKOFF_FACTOR = 0.5
+RETRY_STATUSES = (429, 502, 503, 504)
+IDEMPOTENT_METHODS = Retry.DEFAULT_ALLOWED_METHODS
+# Errors raised before the request was sent
+UNSENT_ERRORS = (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)
+
+_session: Optional[requests.Session] = None
+_session_lock = threading.Lock()
+
+
+class _Retry(Retry):
+    """Also retries a rate limited POST that the server asked to send again."""
+
+    def is_retry(
+        self, method: str, status_code: int, has_retry_after: bool = False
+    ) -> bool:
+        if method.upper() not in IDEMPOTENT_METHODS:
+            return bool(self.total and status_code == 429 and has_retry_after)
+        return super().is_retry(method, status_code, has_retry_after)
+
+
+def get_session() -> requests.Session:
+    """Get the process-wide sync HTTP session."""
+    global _session
+    with _session_lock:
+        if _session is None:
+            # Connect errors are retried for every method, read errors and
+            # 5xx responses only for the idempotent ones
+            retry = _Retry(
+                total=HTTP_MAX_RETRIES,
+                backoff_factor=HTTP_BACKOFF_FACTOR,
+                status_forcelist=RETRY_STATUSES,
+                raise_on_status=False,
+            )
+            adapter = HTTPAdapter(
+                pool_connections=32,
+                pool_maxsize=HTTP_MAX_CONNECTIONS_PER_HOST,
+                pool_block=True,
+                max_retries=retry,
+            )
+            session = requests.Session()
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            _session = session
+        return _session
+
+
+def request(method: str, url: str, **kwargs: Any) -> requests.Response:
+    kwargs.setdefault("timeout", HTTP_TIMEOUT)
+    return get_session().request(method, url, **kwargs)
+
+
+def get(url: str, params: Any = None, **kwargs: Any) -> requests.Response:
+    return request("GET", url, params=params, **kwargs)
+
+
+def post(
+    url: str, data: Any = None, json: Any = None, **kwargs: Any
+) -> requests.Response:
+    return request("POST", url, data=data, json=json, **kwargs)
+
+
+class AsyncHTTPClient:
+    """
+    Pooled async HTTP client bound to one event loop.
+
+    Wraps an `httpx.AsyncClient`, limits concurrent requests per host and
+    retries transient failures, with the same rules as the sync session.
+    """
+
+    def __init__(
+        self,
+        timeout: float = HTTP_TIMEOUT,
+        max_connections_per_host: int = HTTP_MAX_CONNECTIONS_PER_HOST,
+        max_retries: int = HTTP_MAX_RETRIES,
+        backoff_factor: float = HTTP_BACKOFF_FACTOR,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+    ):
+        self.max_connections_per_host = max(1, max_connections_per_host)
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.client = httpx.AsyncClient(
+            timeout=timeout,
+            # Concurrency is limited per host below, not globally
+            limits=httpx.Limits(max_connections=None, max_keepalive_connections=100),
+            transport=transport,
+        )
+        self._host_semaphores: dict[str, asyncio.Semaphore] = {}
+
+    async def request(
+        self,
+        method: str,
+        url: str,
+        *,
+        max_retries: Optional[int] = None,
+        **kwargs: Any,
+    ) -> httpx.Response:
+        """Send a request, `max_retries` overrides the retries of the client."""
+        max_retries = self.max_retries if max_retries is None else max_retries
+        host = urlsplit(url).netloc
+        semaphore = self._host_semaphores.setdefault(
+            host, asyncio.Semaphore(self.max_connections_per_host)
+        )
+        idempotent = method.upper() in IDEMPOTENT_METHODS
+        attempt = 0
+        while True:
+            retry_after = None
+            try:
+                async with semaphore:
+                    response = await self.client.request(method, url, **kwargs)
+                retry_after = _retry_after(response)
+                if attempt >= max_retries or not (
+                    (idempotent and response.status_code in RETRY_STATUSES)
+                    or (response.status_code == 429 and retry_after is not None)
+                ):
+                    return response
+                logger.warning(
+                    f"{method} {url} returned {response.status_code}, retrying"
+                )
+            except httpx.TransportError as e:
+                if attempt >= max_retries or not (
+                    idempotent or isinstance(e, UNSENT_ERRORS)
+                ):
+                    raise
+                logger.warning(f"{method} {url} failed: {e!r}, retrying")
+            delay = self.backoff_factor * (2**attempt)
+            if retry_after is not None:
+                await asyncio.sleep(retry_after)
+            else:
+                await asyncio.sleep(delay + random.uniform(0, delay / 2))
+            attempt += 1
+
+    async def get(self, url: str, params: Any = None, **kwargs: Any) -> httpx.Response:
+        return await self.request("GET", url, params=params, **kwargs)
+
+    async def post(
+        self, url: str, data: Any = None, json: Any = None, **kwargs: Any
+    ) -> httpx.Response:
+        # Same signature as `post`: a str or bytes body is sent as is
+        if isinstance(data, (str, bytes)):
+            kwargs["content"] = data
+        elif data is not None:
+            kwargs["data"] = data
+        return await self.request("POST", url, json=json, **kwargs)
+
+    async def aclose(self) -> None:
+        await self.client.aclose()
+
+
+def _retry_after(response: httpx.Response) -> Optional[float]:
+    """The delay in seconds of the Retry-After header, if any."""
+    value = response.headers.get("Retry-After")
+    if value is None:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
+_async_clients: (
+    "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, AsyncHTTPClient]"
+) = weakref.WeakKeyDictionary()
+_async_clients_lock = threading.Lock()
+
+
+def get_async_client() -> AsyncHTTPClient:
+    """
+    Get the async HTTP client of the running event loop.
+
+    httpx connections are bound to the loop that opened them, so every loop
+    gets its own client.
+    """
+    loop = asyncio.get_running_loop()
+    with _async_clients_lock:
+        client = _async_clients.get(loop)
+        if client is None:
+            client = AsyncHTTPClient()
+            _async_clients[loop] = client
+    return client
+
+
+async def close_async_client() -> None:
+    """Close the async HTTP client of the running event loop, if any."""
+    loop = asyncio.get_running_loop()
+    with _async_clients_lock:
+        client = _async_clients.pop(loop, None)
+    if client:
+        await client.aclose()
+
+
+async def aget(url: str, params: Any = None, **kwargs: Any) -> httpx.Response:
+    return await get_async_client().get(url, params=params, **kwargs)
+
+
+async def apost(
+    url: str, data: Any = None, json: Any = None, **kwargs: Any
+) -> httpx.Response:
+    return await get_async_client().post(url, data=data, json=json, **kwargs)
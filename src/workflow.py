@@ -29,6 +29,7 @@ async def run_agent_workflow_async(
     max_plan_iterations: int = 1,
     max_step_num: int = 3,
     enable_background_investigation: bool = True,
+    max_concurrent_steps: int = 1,
 ):
     """Run the agent workflow asynchronously with the given user input.
 
@@ -38,6 +39,7 @@ async def run_agent_workflow_async(
         max_plan_iterations: Maximum number of plan iterations
         max_step_num: Maximum number of steps in a plan
         enable_background_investigation: If True, performs web search before planning to enhance context
+        max_concurrent_steps: Maximum number of research steps run at once
 
     Returns:
         The final state after the workflow completes
@@ -60,6 +62,7 @@ async def run_agent_workflow_async(
             "thread_id": "default",
             "max_plan_iterations": max_plan_iterations,
             "max_step_num": max_step_num,
+            "max_concurrent_steps": max_concurrent_steps,
             "mcp_settings": {
                 "servers": {
                     "mcp-github-trending": {
@@ -1,6 +1,7 @@
 from collections import namedtuple
 import json
 import pytest
+import pytest_asyncio
 import asyncio
 import types
 from unittest.mock import patch, MagicMock, AsyncMock
@@ -10,6 +11,10 @@ from src.graph.nodes import coordinator_node
 from src.graph.nodes import reporter_node
 from src.graph.nodes import _execute_agent_step
 from src.graph.nodes import _setup_and_execute_agent_step
+from src.graph.nodes import _get_independent_steps
+from src.graph.nodes import _run_agent
+from src.prompts.planner_model import StepType
+from src.tools.mcp_pool import close_mcp_client_pool
 from src.graph.nodes import researcher_node
 
 # 在这里 mock 掉 get_llm_by_type，避免 ValueError
@@ -1037,6 +1042,125 @@ async def test_execute_agent_step_recursion_limit_env_negative(
         )
 
 
+def make_typed_step(title, step_type, execution_res=None):
+    step = Step(title=title, description=f"Desc {title}", execution_res=execution_res)
+    step.step_type = step_type
+    return step
+
+
+def test_get_independent_steps_batches_consecutive_research_steps():
+    Plan = MagicMock()
+    Plan.steps = [
+        make_typed_step("Done", StepType.RESEARCH, execution_res="done"),
+        make_typed_step("R1", StepType.RESEARCH),
+        make_typed_step("R2", StepType.RESEARCH),
+        make_typed_step("P1", StepType.PROCESSING),
+        make_typed_step("R3", StepType.RESEARCH),
+    ]
+    completed, pending = _get_independent_steps(Plan)
+    assert [s.title for s in completed] == ["Done"]
+    assert [s.title for s in pending] == ["R1", "R2"]
+
+
+def test_get_independent_steps_processing_step_runs_alone():
+    Plan = MagicMock()
+    Plan.steps = [
+        make_typed_step("P1", StepType.PROCESSING),
+        make_typed_step("R1", StepType.RESEARCH),
+    ]
+    completed, pending = _get_independent_steps(Plan)
+    assert completed == []
+    assert [s.title for s in pending] == ["P1"]
+
+
+@pytest.mark.asyncio
+async def test_run_agent_executes_independent_steps_concurrently():
+    Plan = MagicMock()
+    Plan.steps = [
+        make_typed_step("Done", StepType.RESEARCH, execution_res="done"),
+        make_typed_step("R1", StepType.RESEARCH),
+        make_typed_step("R2", StepType.RESEARCH),
+        make_typed_step("R3", StepType.RESEARCH),
+    ]
+    state = {
+        "current_plan": Plan,
+        "observations": ["obs0"],
+        "locale": "en-US",
+        "resources": [],
+    }
+    running = 0
+    max_running = 0
+    agent = MagicMock()
+
+    async def ainvoke(input, config):
+        nonlocal running, max_running
+        content = input["messages"][0].content
+        # Every step only sees the findings completed before the batch
+        assert "Existing Finding 1: Done" in content
+        assert "Existing Finding 2" not in content
+        running += 1
+        max_running = max(max_running, running)
+        title = content.split("## Title\n\n")[1].split("\n")[0]
+        # Finish in reverse order to check that results keep the plan order
+        await asyncio.sleep({"R1": 0.03, "R2": 0.02, "R3": 0.01}[title])
+        running -= 1
+        return {"messages": [MagicMock(content=f"result {title}")]}
+
+    agent.ainvoke = ainvoke
+    configurable = MagicMock()
+    configurable.max_concurrent_steps = 2
+    with patch(
+        "src.graph.nodes.Configuration.from_runnable_config",
+        return_value=configurable,
+    ):
+        result = await _run_agent(state, MagicMock(), agent, "researcher")
+
+    assert max_running == 2
+    assert result.goto == "research_team"
+    assert result.update["observations"] == [
+        "obs0",
+        "result R1",
+        "result R2",
+        "result R3",
+    ]
+    assert [m.content for m in result.update["messages"]] == [
+        "result R1",
+        "result R2",
+        "result R3",
+    ]
+    assert [s.execution_res for s in Plan.steps[1:]] == [
+        "result R1",
+        "result R2",
+        "result R3",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_run_agent_serial_by_default(mock_agent):
+    Plan = MagicMock()
+    Plan.steps = [
+        make_typed_step("R1", StepType.RESEARCH),
+        make_typed_step("R2", StepType.RESEARCH),
+    ]
+    state = {
+        "current_plan": Plan,
+        "observations": [],
+        "locale": "en-US",
+        "resources": [],
+    }
+    configurable = MagicMock()
+    configurable.max_concurrent_steps = 1
+    with patch(
+        "src.graph.nodes.Configuration.from_runnable_config",
+        return_value=configurable,
+    ):
+        result = await _run_agent(state, MagicMock(), mock_agent, "researcher")
+
+    assert result.update["observations"] == ["result content"]
+    assert Plan.steps[0].execution_res == "result content"
+    assert Plan.steps[1].execution_res is None
+
+
 @pytest.fixture
 def mock_state_with_steps(mock_step, mock_completed_step):
     # Simulate a plan with one completed and one unexecuted step
@@ -1117,8 +1241,8 @@ def patch_execute_agent_step():
         yield mock
 
 
-@pytest.fixture
-def patch_multiserver_mcp_client():
+@pytest_asyncio.fixture
+async def patch_multiserver_mcp_client():
     # Patch MultiServerMCPClient as async context manager
     class FakeTool:
         def __init__(self, name, description="desc"):
@@ -1140,9 +1264,10 @@ def patch_multiserver_mcp_client():
             ]
 
     with patch(
-        "src.graph.nodes.MultiServerMCPClient", return_value=FakeClient()
+        "src.tools.mcp_pool.MultiServerMCPClient", return_value=FakeClient()
     ) as mock:
         yield mock
+        await close_mcp_client_pool()
 
 
 @pytest.mark.asyncio
@@ -1269,13 +1394,14 @@ async def test_setup_and_execute_agent_step_with_mcp_tools_description_update(
         def get_tools(self):
             return [FakeTool("toolA", "descA")]
 
-    with patch("src.graph.nodes.MultiServerMCPClient", return_value=FakeClient()):
+    with patch("src.tools.mcp_pool.MultiServerMCPClient", return_value=FakeClient()):
         await _setup_and_execute_agent_step(
             mock_state_with_steps,
             mock_config,
             agent_type,
             default_tools,
         )
+        await close_mcp_client_pool()
         # The tool description should be updated
         args, kwargs = patch_create_agent.call_args
         loaded_tools = args[2]
@@ -3,7 +3,7 @@
 
 import json
 import pytest
-from unittest.mock import patch, MagicMock
+from unittest.mock import AsyncMock, patch, MagicMock
 import uuid
 import base64
 
@@ -45,7 +45,7 @@ class TestVolcengineTTS:
         assert tts.host == "openspeech.bytedance.com"
         assert tts.api_url == "https://openspeech.bytedance.com/api/v1/tts"
 
-    @patch("src.tools.tts.requests.post")
+    @patch("src.tools.tts.http_client.post")
     def test_text_to_speech_success(self, mock_post):
         """Test successful text-to-speech conversion."""
         # Mock response
@@ -88,7 +88,7 @@ class TestVolcengineTTS:
         assert request_json["audio"]["encoding"] == "mp3"
         assert request_json["request"]["text"] == "Hello, world!"
 
-    @patch("src.tools.tts.requests.post")
+    @patch("src.tools.tts.http_client.post")
     def test_text_to_speech_api_error(self, mock_post):
         """Test error handling when API returns an error."""
         # Mock response
@@ -114,7 +114,7 @@ class TestVolcengineTTS:
         assert result["error"] == {"code": 400, "message": "Bad request"}
         assert result["audio_data"] is None
 
-    @patch("src.tools.tts.requests.post")
+    @patch("src.tools.tts.http_client.post")
     def test_text_to_speech_no_data(self, mock_post):
         """Test error handling when API response doesn't contain data."""
         # Mock response
@@ -141,7 +141,7 @@ class TestVolcengineTTS:
         assert result["error"] == "No audio data returned"
         assert result["audio_data"] is None
 
-    @patch("src.tools.tts.requests.post")
+    @patch("src.tools.tts.http_client.post")
     def test_text_to_speech_with_custom_parameters(self, mock_post):
         """Test text_to_speech with custom parameters."""
         # Mock response
@@ -192,7 +192,7 @@ class TestVolcengineTTS:
         assert request_json["request"]["frontend_type"] == "custom"
         assert request_json["user"]["uid"] == "custom-uid"
 
-    @patch("src.tools.tts.requests.post")
+    @patch("src.tools.tts.http_client.post")
     @patch("src.tools.tts.uuid.uuid4")
     def test_text_to_speech_auto_generated_uid(self, mock_uuid, mock_post):
         """Test that UUID is auto-generated if not provided."""
@@ -230,7 +230,7 @@ class TestVolcengineTTS:
         request_json = json.loads(args[1])
         assert request_json["user"]["uid"] == str(mock_uuid_value)
 
-    @patch("src.tools.tts.requests.post")
+    @patch("src.tools.tts.http_client.post")
     def test_text_to_speech_request_exception(self, mock_post):
         """Test error handling when requests.post raises an exception."""
         # Mock requests.post to raise an exception
@@ -247,3 +247,28 @@ class TestVolcengineTTS:
         # The TTS error is caught and returned as a string
         assert result["error"] == "TTS API call error"
         assert result["audio_data"] is None
+
+    @pytest.mark.asyncio
+    @patch("src.tools.tts.http_client.apost", new_callable=AsyncMock)
+    async def test_atext_to_speech_success(self, mock_apost):
+        """Test the async text-to-speech conversion."""
+        mock_response = MagicMock()
+        mock_response.status_code = 200
+        mock_audio_data = base64.b64encode(b"audio_data").decode()
+        mock_response.json.return_value = {"code": 0, "data": mock_audio_data}
+        mock_apost.return_value = mock_response
+
+        tts = VolcengineTTS(
+            appid="test_appid",
+            access_token="test_token",
+        )
+        result = await tts.atext_to_speech("Hello, world!", speed_ratio=1.2)
+
+        assert result["success"] is True
+        assert result["audio_data"] == mock_audio_data
+        args, kwargs = mock_apost.call_args
+        assert args[0] == "https://openspeech.bytedance.com/api/v1/tts"
+        request_json = json.loads(args[1])
+        assert request_json["audio"]["speed_ratio"] == 1.2
+        assert kwargs["headers"] == {"Authorization": "Bearer;test_token"}
+        assert kwargs["max_retries"] is None
@@ -33,6 +33,7 @@ def test_default_configuration():
     assert config.max_step_num == 3
     assert config.max_search_results == 3
     assert config.mcp_settings is None
+    assert config.max_concurrent_steps == 1
 
 
 def test_from_runnable_config_with_config_dict(monkeypatch):
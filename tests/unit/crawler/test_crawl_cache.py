@@ -0,0 +1,141 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+import threading
+import time
+
+import pytest
+import requests
+
+from src.crawler import Crawler
+from src.crawler.article import Article
+from src.crawler.cache import CrawlCache, CrawlCacheEntry, normalize_url
+
+
+def make_entry(url, created_at=None, html="<html>page</html>"):
+    return CrawlCacheEntry(
+        url=url,
+        html=html,
+        title="Title",
+        html_content="<p>Hello</p>",
+        markdown="Hello",
+        created_at=created_at or time.time(),
+    )
+
+
+@pytest.fixture
+def fake_fetch(monkeypatch):
+    calls = []
+
+    class DummyJinaClient:
+        def crawl(self, url, return_format=None):
+            calls.append(url)
+            time.sleep(0.01)
+            return "<html>dummy</html>"
+
+    class DummyReadabilityExtractor:
+        def extract_article(self, html):
+            return Article("Dummy", "<p>Hello <b>world</b></p>")
+
+    monkeypatch.setattr("src.crawler.crawler.JinaClient", DummyJinaClient)
+    monkeypatch.setattr(
+        "src.crawler.crawler.ReadabilityExtractor", DummyReadabilityExtractor
+    )
+    return calls
+
+
+def test_normalize_url():
+    assert normalize_url("HTTPS://Example.com:443/a?b=2&a=1#top") == (
+        "https://example.com/a?a=1&b=2"
+    )
+    assert normalize_url("http://example.com") == "http://example.com/"
+    assert normalize_url("http://example.com:8080/") == "http://example.com:8080/"
+
+
+def test_memory_tier_lru_and_ttl():
+    cache = CrawlCache(ttl=60, max_entries=2)
+    cache.put(make_entry("http://a.com"))
+    cache.put(make_entry("http://b.com"))
+    assert cache.get("http://a.com") is not None
+    cache.put(make_entry("http://c.com"))
+
+    # b was the least recently used entry
+    assert cache.get("http://b.com") is None
+    assert cache.get("http://a.com#section") is not None
+
+    cache.put(make_entry("http://old.com", created_at=time.time() - 120))
+    assert cache.get("http://old.com") is None
+
+    stats = cache.stats()
+    assert stats["hits"] == 2
+    assert stats["misses"] == 2
+    assert stats["evictions"] == 2
+
+
+def test_disk_tier_survives_restart_and_is_trimmed(tmp_path):
+    cache = CrawlCache(cache_dir=str(tmp_path))
+    cache.put(make_entry("http://a.com"))
+
+    cache = CrawlCache(cache_dir=str(tmp_path))
+    entry = cache.get("http://a.com")
+    assert entry.html == "<html>page</html>"
+    assert cache.stats()["disk_hits"] == 1
+
+    cache = CrawlCache(cache_dir=str(tmp_path), max_disk_bytes=1500)
+    for i in range(5):
+        cache.put(make_entry(f"http://{i}.com", html="x" * 400))
+    assert cache.stats()["disk_bytes"] <= 1500
+    assert len(list(tmp_path.glob("*.json"))) < 5
+
+
+def test_crawler_uses_cache(fake_fetch):
+    crawler = Crawler(cache=CrawlCache())
+    first = crawler.crawl("http://example.com")
+    second = crawler.crawl("http://example.com/#intro")
+
+    assert fake_fetch == ["http://example.com"]
+    assert second.url == "http://example.com/#intro"
+    assert second.to_markdown() == first.to_markdown()
+    assert "world" in second.to_markdown()
+
+    crawler.crawl("http://example.com", use_cache=False)
+    assert len(fake_fetch) == 2
+
+
+def test_crawler_coalesces_concurrent_crawls(fake_fetch):
+    crawler = Crawler(cache=CrawlCache())
+    threads = [
+        threading.Thread(target=crawler.crawl, args=("http://example.com",))
+        for _ in range(5)
+    ]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert fake_fetch == ["http://example.com"]
+    assert crawler.cache.stats()["hits"] == 4
+
+
+def test_crawler_without_cache_by_default(fake_fetch, monkeypatch):
+    monkeypatch.delenv("CRAWL_CACHE_ENABLED", raising=False)
+    crawler = Crawler()
+    assert crawler.cache is None
+    crawler.crawl("http://example.com")
+    crawler.crawl("http://example.com")
+    assert len(fake_fetch) == 2
+
+
+def test_crawler_does_not_cache_failed_fetch(monkeypatch):
+    response = requests.Response()
+    response.status_code = 429
+    response._content = b"Too Many Requests"
+    response.url = "https://r.jina.ai/"
+    monkeypatch.setattr(
+        "src.crawler.jina_client.http_client.post", lambda *a, **kw: response
+    )
+    crawler = Crawler(cache=CrawlCache())
+
+    with pytest.raises(requests.HTTPError):
+        crawler.crawl("http://example.com")
+    assert crawler.cache.get("http://example.com") is None
@@ -0,0 +1,189 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+import operator
+import time
+from typing import Annotated, TypedDict
+from unittest.mock import patch
+
+import pytest
+from langgraph.checkpoint.memory import MemorySaver
+from langgraph.graph import END, START, StateGraph
+from langgraph.types import Command, interrupt
+
+from src.graph.checkpointer import SQLiteSaver, build_checkpointer
+
+
+class _State(TypedDict):
+    messages: Annotated[list[str], operator.add]
+
+
+def _build_graph(checkpointer, ask_human=False):
+    def step(state):
+        return {"messages": ["step"]}
+
+    def human(state):
+        answer = interrupt("continue?")
+        return {"messages": [answer]}
+
+    builder = StateGraph(_State)
+    builder.add_node("step", step)
+    builder.add_edge(START, "step")
+    if ask_human:
+        builder.add_node("human", human)
+        builder.add_edge("step", "human")
+        builder.add_edge("human", END)
+    else:
+        builder.add_edge("step", END)
+    return builder.compile(checkpointer=checkpointer)
+
+
+def _config(thread_id):
+    return {"configurable": {"thread_id": thread_id}}
+
+
+def test_state_survives_restart(tmp_path):
+    path = str(tmp_path / "checkpoints.sqlite")
+    saver = SQLiteSaver(path)
+    _build_graph(saver).invoke({"messages": ["hi"]}, _config("t1"))
+    saver.close()
+
+    saver = SQLiteSaver(path)
+    graph = _build_graph(saver)
+    assert graph.get_state(_config("t1")).values["messages"] == ["hi", "step"]
+    graph.invoke({"messages": ["again"]}, _config("t1"))
+    assert graph.get_state(_config("t1")).values["messages"] == [
+        "hi",
+        "step",
+        "again",
+        "step",
+    ]
+    saver.close()
+
+
+def test_interrupt_can_be_resumed(tmp_path):
+    path = str(tmp_path / "checkpoints.sqlite")
+    saver = SQLiteSaver(path)
+    _build_graph(saver, ask_human=True).invoke({"messages": ["hi"]}, _config("t1"))
+    saver.close()
+
+    saver = SQLiteSaver(path)
+    graph = _build_graph(saver, ask_human=True)
+    assert graph.get_state(_config("t1")).next == ("human",)
+    result = graph.invoke(Command(resume="yes"), _config("t1"))
+    assert result["messages"] == ["hi", "step", "yes"]
+    saver.close()
+
+
+def test_pending_writes_are_shared_between_workers(tmp_path):
+    path = str(tmp_path / "checkpoints.sqlite")
+    calls = []
+
+    def build(checkpointer):
+        def done(state):
+            calls.append("done")
+            return {"messages": ["done"]}
+
+        def ask(state):
+            return {"messages": [interrupt("continue?")]}
+
+        builder = StateGraph(_State)
+        builder.add_node("done", done)
+        builder.add_node("ask", ask)
+        builder.add_edge(START, "done")
+        builder.add_edge(START, "ask")
+        builder.add_edge("done", END)
+        builder.add_edge("ask", END)
+        return builder.compile(checkpointer=checkpointer)
+
+    first, second = SQLiteSaver(path), SQLiteSaver(path)
+    build(first).invoke({"messages": ["hi"]}, _config("t1"))
+
+    # The other worker sees the interrupt and the finished node before any
+    # new checkpoint is saved
+    graph = build(second)
+    state = graph.get_state(_config("t1"))
+    assert [i.value for task in state.tasks for i in task.interrupts] == ["continue?"]
+    result = graph.invoke(Command(resume="yes"), _config("t1"))
+    assert sorted(result["messages"]) == ["done", "hi", "yes"]
+    assert calls == ["done"]
+    first.close()
+    second.close()
+
+
+@pytest.mark.asyncio
+async def test_async_api():
+    saver = SQLiteSaver()
+    graph = _build_graph(saver)
+    await graph.ainvoke({"messages": ["hi"]}, _config("t1"))
+    state = await graph.aget_state(_config("t1"))
+    assert state.values["messages"] == ["hi", "step"]
+    history = [c async for c in saver.alist(_config("t1"), limit=2)]
+    assert len(history) == 2
+    saver.close()
+
+
+def test_old_checkpoints_are_compacted():
+    saver = SQLiteSaver(keep_last=3)
+    graph = _build_graph(saver)
+    for i in range(5):
+        graph.invoke({"messages": [str(i)]}, _config("t1"))
+    graph.invoke({"messages": ["other"]}, _config("t2"))
+
+    assert len(list(saver.list(_config("t1")))) == 3
+    assert graph.get_state(_config("t1")).values["messages"][-2:] == ["4", "step"]
+    assert len(list(saver.list(_config("t2")))) == 3
+    saver.close()
+
+
+def test_list_filters_by_metadata():
+    saver = SQLiteSaver()
+    _build_graph(saver).invoke({"messages": ["hi"]}, _config("t1"))
+
+    inputs = list(saver.list(_config("t1"), filter={"source": "input"}))
+    assert len(inputs) == 1
+    assert inputs[0].metadata["source"] == "input"
+    saver.close()
+
+
+def test_idle_threads_are_evicted():
+    saver = SQLiteSaver(thread_ttl=60)
+    graph = _build_graph(saver)
+    graph.invoke({"messages": ["old"]}, _config("old"))
+    saver.conn.execute("UPDATE threads SET updated_at = ?", (time.time() - 120,))
+    graph.invoke({"messages": ["new"]}, _config("new"))
+
+    assert saver.evict_idle_threads() == 1
+    assert saver.get_tuple(_config("old")) is None
+    assert saver.get_tuple(_config("new")) is not None
+    saver.close()
+
+
+def test_delete_thread():
+    saver = SQLiteSaver()
+    _build_graph(saver).invoke({"messages": ["hi"]}, _config("t1"))
+    saver.delete_thread("t1")
+    assert saver.get_tuple(_config("t1")) is None
+    saver.close()
+
+
+def test_build_checkpointer_memory():
+    with patch("src.graph.checkpointer.SELECTED_CHECKPOINTER", "memory"):
+        assert isinstance(build_checkpointer(), MemorySaver)
+
+
+def test_build_checkpointer_sqlite(tmp_path):
+    path = str(tmp_path / "checkpoints.sqlite")
+    with (
+        patch("src.graph.checkpointer.SELECTED_CHECKPOINTER", "sqlite"),
+        patch("src.graph.checkpointer.CHECKPOINTER_SQLITE_PATH", path),
+    ):
+        saver = build_checkpointer()
+    assert isinstance(saver, SQLiteSaver)
+    saver.close()
+
+
+def test_build_checkpointer_unsupported():
+    with patch("src.graph.checkpointer.SELECTED_CHECKPOINTER", "redis"):
+        with pytest.raises(ValueError):
+            build_checkpointer()
@@ -0,0 +1,76 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import pytest
+from langgraph.constants import TAG_NOSTREAM
+
+from src.graph.observations import (
+    condense_observations,
+    pack_observations,
+    split_by_tokens,
+)
+from src.graph.step_context import estimate_tokens
+
+
+@pytest.fixture
+def mock_llm():
+    llm = MagicMock()
+    llm.batch.side_effect = lambda inputs, config, return_exceptions: [
+        SimpleNamespace(content=f"notes {i}") for i in range(len(inputs))
+    ]
+    return llm
+
+
+def test_split_by_tokens_on_paragraphs():
+    text = "\n\n".join(["a" * 40] * 5)
+    pieces = split_by_tokens(text, max_tokens=25)
+    assert pieces == ["a" * 40 + "\n\n" + "a" * 40] * 2 + ["a" * 40]
+    assert split_by_tokens("b" * 100, max_tokens=10) == ["b" * 40] * 2 + ["b" * 20]
+
+
+def test_pack_observations():
+    observations = ["a" * 40, "b" * 40, "c" * 40, "d" * 200]
+    chunks = pack_observations(observations, chunk_tokens=25)
+    assert chunks[0] == "a" * 40 + "\n\n---\n\n" + "b" * 40
+    assert all(
+        estimate_tokens(chunk.replace("\n\n---\n\n", "")) <= 25 for chunk in chunks
+    )
+    assert "".join(chunks).count("d") == 200
+
+
+def test_small_observations_unchanged(mock_llm):
+    observations = ["first", "second"]
+    assert condense_observations(observations, "task", mock_llm) == observations
+    mock_llm.batch.assert_not_called()
+
+
+def test_large_observations_condensed_in_parallel(mock_llm, monkeypatch):
+    monkeypatch.setenv("REPORTER_MAP_REDUCE_THRESHOLD", "100")
+    monkeypatch.setenv("REPORTER_MAP_CHUNK_TOKENS", "60")
+    monkeypatch.setenv("REPORTER_MAP_CONCURRENCY", "3")
+    observations = ["a" * 200, "b" * 200, "c" * 200]
+
+    notes = condense_observations(observations, "The task", mock_llm)
+
+    assert notes == ["notes 0", "notes 1", "notes 2"]
+    inputs = mock_llm.batch.call_args.args[0]
+    config = mock_llm.batch.call_args.kwargs["config"]
+    assert len(inputs) == 3
+    assert "The task" in inputs[0][1].content
+    assert "a" * 200 in inputs[0][1].content
+    assert config["max_concurrency"] == 3
+    # The notes must not show up in the streamed report
+    assert config["tags"] == [TAG_NOSTREAM]
+
+
+def test_failed_chunk_keeps_observations(mock_llm, monkeypatch):
+    monkeypatch.setenv("REPORTER_MAP_REDUCE_THRESHOLD", "10")
+    mock_llm.batch.side_effect = None
+    mock_llm.batch.return_value = [RuntimeError("LLM down")]
+
+    notes = condense_observations(["a" * 100], "task", mock_llm)
+
+    assert notes == ["a" * 100]
@@ -0,0 +1,111 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from src.graph.step_context import (
+    TRUNCATION_NOTE,
+    build_findings_context,
+    estimate_tokens,
+    summary_cache,
+    truncate_to_tokens,
+)
+
+
+def make_steps(*findings):
+    return [
+        SimpleNamespace(title=f"Step {i}", execution_res=finding)
+        for i, finding in enumerate(findings)
+    ]
+
+
+@pytest.fixture(autouse=True)
+def clear_summary_cache():
+    summary_cache.clear()
+    yield
+    summary_cache.clear()
+
+
+@pytest.fixture
+def mock_llm():
+    llm = MagicMock()
+    llm.ainvoke = AsyncMock(
+        side_effect=lambda messages: SimpleNamespace(content=" short summary ")
+    )
+    with patch("src.graph.step_context.get_llm_by_type", return_value=llm):
+        yield llm
+
+
+def test_estimate_tokens():
+    assert estimate_tokens("") == 0
+    assert estimate_tokens("a" * 40) == 10
+    assert estimate_tokens("南京汤包") == 4
+
+
+def test_truncate_to_tokens():
+    assert truncate_to_tokens("short", 10) == "short"
+    truncated = truncate_to_tokens("word " * 200, 20)
+    assert truncated.endswith(TRUNCATION_NOTE)
+    assert estimate_tokens(truncated) <= 20
+    assert estimate_tokens(truncate_to_tokens("汤" * 200, 20)) <= 20
+
+
+@pytest.mark.asyncio
+async def test_findings_within_budget_unchanged():
+    steps = make_steps("first finding", "second finding")
+    context, stats = await build_findings_context(steps, max_tokens=1000)
+    assert context == (
+        "# Existing Research Findings\n\n"
+        "## Existing Finding 1: Step 0\n\n<finding>\nfirst finding\n</finding>\n\n"
+        "## Existing Finding 2: Step 1\n\n<finding>\nsecond finding\n</finding>\n\n"
+    )
+    assert stats.saved_tokens == 0
+    assert await build_findings_context([], max_tokens=10) == ("", stats.__class__())
+
+
+@pytest.mark.asyncio
+async def test_oldest_findings_truncated_first():
+    steps = make_steps("a" * 400, "b" * 400, "c" * 40)
+    context, stats = await build_findings_context(steps, max_tokens=170)
+    assert stats.original_tokens == 210
+    assert stats.tokens <= 170
+    assert stats.saved_tokens == stats.original_tokens - stats.tokens
+    assert stats.truncated == 1
+    # The newest findings are kept as they are
+    assert "b" * 400 in context
+    assert "c" * 40 in context
+    assert "a" * 400 not in context
+
+
+@pytest.mark.asyncio
+async def test_unlimited_budget():
+    steps = make_steps("a" * 4000)
+    context, stats = await build_findings_context(steps, max_tokens=0)
+    assert "a" * 4000 in context
+
+
+@pytest.mark.asyncio
+async def test_findings_summarized_once(mock_llm):
+    steps = make_steps("a" * 400, "b" * 400, "c" * 40)
+
+    for _ in range(2):
+        context, stats = await build_findings_context(
+            steps, max_tokens=170, summarize=True
+        )
+        assert "<finding>\nshort summary\n</finding>" in context
+        assert stats.summarized == 1
+
+    assert mock_llm.ainvoke.await_count == 1
+
+
+@pytest.mark.asyncio
+async def test_failed_summary_falls_back_to_truncation(mock_llm):
+    mock_llm.ainvoke.side_effect = RuntimeError("LLM down")
+    steps = make_steps("a" * 400, "b" * 400)
+    context, stats = await build_findings_context(steps, max_tokens=120, summarize=True)
+    assert stats.summarized == 0
+    assert stats.truncated == 2
+    assert TRUNCATION_NOTE in context
@@ -0,0 +1,250 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+import asyncio
+
+import httpx
+import openai
+import pytest
+from langchain_core.language_models.fake_chat_models import GenericFakeChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+from langchain_openai import ChatOpenAI
+
+from src.llms import llm
+from src.llms.pool import (
+    Endpoint,
+    ModelPool,
+    create_pooled_chat_model,
+    is_retryable_error,
+    split_pool_conf,
+)
+
+REQUEST = httpx.Request("POST", "http://test/chat/completions")
+
+
+def status_error(error_class, status_code, headers=None):
+    response = httpx.Response(status_code, request=REQUEST, headers=headers)
+    return error_class("error", response=response, body=None)
+
+
+class FakeEndpointModel:
+    def __init__(self, name, errors=(), delay=0.0):
+        self.name = name
+        self.errors = list(errors)
+        self.delay = delay
+        self.calls = 0
+        self.running = 0
+        self.max_running = 0
+
+    def _result(self):
+        self.calls += 1
+        if self.errors:
+            raise self.errors.pop(0)
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(self.name))])
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs):
+        return self._result()
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs):
+        self.running += 1
+        self.max_running = max(self.max_running, self.running)
+        try:
+            await asyncio.sleep(self.delay)
+            return self._result()
+        finally:
+            self.running -= 1
+
+    def _stream(self, messages, stop=None, run_manager=None, **kwargs):
+        self.calls += 1
+        yield ChatGenerationChunk(message=AIMessageChunk(content=self.name))
+        if self.errors:
+            raise self.errors.pop(0)
+        yield ChatGenerationChunk(message=AIMessageChunk(content="!"))
+
+
+def pooled_model(*endpoints, **options):
+    pool = ModelPool(
+        [Endpoint(model.name, model, **limits) for model, limits in endpoints],
+        **options,
+    )
+    model_class = create_pooled_chat_model(GenericFakeChatModel)
+    return model_class(messages=iter([]), pool=pool)
+
+
+def test_retryable_errors():
+    assert is_retryable_error(status_error(openai.RateLimitError, 429))
+    assert is_retryable_error(status_error(openai.InternalServerError, 503))
+    assert is_retryable_error(openai.APIConnectionError(request=REQUEST))
+    assert not is_retryable_error(status_error(openai.BadRequestError, 400))
+    assert not is_retryable_error(ValueError("bad"))
+
+
+def test_fails_over_on_rate_limit():
+    limited = FakeEndpointModel(
+        "a", [status_error(openai.RateLimitError, 429, {"retry-after": "5"})]
+    )
+    backup = FakeEndpointModel("b")
+    model = pooled_model((limited, {}), (backup, {}))
+
+    assert model.invoke("hi").content == "b"
+    assert model.pool.endpoints[0].cooling_down
+    assert model.pool.endpoints[0].failures == 1
+    # The endpoint cooling down is tried last
+    assert model.invoke("hi").content == "b"
+    assert limited.calls == 1
+
+
+def test_other_errors_are_not_retried():
+    failing = FakeEndpointModel("a", [status_error(openai.BadRequestError, 400)])
+    backup = FakeEndpointModel("b")
+    model = pooled_model((failing, {}), (backup, {}))
+
+    with pytest.raises(openai.BadRequestError):
+        model.invoke("hi")
+    assert backup.calls == 0
+
+
+def test_raises_when_every_endpoint_failed():
+    model = pooled_model(
+        (FakeEndpointModel("a", [status_error(openai.InternalServerError, 500)]), {}),
+        (FakeEndpointModel("b", [status_error(openai.InternalServerError, 502)]), {}),
+    )
+    with pytest.raises(openai.InternalServerError) as exc_info:
+        model.invoke("hi")
+    assert exc_info.value.status_code == 502
+
+
+def test_least_loaded_routing():
+    busy = Endpoint("busy", None, max_concurrency=4)
+    idle = Endpoint("idle", None, max_concurrency=2)
+    pool = ModelPool([busy, idle])
+    busy.load = 1
+    assert pool._select([]) is idle
+    idle.load = 1
+    assert pool._select([]) is busy
+    assert pool._select([busy]) is idle
+
+
+def test_latency_routing():
+    slow = Endpoint("slow", None)
+    fast = Endpoint("fast", None)
+    new = Endpoint("new", None)
+    pool = ModelPool([slow, fast, new], routing="latency")
+    slow.latency, fast.latency = 2.0, 0.5
+    assert pool._select([]) is new
+    assert pool._select([new]) is fast
+    fast.load = 4
+    assert pool._select([new]) is slow
+
+
+def test_invalid_routing():
+    with pytest.raises(ValueError):
+        ModelPool([Endpoint("a", None)], routing="random")
+
+
+@pytest.mark.asyncio
+async def test_concurrency_limited_per_endpoint():
+    first = FakeEndpointModel("a", delay=0.02)
+    second = FakeEndpointModel("b", delay=0.02)
+    model = pooled_model(
+        (first, {"max_concurrency": 2}), (second, {"max_concurrency": 1})
+    )
+
+    results = await asyncio.gather(*(model.ainvoke("hi") for _ in range(9)))
+
+    assert first.max_running == 2
+    assert second.max_running == 1
+    assert first.calls + second.calls == 9
+    # Least loaded routing spreads the calls in proportion to the limits
+    assert first.calls > second.calls > 0
+    assert {result.content for result in results} == {"a", "b"}
+    assert all(endpoint.load == 0 for endpoint in model.pool.endpoints)
+    assert model.pool.endpoints[0].latency is not None
+
+
+def test_stream_fails_over_before_first_chunk_only():
+    pool = ModelPool(
+        [
+            Endpoint("a", FakeEndpointModel("a")),
+            Endpoint("b", FakeEndpointModel("b")),
+        ]
+    )
+
+    def call(model):
+        if model.name == "a":
+            raise status_error(openai.RateLimitError, 429)
+        return model._stream([])
+
+    chunks = list(pool.stream(call))
+    assert "".join(chunk.message.content for chunk in chunks) == "b!"
+
+    # The first chunk of "b" was already yielded when it failed
+    pool.endpoints[1].model.errors = [status_error(openai.InternalServerError, 500)]
+    with pytest.raises(openai.InternalServerError):
+        list(pool.stream(lambda model: model._stream([])))
+    assert pool.endpoints[0].model.calls == 0
+
+
+def test_split_pool_conf():
+    assert split_pool_conf({"model": "m", "api_key": "k"}) is None
+
+    options, endpoints = split_pool_conf(
+        {
+            "model": "m",
+            "api_key": "k",
+            "routing": "latency",
+            "max_concurrency": 4,
+            "endpoints": '[{"base_url": "http://a"}, {"api_key": "k2"}]',
+        }
+    )
+    assert options == {"routing": "latency"}
+    assert endpoints == [
+        {"model": "m", "api_key": "k", "max_concurrency": 4, "base_url": "http://a"},
+        {"model": "m", "api_key": "k2", "max_concurrency": 4},
+    ]
+
+
+def test_create_pooled_llm_from_conf(monkeypatch):
+    monkeypatch.setattr(llm, "get_llm_response_cache", lambda: None)
+    conf = {
+        "BASIC_MODEL": {
+            "model": "m",
+            "api_key": "k",
+            "routing": "latency",
+            "cooldown": 10,
+            "endpoints": [
+                {"base_url": "http://a", "requests_per_minute": 600},
+                {"base_url": "http://b", "model": "m2", "max_concurrency": 2},
+            ],
+        }
+    }
+    model = llm._create_llm_use_conf("basic", conf)
+
+    assert type(model).__name__ == "PooledChatOpenAI"
+    assert model.pool.routing == "latency"
+    assert model.pool.cooldown == 10
+    first, second = model.pool.endpoints
+    assert first.model.openai_api_base == "http://a"
+    assert first.model.max_retries == 0
+    assert first.rate_limiter is not None
+    assert second.model.model_name == "m2"
+    assert second.max_concurrency == 2
+
+    monkeypatch.setattr(llm, "load_yaml_config", lambda path: conf)
+    assert llm.get_configured_llm_models() == {"basic": ["m", "m2"]}
+
+
+def test_single_endpoint_pool_keeps_retries(monkeypatch):
+    monkeypatch.setattr(llm, "get_llm_response_cache", lambda: None)
+    conf = {
+        "BASIC_MODEL": {
+            "model": "m",
+            "api_key": "k",
+            "endpoints": [{"base_url": "http://a", "max_concurrency": 2}],
+        }
+    }
+    model = llm._create_llm_use_conf("basic", conf)
+
+    (endpoint,) = model.pool.endpoints
+    assert endpoint.model.max_retries == ChatOpenAI(api_key="k").max_retries != 0
@@ -0,0 +1,186 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+from typing import TypedDict
+from unittest.mock import patch
+
+import pytest
+from langchain_core.language_models.fake_chat_models import GenericFakeChatModel
+from langchain_core.messages import AIMessage, HumanMessage, SystemMessage
+from langchain_core.outputs import ChatGeneration
+from langgraph.graph import END, START, StateGraph
+
+from src.llms import llm as llm_module
+from src.llms.cache import LLMResponseCache, create_cached_chat_model
+
+
+class CountingChatModel(GenericFakeChatModel):
+    calls: int = 0
+
+    def _generate(self, *args, **kwargs):
+        self.calls += 1
+        return super()._generate(*args, **kwargs)
+
+
+class State(TypedDict):
+    question: str
+    answer: str
+
+
+@pytest.fixture
+def cache():
+    cache = LLMResponseCache(ttl=60, nodes=["coordinator", "prose_*"])
+    with patch("src.llms.cache.get_llm_response_cache", return_value=cache):
+        yield cache
+
+
+@pytest.fixture
+def model():
+    model_class = create_cached_chat_model(CountingChatModel)
+    return model_class(messages=iter(["first answer", "second answer"] * 5))
+
+
+def build_graph(model, node_name, system="You are helpful. Mon Jan 01 2024 10:00:00"):
+    def node(state):
+        response = model.invoke(
+            [SystemMessage(content=system), HumanMessage(content=state["question"])]
+        )
+        return {"answer": response.content}
+
+    builder = StateGraph(State)
+    builder.add_node(node_name, node)
+    builder.add_edge(START, node_name)
+    builder.add_edge(node_name, END)
+    return builder.compile()
+
+
+def generations(text):
+    return [ChatGeneration(message=AIMessage(content=text))]
+
+
+def test_create_cached_chat_model_is_memoized():
+    model_class = create_cached_chat_model(CountingChatModel)
+    assert model_class is create_cached_chat_model(CountingChatModel)
+    assert model_class.__name__ == "CachedCountingChatModel"
+    assert issubclass(model_class, CountingChatModel)
+
+
+def test_repeated_calls_served_from_cache(cache, model):
+    graph = build_graph(model, "coordinator")
+
+    first = graph.invoke({"question": "hi"})
+    second = graph.invoke({"question": "hi"})
+    third = graph.invoke({"question": "other"})
+
+    assert first["answer"] == second["answer"] == "first answer"
+    assert third["answer"] == "second answer"
+    assert model.calls == 2
+    assert cache.stats()["exact_hits"] == 1
+
+
+def test_current_time_ignored_in_key(cache, model):
+    build_graph(model, "coordinator").invoke({"question": "hi"})
+    later = build_graph(
+        model, "coordinator", system="You are helpful. Tue Jan 02 2024 11:30:59"
+    )
+    assert later.invoke({"question": "hi"})["answer"] == "first answer"
+    assert model.calls == 1
+
+
+def test_only_listed_nodes_cached(cache, model):
+    graph = build_graph(model, "researcher")
+    graph.invoke({"question": "hi"})
+    graph.invoke({"question": "hi"})
+    assert model.calls == 2
+
+    graph = build_graph(model, "prose_zap")
+    graph.invoke({"question": "hi"})
+    graph.invoke({"question": "hi"})
+    assert model.calls == 3
+
+    # Calls made outside of a graph are not cached
+    model.invoke("hi")
+    model.invoke("hi")
+    assert model.calls == 5
+
+
+@pytest.mark.asyncio
+async def test_cached_response_streamed_with_new_id(cache, model):
+    graph = build_graph(model, "coordinator")
+    streams = []
+    for _ in range(2):
+        chunks = []
+        async for chunk, _ in graph.astream({"question": "hi"}, stream_mode="messages"):
+            chunks.append(chunk)
+        streams.append(chunks)
+
+    assert "".join(chunk.content for chunk in streams[1]) == "first answer"
+    assert streams[0][0].id != streams[1][0].id
+    assert model.calls == 1
+
+
+@pytest.mark.asyncio
+async def test_async_calls_cached(cache, model):
+    async def node(state):
+        response = await model.ainvoke([HumanMessage(content=state["question"])])
+        return {"answer": response.content}
+
+    builder = StateGraph(State)
+    builder.add_node("coordinator", node)
+    builder.add_edge(START, "coordinator")
+    builder.add_edge("coordinator", END)
+    graph = builder.compile()
+
+    assert (await graph.ainvoke({"question": "hi"}))["answer"] == "first answer"
+    assert (await graph.ainvoke({"question": "hi"}))["answer"] == "first answer"
+    assert model.calls == 1
+
+
+def test_entries_expire_and_are_bounded():
+    cache = LLMResponseCache(ttl=10, max_entries=2)
+    messages = [HumanMessage(content="hi")]
+    with patch("src.llms.cache.time.time", return_value=1000.0):
+        cache.put("model", messages, generations("answer"))
+        assert cache.get("model", messages)[0].message.content == "answer"
+        assert cache.get("other model", messages) is None
+    with patch("src.llms.cache.time.time", return_value=1011.0):
+        assert cache.get("model", messages) is None
+
+    for text in ("a", "b", "c"):
+        cache.put("model", [HumanMessage(content=text)], generations(text))
+    assert cache.stats()["entries"] == 2
+    assert cache.get("model", [HumanMessage(content="a")]) is None
+
+
+def test_semantic_tier():
+    cache = LLMResponseCache(semantic_threshold=0.8)
+    system = SystemMessage(content="You are a planner.")
+    cache.put(
+        "model",
+        [system, HumanMessage(content="What is the history of Nanjing tangbao?")],
+        generations("plan"),
+    )
+
+    close = [system, HumanMessage(content="what is the history of nanjing tangbao")]
+    assert cache.get("model", close)[0].message.content == "plan"
+    far = [system, HumanMessage(content="Explain quantum computing and RSA")]
+    assert cache.get("model", far) is None
+    other_system = [SystemMessage(content="You are a coder."), close[1]]
+    assert cache.get("model", other_system) is None
+
+    stats = cache.stats()
+    assert stats["semantic_hits"] == 1
+    assert stats["misses"] == 2
+
+
+def test_llm_factory_uses_cached_class_when_enabled(monkeypatch, cache):
+    monkeypatch.setattr(llm_module, "ChatOpenAI", CountingChatModel)
+    conf = {"BASIC_MODEL": {"messages": iter(["answer"])}}
+
+    with patch("src.llms.llm.get_llm_response_cache", return_value=cache):
+        model = llm_module._create_llm_use_conf("basic", conf)
+    assert type(model).__name__ == "CachedCountingChatModel"
+
+    with patch("src.llms.llm.get_llm_response_cache", return_value=None):
+        model = llm_module._create_llm_use_conf("basic", conf)
+    assert type(model) is CountingChatModel
@@ -0,0 +1,169 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+import asyncio
+import base64
+import os
+from unittest.mock import patch
+
+import pytest
+
+from src.podcast.graph.tts_node import tts_node
+from src.podcast.types import Script, ScriptLine
+
+TTS_ENV = {
+    "VOLCENGINE_TTS_APPID": "test_app_id",
+    "VOLCENGINE_TTS_ACCESS_TOKEN": "test_token",
+}
+
+
+class FakeTTS:
+    running = 0
+    max_running = 0
+    failures = {}
+    calls = []
+
+    def __init__(self, appid, access_token, cluster, voice_type):
+        self.voice_type = voice_type
+
+    async def atext_to_speech(self, text, speed_ratio=1.0, max_retries=None):
+        # The node does not stack HTTP retries on its own
+        assert max_retries == 0
+        FakeTTS.calls.append((text, self.voice_type))
+        FakeTTS.running += 1
+        FakeTTS.max_running = max(FakeTTS.max_running, FakeTTS.running)
+        # Later lines finish first
+        await asyncio.sleep(0.01 / (1 + len(FakeTTS.calls)))
+        FakeTTS.running -= 1
+        if FakeTTS.failures.get(text, 0) > 0:
+            FakeTTS.failures[text] -= 1
+            return {"success": False, "error": "TTS API error", "audio_data": None}
+        return {
+            "success": True,
+            "audio_data": base64.b64encode(text.encode()).decode(),
+        }
+
+
+@pytest.fixture
+def fake_tts():
+    FakeTTS.running = 0
+    FakeTTS.max_running = 0
+    FakeTTS.failures = {}
+    FakeTTS.calls = []
+    with patch("src.podcast.graph.tts_node.VolcengineTTS", FakeTTS):
+        yield FakeTTS
+
+
+def make_state(count):
+    lines = [
+        ScriptLine(speaker="male" if i % 2 else "female", paragraph=f"line {i}")
+        for i in range(count)
+    ]
+    return {"script": Script(lines=lines), "audio_chunks": []}
+
+
+@pytest.mark.asyncio
+@patch.dict(os.environ, {**TTS_ENV, "PODCAST_TTS_CONCURRENCY": "3"})
+async def test_tts_node_keeps_script_order(fake_tts):
+    result = await tts_node(make_state(8))
+
+    assert result["audio_chunks"] == [f"line {i}".encode() for i in range(8)]
+    assert fake_tts.max_running == 3
+    assert ("line 1", "BV002_streaming") in fake_tts.calls
+    assert ("line 2", "BV001_streaming") in fake_tts.calls
+
+
+@pytest.mark.asyncio
+@patch.dict(os.environ, {**TTS_ENV, "PODCAST_TTS_MAX_RETRIES": "1"})
+async def test_tts_node_retries_and_skips_failed_lines(fake_tts):
+    fake_tts.failures = {"line 1": 1, "line 2": 5}
+
+    result = await tts_node(make_state(3))
+
+    assert result["audio_chunks"] == [b"line 0", b"line 1"]
+    assert [text for text, _ in fake_tts.calls].count("line 2") == 2
+
+
+@pytest.mark.asyncio
+@patch.dict(
+    os.environ,
+    {**TTS_ENV, "PODCAST_TTS_CONCURRENCY": "1", "PODCAST_TTS_MAX_RETRIES": "1"},
+)
+async def test_tts_node_releases_slot_during_backoff(fake_tts):
+    fake_tts.failures = {"line 0": 1}
+
+    result = await tts_node(make_state(2))
+
+    assert result["audio_chunks"] == [b"line 0", b"line 1"]
+    # Line 1 runs while line 0 waits for its retry
+    assert [text for text, _ in fake_tts.calls] == ["line 0", "line 1", "line 0"]
+
+
+@pytest.mark.asyncio
+@patch.dict(os.environ, {}, clear=True)
+async def test_tts_node_requires_credentials(fake_tts):
+    with pytest.raises(Exception, match="VOLCENGINE_TTS_APPID is not set"):
+        await tts_node(make_state(1))
+
+
+@pytest.mark.asyncio
+@patch.dict(os.environ, {**TTS_ENV, "PODCAST_TTS_MAX_RETRIES": "0"})
+async def test_podcast_graph_streams_chunks_in_order(fake_tts):
+    from langgraph.graph import END, START, StateGraph
+
+    from src.podcast.graph.audio_mixer_node import audio_mixer_node
+    from src.podcast.graph.state import PodcastState
+
+    fake_tts.failures = {"line 3": 1}
+    builder = StateGraph(PodcastState)
+    builder.add_node("tts", tts_node)
+    builder.add_node("audio_mixer", audio_mixer_node)
+    builder.add_edge(START, "tts")
+    builder.add_edge("tts", "audio_mixer")
+    builder.add_edge("audio_mixer", END)
+    graph = builder.compile()
+
+    events = [
+        event
+        async for event in graph.astream(
+            make_state(5), stream_mode=["custom", "values"]
+        )
+    ]
+
+    chunks = [data for mode, data in events if mode == "custom"]
+    assert [c["line"] for c in chunks] == [0, 1, 2, 4]
+    assert [c["audio_chunk"] for c in chunks] == [
+        b"line 0",
+        b"line 1",
+        b"line 2",
+        b"line 4",
+    ]
+    # The full mix is still produced
+    final_state = [data for mode, data in events if mode == "values"][-1]
+    assert final_state["output"] == b"line 0line 1line 2line 4"
+
+
+@pytest.mark.asyncio
+@patch.dict(os.environ, TTS_ENV)
+async def test_streamed_audio_is_not_kept_in_state(fake_tts):
+    from src.podcast.graph.audio_mixer_node import audio_mixer_node
+
+    state = {**make_state(3), "stream_audio": True}
+
+    assert await tts_node(state) == {}
+    assert audio_mixer_node(state) == {}
+
+
+@pytest.mark.asyncio
+@patch.dict(os.environ, TTS_ENV)
+async def test_tts_node_uses_tts_cache(fake_tts, tmp_path):
+    from src.tools.tts_cache import TTSCache
+
+    cache = TTSCache(str(tmp_path))
+    with patch("src.podcast.graph.tts_node.get_tts_cache", return_value=cache):
+        first = await tts_node(make_state(2))
+        second = await tts_node(make_state(2))
+
+    assert first == second
+    assert len(fake_tts.calls) == 2
+    assert cache.stats()["hits"] == 2
@@ -0,0 +1,110 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+import asyncio
+import sys
+from unittest.mock import patch
+
+import pytest
+
+from src.ppt.graph.ppt_generator_node import ppt_generator_node
+from src.ppt.renderer import MarpRenderer, get_marp_renderer
+
+# Stand-in for marp: reads the markdown from stdin and writes it back upper-cased
+ECHO_SCRIPT = "import sys; sys.stdout.buffer.write(sys.stdin.buffer.read().upper())"
+
+
+def fake_marp(script):
+    return (sys.executable, "-c", script)
+
+
+@pytest.mark.asyncio
+async def test_render_pipes_markdown_through_marp():
+    renderer = MarpRenderer(command=fake_marp(ECHO_SCRIPT))
+
+    output = await renderer.render("# Slide 1\n---\n# Slide 2")
+
+    assert output == b"# SLIDE 1\n---\n# SLIDE 2"
+
+
+@pytest.mark.asyncio
+async def test_render_passes_pptx_stdout_arguments():
+    renderer = MarpRenderer(
+        command=fake_marp("import sys; sys.stdout.write(' '.join(sys.argv[1:]))")
+    )
+
+    assert await renderer.render("# Slide") == b"--pptx -o -"
+
+
+@pytest.mark.asyncio
+async def test_render_raises_on_marp_failure():
+    renderer = MarpRenderer(
+        command=fake_marp("import sys; sys.stderr.write('boom'); sys.exit(3)")
+    )
+
+    with pytest.raises(RuntimeError, match="code 3: boom"):
+        await renderer.render("# Slide")
+
+
+@pytest.mark.asyncio
+async def test_render_raises_on_empty_output():
+    renderer = MarpRenderer(command=fake_marp("pass"))
+
+    with pytest.raises(RuntimeError, match="no output"):
+        await renderer.render("# Slide")
+
+
+@pytest.mark.asyncio
+async def test_render_kills_process_on_timeout():
+    renderer = MarpRenderer(
+        command=fake_marp("import time; time.sleep(30)"), timeout=0.2
+    )
+
+    with pytest.raises(asyncio.TimeoutError):
+        await renderer.render("# Slide")
+
+
+@pytest.mark.asyncio
+async def test_render_caps_running_processes():
+    running = 0
+    max_running = 0
+
+    class FakeProcess:
+        returncode = None
+
+        async def communicate(self, data):
+            nonlocal running, max_running
+            running += 1
+            max_running = max(max_running, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+            self.returncode = 0
+            return data, b""
+
+    async def fake_exec(*args, **kwargs):
+        return FakeProcess()
+
+    renderer = MarpRenderer(max_workers=2)
+    with patch("asyncio.create_subprocess_exec", fake_exec):
+        outputs = await asyncio.gather(
+            *(renderer.render(f"# Slide {i}") for i in range(6))
+        )
+
+    assert outputs == [f"# Slide {i}".encode() for i in range(6)]
+    assert max_running == 2
+
+
+@pytest.mark.asyncio
+async def test_get_marp_renderer_reused_within_loop():
+    assert get_marp_renderer() is get_marp_renderer()
+
+
+@pytest.mark.asyncio
+async def test_ppt_generator_node_returns_pptx_bytes():
+    async def fake_render(markdown):
+        return b"pptx:" + markdown.encode()
+
+    with patch("src.ppt.graph.ppt_generator_node.render_pptx", fake_render):
+        result = await ppt_generator_node({"ppt_content": "# Slide"})
+
+    assert result == {"output": b"pptx:# Slide"}
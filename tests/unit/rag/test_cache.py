@@ -0,0 +1,134 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+from unittest.mock import AsyncMock, Mock, patch
+
+import pytest
+
+from src.rag.builder import build_retriever
+from src.rag.cache import CachedRetriever, RAGCache
+from src.rag.retriever import Chunk, Document, Resource, Retriever
+
+
+@pytest.fixture
+def inner():
+    retriever = Mock(spec=Retriever)
+    retriever.list_resources.return_value = [Resource(uri="rag://dataset/a", title="A")]
+    retriever.query_relevant_documents.return_value = [
+        Document(id="doc1", chunks=[Chunk("text", 0.9)])
+    ]
+    return retriever
+
+
+def test_list_resources_cached_by_query(inner):
+    retriever = CachedRetriever(inner, RAGCache())
+
+    first = retriever.list_resources("Foo")
+    second = retriever.list_resources(" foo ")
+    retriever.list_resources("bar")
+
+    assert inner.list_resources.call_count == 2
+    assert [r.uri for r in second] == [r.uri for r in first]
+    # Callers get their own copy
+    assert second is not first
+    assert retriever.cache.stats()["resources"]["hit_rate"] == pytest.approx(1 / 3)
+
+
+def test_documents_keyed_by_sorted_resources(inner):
+    retriever = CachedRetriever(inner, RAGCache())
+    a = Resource(uri="rag://dataset/a", title="A")
+    b = Resource(uri="rag://dataset/b", title="B")
+
+    retriever.query_relevant_documents("query", [a, b])
+    docs = retriever.query_relevant_documents("query", [b, a])
+    retriever.query_relevant_documents("query", [a])
+
+    assert inner.query_relevant_documents.call_count == 2
+    assert docs[0].chunks[0].content == "text"
+
+
+def test_empty_documents_not_cached(inner):
+    inner.query_relevant_documents.return_value = []
+    retriever = CachedRetriever(inner, RAGCache())
+
+    retriever.query_relevant_documents("query", [])
+    retriever.query_relevant_documents("query", [])
+
+    assert inner.query_relevant_documents.call_count == 2
+
+
+def test_entries_expire(inner):
+    retriever = CachedRetriever(inner, RAGCache(resources_ttl=10))
+
+    with patch("src.rag.cache.time.time", return_value=1000.0):
+        retriever.list_resources()
+    with patch("src.rag.cache.time.time", return_value=1005.0):
+        retriever.list_resources()
+    with patch("src.rag.cache.time.time", return_value=1011.0):
+        retriever.list_resources()
+
+    assert inner.list_resources.call_count == 2
+
+
+def test_invalidation(inner):
+    cache = RAGCache()
+    retriever = CachedRetriever(inner, cache)
+    a = Resource(uri="rag://dataset/a#doc1", title="A")
+    b = Resource(uri="rag://dataset/b", title="B")
+    retriever.list_resources()
+    retriever.query_relevant_documents("one", [a])
+    retriever.query_relevant_documents("two", [b])
+
+    assert cache.invalidate_documents("rag://dataset/a") == 1
+    assert cache.stats()["documents"]["entries"] == 1
+    assert cache.invalidate_resources() == 1
+    cache.clear()
+    assert cache.stats()["documents"]["entries"] == 0
+
+    retriever.query_relevant_documents("two", [b])
+    assert inner.query_relevant_documents.call_count == 3
+
+
+def test_max_entries(inner):
+    retriever = CachedRetriever(inner, RAGCache(max_entries=2))
+
+    for query in ("a", "b", "c", "a"):
+        retriever.list_resources(query)
+
+    assert inner.list_resources.call_count == 4
+
+
+@pytest.mark.asyncio
+async def test_async_calls_share_the_cache(inner):
+    inner.alist_resources = AsyncMock(return_value=[])
+    inner.aquery_relevant_documents = AsyncMock(
+        return_value=[Document(id="doc1", chunks=[Chunk("text", 0.9)])]
+    )
+    retriever = CachedRetriever(inner, RAGCache())
+    resources = [Resource(uri="rag://dataset/a", title="A")]
+
+    retriever.query_relevant_documents("query", resources)
+    docs = await retriever.aquery_relevant_documents("query", resources)
+    await retriever.aquery_relevant_documents("other", resources)
+    await retriever.aquery_relevant_documents("other", resources)
+    await retriever.alist_resources("x")
+    await retriever.alist_resources("x")
+
+    assert docs[0].id == "doc1"
+    assert inner.aquery_relevant_documents.await_count == 1
+    assert inner.alist_resources.await_count == 1
+
+
+def test_build_retriever_wraps_provider_when_enabled(monkeypatch):
+    monkeypatch.setenv("RAGFLOW_API_URL", "http://api")
+    monkeypatch.setenv("RAGFLOW_API_KEY", "key")
+    monkeypatch.setattr("src.rag.builder.SELECTED_RAG_PROVIDER", "ragflow")
+    cache = RAGCache()
+
+    monkeypatch.setattr("src.rag.builder.get_rag_cache", lambda: cache)
+    retriever = build_retriever()
+    assert isinstance(retriever, CachedRetriever)
+    assert retriever.cache is cache
+
+    monkeypatch.setattr("src.rag.builder.get_rag_cache", lambda: None)
+    assert not isinstance(build_retriever(), CachedRetriever)
@@ -0,0 +1,159 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+import numpy as np
+import pytest
+
+from src.rag.builder import build_retriever
+from src.rag.local import HashingEmbedder, LocalRetriever, split_text
+from src.rag.retriever import Resource
+
+DOCS = [
+    ("tangbao", "Nanjing tangbao are soup dumplings filled with pork and broth.", None),
+    ("sora", "Sora is a video generation model released by OpenAI.", "Sora"),
+    ("mcp", "The model context protocol connects tools to language models.", None),
+]
+
+
+@pytest.fixture
+def retriever():
+    retriever = LocalRetriever()
+    retriever.add_documents("notes", DOCS)
+    retriever.add_document("food", "dumplings", "Dumplings are steamed or fried.")
+    return retriever
+
+
+def test_hashing_embedder_unit_vectors():
+    embedder = HashingEmbedder(dim=64)
+    vectors = embedder.embed_documents(["soup dumplings", "", "南京汤包"])
+    assert vectors.shape == (3, 64)
+    assert np.linalg.norm(vectors[0]) == pytest.approx(1.0)
+    assert not vectors[1].any()
+    assert np.linalg.norm(vectors[2]) == pytest.approx(1.0)
+    # Deterministic across calls, and across processes as crc32 is not salted
+    assert np.array_equal(embedder.embed_query("soup dumplings"), vectors[0])
+
+
+def test_split_text_on_paragraphs():
+    text = "one\n\ntwo\n\n" + "x" * 25
+    assert split_text(text, chunk_size=10) == [
+        "one\n\ntwo",
+        "x" * 10,
+        "x" * 10,
+        "x" * 5,
+    ]
+
+
+def test_query_relevant_documents(retriever):
+    docs = retriever.query_relevant_documents("video generation model")
+    assert docs[0].id == "sora"
+    assert docs[0].title == "Sora"
+    assert docs[0].url == "rag://dataset/notes#sora"
+    similarities = [doc.chunks[0].similarity for doc in docs]
+    assert similarities == sorted(similarities, reverse=True)
+
+
+def test_query_filtered_by_resources(retriever):
+    dataset = [Resource(uri="rag://dataset/food", title="food")]
+    docs = retriever.query_relevant_documents("soup dumplings", dataset)
+    assert [doc.id for doc in docs] == ["dumplings"]
+
+    document = [Resource(uri="rag://dataset/notes#mcp", title="mcp")]
+    docs = retriever.query_relevant_documents("soup dumplings", document)
+    assert [doc.id for doc in docs] == ["mcp"]
+
+    missing = [Resource(uri="rag://dataset/missing", title="missing")]
+    assert retriever.query_relevant_documents("soup dumplings", missing) == []
+
+
+def test_batched_search(retriever):
+    results = retriever.batch_query_relevant_documents(
+        ["soup dumplings pork", "protocol for tools"]
+    )
+    assert results[0][0].id == "tangbao"
+    assert results[1][0].id == "mcp"
+    assert len(retriever.search(["dumplings"], top_k=2)[0]) == 2
+
+
+def test_replacing_and_removing_documents(retriever):
+    retriever.add_document("notes", "sora", "Nothing about videos anymore.")
+    assert len(retriever) == 4
+    docs = retriever.query_relevant_documents("video generation model")
+    assert docs[0].chunks[0].content != DOCS[1][1]
+
+    retriever.remove_dataset("notes")
+    assert [r.uri for r in retriever.list_resources()] == ["rag://dataset/food"]
+    assert [doc.id for doc in retriever.query_relevant_documents("dumplings")] == [
+        "dumplings"
+    ]
+
+
+def test_list_resources(retriever):
+    resources = retriever.list_resources()
+    assert [(r.uri, r.description) for r in resources] == [
+        ("rag://dataset/food", "1 documents"),
+        ("rag://dataset/notes", "3 documents"),
+    ]
+    assert [r.title for r in retriever.list_resources("NOT")] == ["notes"]
+
+
+def test_invalid_dataset_name():
+    with pytest.raises(ValueError):
+        LocalRetriever().add_document("bad/name", "doc", "text")
+
+
+def test_save_and_load_memory_mapped(retriever, tmp_path):
+    retriever.save(str(tmp_path))
+
+    loaded = LocalRetriever(path=str(tmp_path))
+
+    assert isinstance(loaded._matrix, np.memmap)
+    assert len(loaded) == len(retriever)
+    assert loaded.query_relevant_documents("video generation")[0].id == "sora"
+    # Documents can still be added to a loaded collection
+    loaded.add_document("notes", "extra", "Extra note about rockets.")
+    assert loaded.query_relevant_documents("rockets")[0].id == "extra"
+
+
+def test_ingest_path(tmp_path):
+    docs = tmp_path / "kb"
+    (docs / "sub").mkdir(parents=True)
+    (docs / "a.md").write_text("Quantum computing breaks RSA.")
+    (docs / "sub" / "b.txt").write_text("Bitcoin price fluctuation.")
+    (docs / "image.png").write_bytes(b"\x89PNG")
+
+    retriever = LocalRetriever()
+    assert retriever.ingest_path(str(docs)) == 2
+
+    found = retriever.query_relevant_documents("bitcoin price")[0]
+    assert found.url == "rag://dataset/kb#sub/b.txt"
+    assert found.title == "b"
+
+
+def test_approximate_index_matches_exact_search():
+    rng = np.random.default_rng(1)
+    words = [f"word{i}" for i in range(300)]
+    texts = [" ".join(rng.choice(words, 12)) for _ in range(400)]
+    exact = LocalRetriever(ivf_min_chunks=10**9)
+    approximate = LocalRetriever(ivf_min_chunks=100, nprobe=3)
+    for retriever in (exact, approximate):
+        retriever.add_documents(
+            "corpus", [(str(i), t, None) for i, t in enumerate(texts)]
+        )
+
+    queries = texts[:20]
+    exact_hits = exact.search(queries, top_k=1)
+    approximate_hits = approximate.search(queries, top_k=1)
+
+    assert approximate._centroids is not None
+    # Each text finds itself
+    assert [hits[0][0] for hits in exact_hits] == list(range(20))
+    assert [hits[0][0] for hits in approximate_hits] == list(range(20))
+
+
+def test_build_local_retriever(monkeypatch):
+    monkeypatch.setattr("src.rag.builder.SELECTED_RAG_PROVIDER", "local")
+    monkeypatch.setattr("src.rag.builder.get_rag_cache", lambda: None)
+    local = LocalRetriever()
+    monkeypatch.setattr("src.rag.builder.get_local_retriever", lambda: local)
+    assert build_retriever() is local
@@ -1,10 +1,11 @@
 # Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
 # SPDX-License-Identifier: MIT
 
+import asyncio
 import os
 import pytest
 import requests
-from unittest.mock import patch, MagicMock
+from unittest.mock import AsyncMock, patch, MagicMock
 from src.rag.ragflow import RAGFlowProvider, parse_uri
 
 
@@ -25,6 +26,7 @@ class DummyChunk:
 class DummyDocument:
     def __init__(self, id, title, chunks=None):
         self.id = id
+        self.url = None
         self.title = title
         self.chunks = chunks or []
 
@@ -81,7 +83,7 @@ def test_init_missing_env(monkeypatch):
         RAGFlowProvider()
 
 
-@patch("src.rag.ragflow.requests.post")
+@patch("src.rag.ragflow.http_client.post")
 def test_query_relevant_documents_success(mock_post, monkeypatch):
     monkeypatch.setenv("RAGFLOW_API_URL", "http://api")
     monkeypatch.setenv("RAGFLOW_API_KEY", "key")
@@ -107,7 +109,7 @@ def test_query_relevant_documents_success(mock_post, monkeypatch):
     assert docs[0].chunks[0].similarity == 0.9
 
 
-@patch("src.rag.ragflow.requests.post")
+@patch("src.rag.ragflow.http_client.post")
 def test_query_relevant_documents_error(mock_post, monkeypatch):
     monkeypatch.setenv("RAGFLOW_API_URL", "http://api")
     monkeypatch.setenv("RAGFLOW_API_KEY", "key")
@@ -120,7 +122,7 @@ def test_query_relevant_documents_error(mock_post, monkeypatch):
         provider.query_relevant_documents("query", [])
 
 
-@patch("src.rag.ragflow.requests.get")
+@patch("src.rag.ragflow.http_client.get")
 def test_list_resources_success(mock_get, monkeypatch):
     monkeypatch.setenv("RAGFLOW_API_URL", "http://api")
     monkeypatch.setenv("RAGFLOW_API_KEY", "key")
@@ -144,7 +146,7 @@ def test_list_resources_success(mock_get, monkeypatch):
     assert resources[1].description == "desc2"
 
 
-@patch("src.rag.ragflow.requests.get")
+@patch("src.rag.ragflow.http_client.get")
 def test_list_resources_success(mock_get, monkeypatch):
     monkeypatch.setenv("RAGFLOW_API_URL", "http://api")
     monkeypatch.setenv("RAGFLOW_API_KEY", "key")
@@ -168,7 +170,7 @@ def test_list_resources_success(mock_get, monkeypatch):
     assert resources[1].description == "desc2"
 
 
-@patch("src.rag.ragflow.requests.get")
+@patch("src.rag.ragflow.http_client.get")
 def test_list_resources_error(mock_get, monkeypatch):
     monkeypatch.setenv("RAGFLOW_API_URL", "http://api")
     monkeypatch.setenv("RAGFLOW_API_KEY", "key")
@@ -179,3 +181,181 @@ def test_list_resources_error(mock_get, monkeypatch):
     mock_get.return_value = mock_response
     with pytest.raises(Exception):
         provider.list_resources()
+
+
+@pytest.mark.asyncio
+@patch("src.rag.ragflow.http_client.apost", new_callable=AsyncMock)
+async def test_aquery_relevant_documents_success(mock_apost, monkeypatch):
+    monkeypatch.setenv("RAGFLOW_API_URL", "http://api")
+    monkeypatch.setenv("RAGFLOW_API_KEY", "key")
+    provider = RAGFlowProvider()
+    mock_response = MagicMock()
+    mock_response.status_code = 200
+    mock_response.json.return_value = {
+        "data": {
+            "doc_aggs": [{"doc_id": "doc456", "doc_name": "Doc Title"}],
+            "chunks": [
+                {"document_id": "doc456", "content": "chunk text", "similarity": 0.9}
+            ],
+        }
+    }
+    mock_apost.return_value = mock_response
+    resource = DummyResource("rag://dataset/123#doc456")
+    docs = await provider.aquery_relevant_documents("query", [resource])
+    assert len(docs) == 1
+    assert docs[0].chunks[0].content == "chunk text"
+    payload = mock_apost.call_args.kwargs["json"]
+    assert payload["dataset_ids"] == ["123"]
+    assert payload["document_ids"] == ["doc456"]
+
+
+@pytest.mark.asyncio
+@patch("src.rag.ragflow.http_client.aget", new_callable=AsyncMock)
+async def test_alist_resources_error(mock_aget, monkeypatch):
+    monkeypatch.setenv("RAGFLOW_API_URL", "http://api")
+    monkeypatch.setenv("RAGFLOW_API_KEY", "key")
+    provider = RAGFlowProvider()
+    mock_response = MagicMock()
+    mock_response.status_code = 500
+    mock_response.text = "fail"
+    mock_aget.return_value = mock_response
+    with pytest.raises(Exception):
+        await provider.alist_resources()
+
+
+def make_retrieval_response(chunks):
+    mock_response = MagicMock()
+    mock_response.status_code = 200
+    mock_response.json.return_value = {
+        "data": {
+            "doc_aggs": [
+                {"doc_id": doc_id, "doc_name": doc_id.upper()}
+                for doc_id in dict.fromkeys(doc_id for doc_id, _, _ in chunks)
+            ],
+            "chunks": [
+                {"document_id": doc_id, "content": content, "similarity": similarity}
+                for doc_id, content, similarity in chunks
+            ],
+        }
+    }
+    return mock_response
+
+
+def test_group_resources_by_dataset(monkeypatch):
+    monkeypatch.setenv("RAGFLOW_API_URL", "http://api")
+    monkeypatch.setenv("RAGFLOW_API_KEY", "key")
+    provider = RAGFlowProvider()
+    groups = provider._group_resources(
+        [
+            DummyResource("rag://dataset/a#doc1"),
+            DummyResource("rag://dataset/b"),
+            DummyResource("rag://dataset/a#doc2"),
+            DummyResource("rag://dataset/b#doc3"),
+        ]
+    )
+    assert [[r.uri for r in group] for group in groups] == [
+        ["rag://dataset/a#doc1", "rag://dataset/a#doc2"],
+        ["rag://dataset/b"],
+    ]
+
+
+@pytest.mark.asyncio
+@patch("src.rag.ragflow.http_client.apost", new_callable=AsyncMock)
+async def test_aquery_relevant_documents_fans_out_per_dataset(mock_apost, monkeypatch):
+    monkeypatch.setenv("RAGFLOW_API_URL", "http://api")
+    monkeypatch.setenv("RAGFLOW_API_KEY", "key")
+    monkeypatch.setenv("RAGFLOW_TOP_K", "3")
+    provider = RAGFlowProvider()
+    responses = {
+        "a": [("doc1", "shared", 0.5), ("doc1", "a only", 0.9)],
+        "b": [("doc2", "shared", 0.7), ("doc2", "b low", 0.1), ("doc2", "b", 0.6)],
+    }
+    running = 0
+    max_running = 0
+
+    async def fake_apost(url, headers, json):
+        nonlocal running, max_running
+        running += 1
+        max_running = max(max_running, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+        return make_retrieval_response(responses[json["dataset_ids"][0]])
+
+    mock_apost.side_effect = fake_apost
+    docs = await provider.aquery_relevant_documents(
+        "query", [DummyResource("rag://dataset/a"), DummyResource("rag://dataset/b")]
+    )
+
+    assert mock_apost.await_count == 2
+    assert max_running == 2
+    assert [doc.id for doc in docs] == ["doc1", "doc2"]
+    assert [c.content for c in docs[0].chunks] == ["a only"]
+    # The duplicated chunk is kept once, with its best similarity
+    assert [(c.content, c.similarity) for c in docs[1].chunks] == [
+        ("shared", 0.7),
+        ("b", 0.6),
+    ]
+
+
+@pytest.mark.asyncio
+@patch("src.rag.ragflow.http_client.apost", new_callable=AsyncMock)
+async def test_aquery_relevant_documents_respects_latency_budget(
+    mock_apost, monkeypatch
+):
+    monkeypatch.setenv("RAGFLOW_API_URL", "http://api")
+    monkeypatch.setenv("RAGFLOW_API_KEY", "key")
+    monkeypatch.setenv("RAGFLOW_RETRIEVAL_TIMEOUT", "0.05")
+    provider = RAGFlowProvider()
+    cancelled = []
+
+    async def fake_apost(url, headers, json):
+        if json["dataset_ids"] == ["slow"]:
+            try:
+                await asyncio.sleep(5)
+            except asyncio.CancelledError:
+                await asyncio.sleep(0)
+                cancelled.append("slow")
+                raise
+        return make_retrieval_response([("doc1", "fast", 0.8)])
+
+    mock_apost.side_effect = fake_apost
+    docs = await asyncio.wait_for(
+        provider.aquery_relevant_documents(
+            "query",
+            [DummyResource("rag://dataset/fast"), DummyResource("rag://dataset/slow")],
+        ),
+        timeout=1,
+    )
+
+    assert [doc.id for doc in docs] == ["doc1"]
+    # The slow request was cancelled before the call returned
+    assert cancelled == ["slow"]
+
+
+@pytest.mark.asyncio
+@patch("src.rag.ragflow.http_client.apost", new_callable=AsyncMock)
+async def test_aquery_relevant_documents_partial_failure(mock_apost, monkeypatch):
+    monkeypatch.setenv("RAGFLOW_API_URL", "http://api")
+    monkeypatch.setenv("RAGFLOW_API_KEY", "key")
+    provider = RAGFlowProvider()
+    error_response = MagicMock()
+    error_response.status_code = 500
+    error_response.text = "fail"
+
+    async def fake_apost(url, headers, json):
+        if json["dataset_ids"] == ["broken"]:
+            return error_response
+        return make_retrieval_response([("doc1", "ok", 0.8)])
+
+    mock_apost.side_effect = fake_apost
+    resources = [
+        DummyResource("rag://dataset/ok"),
+        DummyResource("rag://dataset/broken"),
+    ]
+    docs = await provider.aquery_relevant_documents("query", resources)
+    assert [doc.id for doc in docs] == ["doc1"]
+
+    mock_apost.side_effect = None
+    mock_apost.return_value = error_response
+    with pytest.raises(Exception, match="Failed to query documents"):
+        await provider.aquery_relevant_documents("query", resources)
@@ -1,8 +1,17 @@
 # Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
 # SPDX-License-Identifier: MIT
 
+import json
+
 import pytest
-from src.rag.retriever import Chunk, Document, Resource, Retriever
+from src.rag.retriever import (
+    Chunk,
+    Document,
+    Resource,
+    Retriever,
+    documents_to_json,
+    merge_documents,
+)
 
 
 def test_chunk_init():
@@ -70,3 +79,76 @@ def test_retriever_abstract_methods():
 def test_retriever_cannot_instantiate():
     with pytest.raises(TypeError):
         Retriever()
+
+
+def test_merge_documents_dedupes_and_ranks_chunks():
+    first = [
+        Document(id="doc1", title="One", chunks=[Chunk("a", 0.4), Chunk("b", 0.9)]),
+    ]
+    second = [
+        Document(id="doc2", chunks=[Chunk("a", 0.6), Chunk("c", 0.2)]),
+        Document(id="doc3", chunks=[Chunk("d", None)]),
+    ]
+    merged = merge_documents([first, second])
+    assert [doc.id for doc in merged] == ["doc1", "doc2", "doc3"]
+    assert merged[0].title == "One"
+    assert [c.content for c in merged[0].chunks] == ["b"]
+    assert [(c.content, c.similarity) for c in merged[1].chunks] == [
+        ("a", 0.6),
+        ("c", 0.2),
+    ]
+    # The input documents are left untouched
+    assert [c.content for c in first[0].chunks] == ["a", "b"]
+
+
+def test_merge_documents_top_k():
+    docs = [
+        Document(id="doc1", chunks=[Chunk("a", 0.1), Chunk("b", 0.8)]),
+        Document(id="doc2", chunks=[Chunk("c", 0.5)]),
+    ]
+    merged = merge_documents([docs], top_k=2)
+    assert [(doc.id, [c.content for c in doc.chunks]) for doc in merged] == [
+        ("doc1", ["b"]),
+        ("doc2", ["c"]),
+    ]
+
+
+def test_chunk_and_document_are_slotted():
+    doc = Document(id="doc1", chunks=[Chunk("a", 0.1)])
+    assert not hasattr(doc, "__dict__")
+    assert not hasattr(doc.chunks[0], "__dict__")
+    with pytest.raises(AttributeError):
+        doc.extra = "value"
+
+
+def test_document_default_chunks_not_shared():
+    first = Document(id="doc1")
+    first.chunks.append(Chunk("a", 0.1))
+    assert Document(id="doc2").chunks == []
+
+
+def test_document_content_cached_until_chunks_added():
+    doc = Document(id="doc1", chunks=[Chunk("a", 0.1)])
+    assert doc.content is doc.content
+    doc.chunks.append(Chunk("b", 0.2))
+    assert doc.content == "a\n\nb"
+    doc.chunks = [Chunk("c", 0.3)]
+    assert doc.to_dict()["content"] == "c"
+
+
+def test_documents_to_json_matches_json_dumps():
+    docs = [
+        Document(
+            id='doc "1"',
+            url="rag://dataset/a#doc1",
+            title="Titre été",
+            chunks=[
+                Chunk('line\n"quoted"\tand \\', 0.9),
+                Chunk("南京汤包 \u2028", 0.5),
+            ],
+        ),
+        Document(id="doc2"),
+    ]
+    expected = json.dumps([doc.to_dict() for doc in docs], ensure_ascii=False)
+    assert documents_to_json(docs) == expected
+    assert documents_to_json([]) == "[]"
@@ -4,16 +4,22 @@
 import base64
 import json
 import os
-from unittest.mock import AsyncMock, MagicMock, patch, mock_open
+from unittest.mock import AsyncMock, MagicMock, patch
 from uuid import uuid4
 from fastapi.responses import JSONResponse, StreamingResponse
 import pytest
 from fastapi.testclient import TestClient
 from fastapi import HTTPException, logger
-from src.server.app import app, _make_event, _astream_workflow_generator
+from src.server.app import (
+    app,
+    _make_event,
+    _astream_workflow_generator,
+    graph_registry,
+)
 from src.server.mcp_request import MCPServerMetadataRequest
 from src.server.rag_request import RAGResourceRequest
 from src.config.report_style import ReportStyle
+from src.tools.tts_cache import TTSCache
 from langgraph.types import Command
 from langchain_core.messages import ToolMessage
 from langchain_core.messages import AIMessageChunk
@@ -33,6 +39,15 @@ def client():
     return TestClient(app)
 
 
+@pytest.fixture(autouse=True)
+def clear_graph_registry():
+    # Graphs are compiled once per process, recompile them from the patched
+    # builders in every test
+    graph_registry.clear()
+    yield
+    graph_registry.clear()
+
+
 class TestMakeEvent:
     def test_make_event_with_content(self):
         event_type = "message_chunk"
@@ -73,11 +88,12 @@ class TestTTSEndpoint:
     @patch("src.server.app.VolcengineTTS")
     def test_tts_success(self, mock_tts_class, client):
         mock_tts_instance = MagicMock()
+        mock_tts_instance.atext_to_speech = AsyncMock()
         mock_tts_class.return_value = mock_tts_instance
 
         # Mock successful TTS response
         audio_data_b64 = base64.b64encode(b"fake_audio_data").decode()
-        mock_tts_instance.text_to_speech.return_value = {
+        mock_tts_instance.atext_to_speech.return_value = {
             "success": True,
             "audio_data": audio_data_b64,
         }
@@ -99,6 +115,35 @@ class TestTTSEndpoint:
         assert response.headers["content-type"] == "audio/mp3"
         assert b"fake_audio_data" in response.content
 
+    @patch.dict(
+        os.environ,
+        {
+            "VOLCENGINE_TTS_APPID": "test_app_id",
+            "VOLCENGINE_TTS_ACCESS_TOKEN": "test_token",
+        },
+    )
+    @patch("src.server.app.VolcengineTTS")
+    def test_tts_uses_cache(self, mock_tts_class, client, tmp_path):
+        from src.tools.tts_cache import TTSCache
+
+        mock_tts_instance = MagicMock()
+        mock_tts_instance.atext_to_speech = AsyncMock()
+        mock_tts_class.return_value = mock_tts_instance
+        mock_tts_instance.atext_to_speech.return_value = {
+            "success": True,
+            "audio_data": base64.b64encode(b"fake_audio_data").decode(),
+        }
+        request_data = {"text": "Hello world", "encoding": "mp3"}
+
+        with patch(
+            "src.server.app.get_tts_cache", return_value=TTSCache(str(tmp_path))
+        ):
+            first = client.post("/api/tts", json=request_data)
+            second = client.post("/api/tts", json=request_data)
+
+        assert first.content == second.content == b"fake_audio_data"
+        mock_tts_instance.atext_to_speech.assert_awaited_once()
+
     @patch.dict(os.environ, {}, clear=True)
     def test_tts_missing_app_id(self, client):
         request_data = {"text": "Hello world", "encoding": "mp3"}
@@ -130,10 +175,11 @@ class TestTTSEndpoint:
     @patch("src.server.app.VolcengineTTS")
     def test_tts_api_error(self, mock_tts_class, client):
         mock_tts_instance = MagicMock()
+        mock_tts_instance.atext_to_speech = AsyncMock()
         mock_tts_class.return_value = mock_tts_instance
 
         # Mock TTS error response
-        mock_tts_instance.text_to_speech.return_value = {
+        mock_tts_instance.atext_to_speech.return_value = {
             "success": False,
             "error": "TTS API error",
         }
@@ -162,12 +208,18 @@ class TestTTSEndpoint:
         assert "Internal Server Error" in response.json()["detail"]
 
 
+_PODCAST_TTS_ENV = {
+    "VOLCENGINE_TTS_APPID": "test_app_id",
+    "VOLCENGINE_TTS_ACCESS_TOKEN": "test_token",
+}
+
+
 class TestPodcastEndpoint:
     @patch("src.server.app.build_podcast_graph")
     def test_generate_podcast_success(self, mock_build_graph, client):
         mock_workflow = MagicMock()
         mock_build_graph.return_value = mock_workflow
-        mock_workflow.invoke.return_value = {"output": b"fake_audio_data"}
+        mock_workflow.ainvoke = AsyncMock(return_value={"output": b"fake_audio_data"})
 
         request_data = {"content": "Test content for podcast"}
 
@@ -177,6 +229,129 @@ class TestPodcastEndpoint:
         assert response.headers["content-type"] == "audio/mp3"
         assert response.content == b"fake_audio_data"
 
+    @patch.dict(os.environ, _PODCAST_TTS_ENV)
+    @patch("src.server.app.build_podcast_graph")
+    def test_generate_podcast_stream(self, mock_build_graph, client):
+        async def astream(input, stream_mode):
+            assert stream_mode == "custom"
+            yield {"audio_chunk": b"line 0 ", "line": 0}
+            yield {"progress": "ignored"}
+            yield {"audio_chunk": b"line 1", "line": 1}
+
+        mock_workflow = MagicMock()
+        mock_workflow.astream = astream
+        mock_build_graph.return_value = mock_workflow
+
+        request_data = {"content": "Test content for podcast", "stream": True}
+
+        response = client.post("/api/podcast/generate", json=request_data)
+
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "audio/mp3"
+        assert response.content == b"line 0 line 1"
+
+    @patch.dict(os.environ, _PODCAST_TTS_ENV)
+    @patch("src.server.app.build_podcast_graph")
+    def test_generate_podcast_stream_caches_full_mix(
+        self, mock_build_graph, client, tmp_path
+    ):
+        inputs = []
+
+        async def astream(input, stream_mode):
+            inputs.append(input)
+            yield {"audio_chunk": b"line 0 ", "line": 0}
+            yield {"audio_chunk": b"line 1", "line": 1}
+
+        mock_build_graph.return_value.astream = astream
+        cache = TTSCache(str(tmp_path))
+        request_data = {"content": "Test content for podcast", "stream": True}
+
+        with patch("src.server.app.get_tts_cache", return_value=cache):
+            first = client.post("/api/podcast/generate", json=request_data)
+            second = client.post("/api/podcast/generate", json=request_data)
+
+        assert first.content == second.content == b"line 0 line 1"
+        # The second request is served from the cache
+        assert len(inputs) == 1
+        assert inputs[0]["stream_audio"] is True
+        assert cache.stats()["entries"] == 1
+
+    @patch.dict(os.environ, _PODCAST_TTS_ENV)
+    @patch("src.server.app.build_podcast_graph")
+    def test_generate_podcast_stream_does_not_cache_truncated_mix(
+        self, mock_build_graph, client, tmp_path
+    ):
+        async def astream(input, stream_mode):
+            yield {"audio_chunk": b"line 0", "line": 0}
+            raise RuntimeError("tts failed")
+
+        mock_build_graph.return_value.astream = astream
+        cache = TTSCache(str(tmp_path))
+        request_data = {"content": "Test content for podcast", "stream": True}
+
+        with patch("src.server.app.get_tts_cache", return_value=cache):
+            response = client.post("/api/podcast/generate", json=request_data)
+
+        assert response.content == b"line 0"
+        assert cache.stats()["entries"] == 0
+        assert list(tmp_path.iterdir()) == []
+
+    @patch.dict(os.environ, {}, clear=True)
+    @patch("src.server.app.build_podcast_graph")
+    def test_generate_podcast_stream_missing_config(self, mock_build_graph, client):
+        request_data = {"content": "Test content for podcast", "stream": True}
+
+        response = client.post("/api/podcast/generate", json=request_data)
+
+        assert response.status_code == 500
+        mock_build_graph.return_value.astream.assert_not_called()
+
+    @patch.dict(os.environ, _PODCAST_TTS_ENV)
+    @patch("src.server.app.build_podcast_graph")
+    def test_generate_podcast_stream_error_before_audio(self, mock_build_graph, client):
+        async def astream(input, stream_mode):
+            raise RuntimeError("script failed")
+            yield
+
+        mock_build_graph.return_value.astream = astream
+
+        request_data = {"content": "Test content for podcast", "stream": True}
+
+        response = client.post("/api/podcast/generate", json=request_data)
+
+        assert response.status_code == 500
+        assert response.json()["detail"] == "Internal Server Error"
+
+    @patch.dict(os.environ, _PODCAST_TTS_ENV)
+    @patch("src.server.app.build_podcast_graph")
+    def test_generate_podcast_stream_error_after_audio(self, mock_build_graph, client):
+        async def astream(input, stream_mode):
+            yield {"audio_chunk": b"line 0", "line": 0}
+            raise RuntimeError("tts failed")
+
+        mock_build_graph.return_value.astream = astream
+
+        request_data = {"content": "Test content for podcast", "stream": True}
+
+        response = client.post("/api/podcast/generate", json=request_data)
+
+        # The audio was already sent, the stream is truncated
+        assert response.status_code == 200
+        assert response.content == b"line 0"
+
+    @patch("src.server.app.build_podcast_graph")
+    def test_generate_podcast_reuses_compiled_graph(self, mock_build_graph, client):
+        mock_workflow = MagicMock()
+        mock_build_graph.return_value = mock_workflow
+        mock_workflow.ainvoke = AsyncMock(return_value={"output": b"fake_audio_data"})
+
+        for _ in range(3):
+            response = client.post("/api/podcast/generate", json={"content": "Test"})
+            assert response.status_code == 200
+
+        mock_build_graph.assert_called_once()
+        assert graph_registry.stats()["podcast"]["invocations"] == 3
+
     @patch("src.server.app.build_podcast_graph")
     def test_generate_podcast_error(self, mock_build_graph, client):
         mock_build_graph.side_effect = Exception("Podcast generation failed")
@@ -191,13 +366,10 @@ class TestPodcastEndpoint:
 
 class TestPPTEndpoint:
     @patch("src.server.app.build_ppt_graph")
-    @patch("builtins.open", new_callable=mock_open, read_data=b"fake_ppt_data")
-    def test_generate_ppt_success(self, mock_file, mock_build_graph, client):
+    def test_generate_ppt_success(self, mock_build_graph, client):
         mock_workflow = MagicMock()
         mock_build_graph.return_value = mock_workflow
-        mock_workflow.invoke.return_value = {
-            "generated_file_path": "/fake/path/test.pptx"
-        }
+        mock_workflow.ainvoke = AsyncMock(return_value={"output": b"fake_ppt_data"})
 
         request_data = {"content": "Test content for PPT"}
 
@@ -339,7 +511,8 @@ class TestRAGEndpoints:
     @patch("src.server.app.build_retriever")
     def test_rag_resources_with_retriever(self, mock_build_retriever, client):
         mock_retriever = MagicMock()
-        mock_retriever.list_resources.return_value = [
+        mock_retriever.alist_resources = AsyncMock()
+        mock_retriever.alist_resources.return_value = [
             {
                 "uri": "test_uri",
                 "title": "Test Resource",
@@ -439,6 +612,38 @@ class TestAstreamWorkflowGenerator:
         # Check for the actual agent name that appears in the output
         assert '"agent": "a"' in events[0]
 
+    @pytest.mark.asyncio
+    @patch("src.server.app.graph")
+    async def test_astream_workflow_generator_passes_max_concurrent_steps(
+        self, mock_graph
+    ):
+        configs = []
+
+        async def mock_astream(input_, config, **kwargs):
+            configs.append(config)
+            return
+            yield
+
+        mock_graph.astream = mock_astream
+
+        generator = _astream_workflow_generator(
+            messages=[{"role": "user", "content": "Hello"}],
+            thread_id="test_thread",
+            resources=[],
+            max_plan_iterations=3,
+            max_step_num=10,
+            max_search_results=5,
+            auto_accepted_plan=True,
+            interrupt_feedback="",
+            mcp_settings={},
+            enable_background_investigation=False,
+            report_style=ReportStyle.ACADEMIC,
+            enable_deep_thinking=False,
+            max_concurrent_steps=4,
+        )
+        assert [event async for event in generator] == []
+        assert configs[0]["max_concurrent_steps"] == 4
+
     @pytest.mark.asyncio
     @patch("src.server.app.graph")
     async def test_astream_workflow_generator_with_interrupt_feedback(self, mock_graph):
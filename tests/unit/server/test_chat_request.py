@@ -62,6 +62,7 @@ def test_chat_request_defaults():
     assert req.mcp_settings is None
     assert req.enable_background_investigation is True
     assert req.report_style == ReportStyle.ACADEMIC
+    assert req.max_concurrent_steps == 1
 
 
 def test_chat_request_with_values():
@@ -82,6 +83,7 @@ def test_chat_request_with_values():
         mcp_settings={"foo": "bar"},
         enable_background_investigation=False,
         report_style="academic",
+        max_concurrent_steps=4,
     )
     assert req.messages[0].role == "user"
     assert req.debug is True
@@ -94,6 +96,7 @@ def test_chat_request_with_values():
     assert req.mcp_settings == {"foo": "bar"}
     assert req.enable_background_investigation is False
     assert req.report_style == ReportStyle.ACADEMIC
+    assert req.max_concurrent_steps == 4
 
 
 def test_tts_request_defaults():
@@ -112,6 +115,7 @@ def test_tts_request_defaults():
 def test_generate_podcast_request():
     req = GeneratePodcastRequest(content="Podcast content")
     assert req.content == "Podcast content"
+    assert req.stream is False
 
 
 def test_generate_ppt_request():
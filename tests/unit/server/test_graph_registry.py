@@ -0,0 +1,91 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+import asyncio
+import threading
+from unittest.mock import MagicMock
+
+import pytest
+
+from src.server.graph_registry import GraphRegistry
+
+
+def test_graph_is_compiled_once():
+    builder = MagicMock(side_effect=lambda: object())
+    registry = GraphRegistry()
+    registry.register("podcast", builder)
+
+    graphs = []
+    threads = [
+        threading.Thread(target=lambda: graphs.append(registry.get("podcast")))
+        for _ in range(8)
+    ]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    builder.assert_called_once()
+    assert all(graph is graphs[0] for graph in graphs)
+
+
+def test_warm_up_and_clear():
+    registry = GraphRegistry()
+    podcast = MagicMock()
+    ppt = MagicMock()
+    registry.register("podcast", podcast)
+    registry.register("ppt", ppt)
+
+    registry.warm_up()
+    podcast.assert_called_once()
+    ppt.assert_called_once()
+
+    registry.clear()
+    registry.get("ppt")
+    assert ppt.call_count == 2
+
+
+def test_unknown_graph():
+    with pytest.raises(KeyError):
+        GraphRegistry().get("unknown")
+
+
+def test_track_records_invocations():
+    registry = GraphRegistry()
+    registry.register("prose", MagicMock())
+    registry.get("prose")
+
+    with registry.track("prose"):
+        pass
+    with pytest.raises(ValueError):
+        with registry.track("prose"):
+            raise ValueError("failed")
+
+    stats = registry.stats()["prose"]
+    assert stats["invocations"] == 2
+    assert stats["errors"] == 1
+    assert stats["compile_seconds"] >= 0
+    assert stats["avg_invocation_seconds"] >= 0
+
+
+@pytest.mark.asyncio
+async def test_track_does_not_count_closed_streams_as_errors():
+    registry = GraphRegistry()
+    registry.register("podcast", MagicMock())
+
+    async def stream():
+        with registry.track("podcast"):
+            yield b"chunk"
+            yield b"chunk"
+
+    chunks = stream()
+    await anext(chunks)
+    await chunks.aclose()
+
+    with pytest.raises(asyncio.CancelledError):
+        with registry.track("podcast"):
+            raise asyncio.CancelledError()
+
+    stats = registry.stats()["podcast"]
+    assert stats["invocations"] == 2
+    assert stats["errors"] == 0
@@ -0,0 +1,169 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from src.tools.mcp_pool import (
+    MCPClientPool,
+    close_mcp_client_pool,
+    get_mcp_client_pool,
+    normalize_server_config,
+)
+
+SERVER_CONFIG = {
+    "transport": "stdio",
+    "command": "uvx",
+    "args": ["mcp-github-trending"],
+    "enabled_tools": ["get_github_trending_repositories"],
+}
+
+
+class FakeClient:
+    instances = []
+
+    def __init__(self, connections):
+        self.connections = connections
+        self.entered = 0
+        self.exited = 0
+        self.session = MagicMock()
+        self.session.send_ping = AsyncMock()
+        self.sessions = {name: self.session for name in connections}
+        FakeClient.instances.append(self)
+
+    async def __aenter__(self):
+        self.entered += 1
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        self.exited += 1
+
+    def get_tools(self):
+        return [MagicMock(name="tool")]
+
+
+@pytest.fixture
+def fake_client():
+    FakeClient.instances = []
+    with patch("src.tools.mcp_pool.MultiServerMCPClient", FakeClient):
+        yield FakeClient
+
+
+def test_normalize_server_config_ignores_non_connection_keys():
+    a = normalize_server_config(SERVER_CONFIG)
+    b = normalize_server_config(
+        {
+            "args": ["mcp-github-trending"],
+            "command": "uvx",
+            "add_to_agents": ["researcher"],
+        }
+    )
+    assert a == b
+    assert a != normalize_server_config({**SERVER_CONFIG, "args": ["other"]})
+
+
+@pytest.mark.asyncio
+async def test_session_reuses_connection(fake_client):
+    pool = MCPClientPool()
+    async with pool.session("github", SERVER_CONFIG) as tools:
+        assert len(tools) == 1
+    async with pool.session("github", SERVER_CONFIG):
+        pass
+
+    assert len(fake_client.instances) == 1
+    client = fake_client.instances[0]
+    assert client.connections == {
+        "github": {
+            "transport": "stdio",
+            "command": "uvx",
+            "args": ["mcp-github-trending"],
+        }
+    }
+    client.session.send_ping.assert_awaited_once()
+    assert pool.stats() == {
+        normalize_server_config(SERVER_CONFIG): {"open": 1, "idle": 1}
+    }
+
+    await pool.close()
+    assert client.exited == 1
+    assert pool.stats() == {}
+
+
+@pytest.mark.asyncio
+async def test_session_respects_max_clients_per_server(fake_client):
+    pool = MCPClientPool(max_clients_per_server=2)
+    running = 0
+    max_running = 0
+
+    async def use():
+        nonlocal running, max_running
+        async with pool.session("github", SERVER_CONFIG):
+            running += 1
+            max_running = max(max_running, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+
+    await asyncio.gather(*(use() for _ in range(5)))
+
+    assert max_running == 2
+    assert len(fake_client.instances) == 2
+    await pool.close()
+
+
+@pytest.mark.asyncio
+async def test_unhealthy_connection_is_replaced(fake_client):
+    pool = MCPClientPool()
+    async with pool.session("github", SERVER_CONFIG):
+        pass
+    first = fake_client.instances[0]
+    first.session.send_ping.side_effect = Exception("broken pipe")
+
+    async with pool.session("github", SERVER_CONFIG):
+        pass
+
+    assert len(fake_client.instances) == 2
+    assert first.exited == 1
+    await pool.close()
+
+
+@pytest.mark.asyncio
+async def test_idle_connections_are_evicted(fake_client):
+    pool = MCPClientPool(idle_timeout=0.01)
+    async with pool.session("github", SERVER_CONFIG):
+        pass
+    assert fake_client.instances[0].exited == 0
+
+    # The reaper scheduled on release closes the connection once it expires
+    await asyncio.sleep(0.05)
+
+    assert fake_client.instances[0].exited == 1
+    assert pool.stats() == {}
+    await pool.close()
+
+
+@pytest.mark.asyncio
+async def test_failed_connection_frees_slot(fake_client):
+    pool = MCPClientPool(max_clients_per_server=1)
+
+    async def failing_enter(self):
+        raise ConnectionError("cannot start server")
+
+    with patch.object(FakeClient, "__aenter__", failing_enter):
+        with pytest.raises(ConnectionError):
+            async with pool.session("github", SERVER_CONFIG):
+                pass
+
+    async with pool.session("github", SERVER_CONFIG) as tools:
+        assert tools
+    await pool.close()
+
+
+@pytest.mark.asyncio
+async def test_get_mcp_client_pool_is_shared_per_loop(fake_client):
+    pool = get_mcp_client_pool()
+    assert get_mcp_client_pool() is pool
+    await close_mcp_client_pool()
+    assert get_mcp_client_pool() is not pool
+    await close_mcp_client_pool()
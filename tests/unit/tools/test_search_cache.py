@@ -0,0 +1,125 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+import time
+from typing import Optional
+
+import pytest
+from langchain_core.tools import BaseTool
+
+from src.tools.decorators import create_logged_tool
+from src.tools.search_cache import SearchCache, create_cached_tool, normalize_query
+
+
+class DummySearch(BaseTool):
+    name: str = "dummy_search"
+    description: str = "Dummy search tool"
+    max_results: int = 5
+    calls: list = []
+
+    def _run(self, query: str, run_manager: Optional[object] = None):
+        self.calls.append(query)
+        if query == "fail":
+            return "Error", {}
+        return [{"title": query, "n": self.max_results}], {"query": query}
+
+
+class DummyAsyncSearch(DummySearch):
+    async def _arun(self, query: str, run_manager: Optional[object] = None):
+        self.calls.append(f"async {query}")
+        return [{"title": query}], {"query": query}
+
+
+@pytest.fixture
+def cache(monkeypatch):
+    cache = SearchCache(ttl=60)
+    monkeypatch.setattr("src.tools.search_cache.get_search_cache", lambda: cache)
+    return cache
+
+
+def make_tool(base=DummySearch, **kwargs):
+    tool_class = create_logged_tool(create_cached_tool(base, ["max_results"]))
+    return tool_class(calls=[], **kwargs)
+
+
+def test_normalize_query():
+    assert normalize_query("  What is   LangGraph? ") == "what is langgraph?"
+
+
+def test_repeated_searches_hit_cache(cache):
+    tool = make_tool()
+    first = tool._run("What is LangGraph?")
+    second = tool._run("what is  langgraph?")
+
+    assert tool.calls == ["What is LangGraph?"]
+    assert first == second
+    assert isinstance(second, tuple)
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+def test_cache_key_includes_tool_parameters(cache):
+    make_tool(max_results=5)._run("query")
+    tool = make_tool(max_results=10)
+    tool._run("query")
+    assert tool.calls == ["query"]
+
+
+def test_failed_searches_are_not_cached(cache):
+    tool = make_tool()
+    tool._run("fail")
+    tool._run("fail")
+    assert tool.calls == ["fail", "fail"]
+
+
+def test_cached_results_are_copies(cache):
+    tool = make_tool()
+    tool._run("query")[0].append("mutated")
+    assert tool._run("query")[0] == [{"title": "query", "n": 5}]
+
+
+@pytest.mark.asyncio
+async def test_async_searches_hit_cache(cache):
+    tool = make_tool(DummyAsyncSearch)
+    await tool._arun("query")
+    await tool._arun("query")
+    assert tool.calls == ["async query"]
+
+    # Tools without an async implementation are cached through `_run`
+    sync_tool = make_tool()
+    await sync_tool._arun("other")
+    await sync_tool._arun("other")
+    assert sync_tool.calls == ["other"]
+    assert cache.stats()["puts"] == 2
+
+
+def test_disabled_cache_passes_through(monkeypatch):
+    monkeypatch.delenv("SEARCH_CACHE_ENABLED", raising=False)
+    tool = make_tool()
+    tool._run("query")
+    tool._run("query")
+    assert tool.calls == ["query", "query"]
+
+
+def test_ttl_and_lru():
+    cache = SearchCache(ttl=60, max_entries=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    cache.get("a")
+    cache.put("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+
+    cache._entries["a"] = (time.time() - 120, 1)
+    assert cache.get("a") is None
+
+
+def test_sqlite_tier_survives_restart(tmp_path):
+    path = str(tmp_path / "search_cache.sqlite")
+    SearchCache(sqlite_path=path).put("key", ([{"title": "t"}], {"raw": 1}))
+
+    cache = SearchCache(sqlite_path=path)
+    assert cache.get("key") == ([{"title": "t"}], {"raw": 1})
+    assert cache.stats()["sqlite_hits"] == 1
+    assert cache.get("key") == ([{"title": "t"}], {"raw": 1})
+    assert cache.stats()["memory_hits"] == 1
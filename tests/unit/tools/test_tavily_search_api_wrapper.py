@@ -1,5 +1,6 @@
 # Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
 # SPDX-License-Identifier: MIT
+import asyncio
 import json
 import pytest
 from unittest.mock import Mock, patch, AsyncMock, MagicMock
@@ -7,6 +8,7 @@ import aiohttp
 import requests
 from src.tools.tavily_search.tavily_search_api_wrapper import (
     EnhancedTavilySearchAPIWrapper,
+    close_tavily_client,
 )
 
 
@@ -41,7 +43,7 @@ class TestEnhancedTavilySearchAPIWrapper:
             ],
         }
 
-    @patch("src.tools.tavily_search.tavily_search_api_wrapper.requests.post")
+    @patch("src.tools.tavily_search.tavily_search_api_wrapper.http_client.post")
     def test_raw_results_success(self, mock_post, wrapper, mock_response_data):
         mock_response = Mock()
         mock_response.json.return_value = mock_response_data
@@ -57,7 +59,7 @@ class TestEnhancedTavilySearchAPIWrapper:
         assert call_args.kwargs["json"]["query"] == "test query"
         assert call_args.kwargs["json"]["max_results"] == 10
 
-    @patch("src.tools.tavily_search.tavily_search_api_wrapper.requests.post")
+    @patch("src.tools.tavily_search.tavily_search_api_wrapper.http_client.post")
     def test_raw_results_with_all_parameters(
         self, mock_post, wrapper, mock_response_data
     ):
@@ -86,7 +88,7 @@ class TestEnhancedTavilySearchAPIWrapper:
         assert params["include_answer"] is True
         assert params["include_raw_content"] is True
 
-    @patch("src.tools.tavily_search.tavily_search_api_wrapper.requests.post")
+    @patch("src.tools.tavily_search.tavily_search_api_wrapper.http_client.post")
     def test_raw_results_http_error(self, mock_post, wrapper):
         mock_response = Mock()
         mock_response.raise_for_status.side_effect = requests.HTTPError("API Error")
@@ -110,14 +112,9 @@ class TestEnhancedTavilySearchAPIWrapper:
             return_value=mock_response_cm
         )  # Use MagicMock, not AsyncMock
 
-        # Create mock session class
-        mock_session_cm = AsyncMock()
-        mock_session_cm.__aenter__ = AsyncMock(return_value=mock_session)
-        mock_session_cm.__aexit__ = AsyncMock(return_value=None)
-
         with patch(
             "src.tools.tavily_search.tavily_search_api_wrapper.aiohttp.ClientSession",
-            return_value=mock_session_cm,
+            return_value=mock_session,
         ):
             result = await wrapper.raw_results_async("test query")
 
@@ -138,18 +135,56 @@ class TestEnhancedTavilySearchAPIWrapper:
             return_value=mock_response_cm
         )  # Use MagicMock, not AsyncMock
 
-        # Create mock session class
-        mock_session_cm = AsyncMock()
-        mock_session_cm.__aenter__ = AsyncMock(return_value=mock_session)
-        mock_session_cm.__aexit__ = AsyncMock(return_value=None)
-
         with patch(
             "src.tools.tavily_search.tavily_search_api_wrapper.aiohttp.ClientSession",
-            return_value=mock_session_cm,
+            return_value=mock_session,
         ):
             with pytest.raises(Exception, match="Error 400: Bad Request"):
                 await wrapper.raw_results_async("test query")
 
+    @pytest.mark.asyncio
+    async def test_raw_results_async_coalesces_identical_searches(
+        self, wrapper, mock_response_data
+    ):
+        posted = []
+
+        def post(url, **kwargs):
+            posted.append(kwargs["json"]["query"])
+            mock_response_cm = AsyncMock()
+            mock_response_cm.__aenter__ = AsyncMock(return_value=mock_response_cm)
+            mock_response_cm.__aexit__ = AsyncMock(return_value=None)
+            mock_response_cm.status = 200
+
+            async def text():
+                await asyncio.sleep(0.01)
+                return json.dumps(mock_response_data)
+
+            mock_response_cm.text = text
+            return mock_response_cm
+
+        mock_session = MagicMock()
+        mock_session.closed = False
+        mock_session.post = MagicMock(side_effect=post)
+        mock_session.close = AsyncMock()
+
+        with patch(
+            "src.tools.tavily_search.tavily_search_api_wrapper.aiohttp.ClientSession",
+            return_value=mock_session,
+        ) as mock_session_class:
+            results = await asyncio.gather(
+                wrapper.raw_results_async("test query"),
+                wrapper.raw_results_async("test query"),
+                wrapper.raw_results_async("other query"),
+            )
+            # Finished searches are not cached, the next one hits the API
+            await wrapper.raw_results_async("test query")
+
+        assert posted == ["test query", "other query", "test query"]
+        assert results[0] == results[1] == mock_response_data
+        assert results[0] is not results[1]
+        mock_session_class.assert_called_once()
+        await close_tavily_client()
+
     def test_clean_results_with_images(self, wrapper, mock_response_data):
         result = wrapper.clean_results_with_images(mock_response_data)
 
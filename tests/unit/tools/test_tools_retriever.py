@@ -1,6 +1,7 @@
 # Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
 # SPDX-License-Identifier: MIT
 
+import json
 from unittest.mock import Mock, patch, MagicMock
 from langchain_core.callbacks import (
     CallbackManagerForToolRun,
@@ -42,9 +43,7 @@ def test_retriever_tool_run_with_results():
     mock_retriever.query_relevant_documents.assert_called_once_with(
         "test keywords", resources
     )
-    assert isinstance(result, list)
-    assert len(result) == 1
-    assert result[0] == doc.to_dict()
+    assert json.loads(result) == [doc.to_dict()]
 
 
 def test_retriever_tool_run_no_results():
@@ -64,21 +63,20 @@ async def test_retriever_tool_arun():
     mock_retriever = Mock(spec=Retriever)
     chunk = Chunk(content="async content", similarity=0.8)
     doc = Document(id="doc2", chunks=[chunk])
-    mock_retriever.query_relevant_documents.return_value = [doc]
+    mock_retriever.aquery_relevant_documents.return_value = [doc]
 
     resources = [Resource(uri="test://uri", title="Test")]
     tool = RetrieverTool(retriever=mock_retriever, resources=resources)
 
     mock_run_manager = Mock(spec=AsyncCallbackManagerForToolRun)
-    mock_sync_manager = Mock(spec=CallbackManagerForToolRun)
-    mock_run_manager.get_sync.return_value = mock_sync_manager
 
     result = await tool._arun("async keywords", mock_run_manager)
 
-    mock_run_manager.get_sync.assert_called_once()
-    assert isinstance(result, list)
-    assert len(result) == 1
-    assert result[0] == doc.to_dict()
+    mock_retriever.aquery_relevant_documents.assert_awaited_once_with(
+        "async keywords", resources
+    )
+    mock_retriever.query_relevant_documents.assert_not_called()
+    assert json.loads(result) == [doc.to_dict()]
 
 
 @patch("src.tools.retriever.build_retriever")
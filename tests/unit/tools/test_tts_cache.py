@@ -0,0 +1,90 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+import threading
+
+import pytest
+
+from src.tools.tts_cache import TTSCache, tts_cache_key
+
+
+def test_cache_key_covers_audio_parameters():
+    key = tts_cache_key("Hello", "BV001_streaming")
+    assert key.endswith(".mp3")
+    assert key == tts_cache_key("Hello", "BV001_streaming", speed_ratio=1)
+    assert key != tts_cache_key("Hello", "BV002_streaming")
+    assert key != tts_cache_key("Hello", "BV001_streaming", speed_ratio=1.05)
+    assert key != tts_cache_key("Hello", "BV001_streaming", text_type="ssml")
+    assert tts_cache_key("Hello", "BV001_streaming", encoding="wav").endswith(".wav")
+
+
+def test_cache_round_trip_and_restart(tmp_path):
+    cache = TTSCache(str(tmp_path))
+    key = tts_cache_key("Hello", "BV001_streaming")
+    assert cache.get(key) is None
+    cache.put(key, b"audio")
+    assert cache.get(key) == b"audio"
+    assert cache.stats() == {
+        "hits": 1,
+        "misses": 1,
+        "evictions": 0,
+        "entries": 1,
+        "bytes": 5,
+    }
+
+    cache = TTSCache(str(tmp_path))
+    assert cache.get(key) == b"audio"
+
+
+def test_cache_evicts_least_recently_used(tmp_path):
+    cache = TTSCache(str(tmp_path), max_bytes=25)
+    cache.put("a.mp3", b"a" * 10)
+    cache.put("b.mp3", b"b" * 10)
+    cache.get("a.mp3")
+    cache.put("c.mp3", b"c" * 10)
+
+    assert cache.get("b.mp3") is None
+    assert cache.get("a.mp3") == b"a" * 10
+    assert not (tmp_path / "b.mp3").exists()
+    assert cache.stats()["bytes"] == 20
+    assert cache.stats()["evictions"] == 1
+
+
+def test_cache_writer_stores_entry_on_commit(tmp_path):
+    cache = TTSCache(str(tmp_path))
+    writer = cache.open_writer("mix.mp3")
+    writer.write(b"line 0")
+    writer.write(b"line 1")
+    assert cache.get("mix.mp3") is None
+    writer.commit()
+    writer.discard()
+
+    assert cache.get("mix.mp3") == b"line 0line 1"
+    assert cache.stats()["bytes"] == 12
+
+    writer = cache.open_writer("partial.mp3")
+    writer.write(b"line 0")
+    writer.discard()
+    assert cache.get("partial.mp3") is None
+    assert list(tmp_path.glob("*.tmp")) == []
+
+
+@pytest.mark.asyncio
+async def test_async_access_runs_off_the_event_loop(tmp_path):
+    threads = []
+
+    class RecordingCache(TTSCache):
+        def get(self, key):
+            threads.append(threading.get_ident())
+            return super().get(key)
+
+        def put(self, key, audio):
+            threads.append(threading.get_ident())
+            super().put(key, audio)
+
+    cache = RecordingCache(str(tmp_path))
+    await cache.aput("a.mp3", b"audio")
+
+    assert await cache.aget("a.mp3") == b"audio"
+    assert len(threads) == 2
+    assert threading.get_ident() not in threads
@@ -0,0 +1,195 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+import asyncio
+
+import httpx
+import pytest
+
+from src.utils import http_client
+from src.utils.http_client import (
+    AsyncHTTPClient,
+    close_async_client,
+    get_async_client,
+)
+
+
+def make_client(handler, **kwargs):
+    kwargs.setdefault("backoff_factor", 0)
+    return AsyncHTTPClient(transport=httpx.MockTransport(handler), **kwargs)
+
+
+@pytest.mark.asyncio
+async def test_retries_transient_status():
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        if len(calls) < 3:
+            return httpx.Response(503)
+        return httpx.Response(200, json={"ok": True})
+
+    client = make_client(handler, max_retries=2)
+    response = await client.get("http://api/items", params={"q": "x"})
+
+    assert response.status_code == 200
+    assert len(calls) == 3
+    assert calls[0].url.params["q"] == "x"
+    await client.aclose()
+
+
+@pytest.mark.asyncio
+async def test_gives_up_after_max_retries():
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        raise httpx.ConnectError("refused", request=request)
+
+    client = make_client(handler, max_retries=1)
+    with pytest.raises(httpx.ConnectError):
+        await client.post("http://api/items", json={"a": 1})
+    assert len(calls) == 2
+    await client.aclose()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "error", [None, httpx.ReadTimeout("timed out"), httpx.RemoteProtocolError("eof")]
+)
+async def test_post_not_retried_once_sent(error):
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        if error is not None:
+            raise error
+        return httpx.Response(503)
+
+    client = make_client(handler, max_retries=2)
+    if error is None:
+        assert (await client.post("http://api/tts", json={})).status_code == 503
+    else:
+        with pytest.raises(type(error)):
+            await client.post("http://api/tts", json={})
+    assert len(calls) == 1
+    await client.aclose()
+
+
+@pytest.mark.asyncio
+async def test_get_retried_after_read_timeout():
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        if len(calls) == 1:
+            raise httpx.ReadTimeout("timed out")
+        return httpx.Response(200)
+
+    client = make_client(handler, max_retries=2)
+    assert (await client.get("http://api/items")).status_code == 200
+    assert len(calls) == 2
+    await client.aclose()
+
+
+@pytest.mark.asyncio
+async def test_post_retried_when_rate_limited_with_retry_after():
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        if len(calls) == 1:
+            return httpx.Response(429, headers={"Retry-After": "0"})
+        if len(calls) == 2:
+            return httpx.Response(429)
+        return httpx.Response(200)
+
+    client = make_client(handler, max_retries=2)
+    # A 429 without Retry-After is not retried
+    assert (await client.post("http://api/tts", json={})).status_code == 429
+    assert len(calls) == 2
+    await client.aclose()
+
+
+@pytest.mark.asyncio
+async def test_retries_overridden_per_call():
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        return httpx.Response(503)
+
+    client = make_client(handler, max_retries=2)
+    response = await client.get("http://api/items", max_retries=0)
+
+    assert response.status_code == 503
+    assert len(calls) == 1
+    await client.aclose()
+
+
+@pytest.mark.asyncio
+async def test_post_sends_string_body_as_is():
+    bodies = []
+
+    def handler(request):
+        bodies.append(request.content)
+        return httpx.Response(400)
+
+    client = make_client(handler)
+    response = await client.post("http://api/tts", '{"text": "hi"}')
+
+    # Client errors are not retried
+    assert response.status_code == 400
+    assert bodies == [b'{"text": "hi"}']
+    await client.aclose()
+
+
+@pytest.mark.asyncio
+async def test_limits_concurrent_requests_per_host():
+    running = {"a": 0, "b": 0}
+    max_running = {"a": 0, "b": 0}
+
+    async def handler(request):
+        host = request.url.host
+        running[host] += 1
+        max_running[host] = max(max_running[host], running[host])
+        await asyncio.sleep(0.01)
+        running[host] -= 1
+        return httpx.Response(200)
+
+    client = make_client(handler, max_connections_per_host=2)
+    await asyncio.gather(
+        *(client.get(f"http://{host}/") for host in "ab" for _ in range(5))
+    )
+
+    assert max_running == {"a": 2, "b": 2}
+    await client.aclose()
+
+
+@pytest.mark.asyncio
+async def test_async_client_is_shared_per_loop():
+    client = get_async_client()
+    assert get_async_client() is client
+    await close_async_client()
+    assert client.client.is_closed
+    assert get_async_client() is not client
+    await close_async_client()
+
+
+def test_sync_session_is_shared_and_pooled():
+    session = http_client.get_session()
+    assert http_client.get_session() is session
+    adapter = session.get_adapter("https://example.com")
+    assert adapter.max_retries.total == http_client.HTTP_MAX_RETRIES
+    assert 503 in adapter.max_retries.status_forcelist
+
+
+def test_sync_session_retries_post_only_when_rate_limited():
+    retry = http_client.get_session().get_adapter("https://example.com").max_retries
+    assert retry.is_retry("GET", 503)
+    assert not retry.is_retry("POST", 503)
+    assert not retry.is_retry("POST", 429)
+    assert retry.is_retry("POST", 429, has_retry_after=True)
+    # Read errors of a POST are not retried, connect errors are
+    assert not retry._is_method_retryable("POST")
+    assert type(retry.new()) is type(retry)